@@ -0,0 +1,96 @@
+"""Measures pong_3's chaos mode: physics time per tick for many balls, and the frame time with drawing.
+
+Physics is timed three ways: the grid broadphase, the same vector tests run on every ball for every paddle, and
+a pure Python loop moving every ball through PongSimulation.move_ball, handle_paddle_collision and goal, which
+is what generalizing the single ball without vectorizing would cost. Runs under the SDL dummy video driver unless
+SDL_VIDEODRIVER is already set.
+
+Usage: python benchmarks/chaos_benchmark.py [--ticks N]
+   """
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "pong_3"))
+
+import chaos  # noqa: E402
+import pong  # noqa: E402
+from simulation import Paddle, PongSimulation  # noqa: E402
+
+# Seconds per frame at 60 FPS
+FRAME_BUDGET = 1 / 60
+
+BALL_COUNTS = (100, 1000, 10_000)
+
+# Ball counts the pure Python loop is timed for, as it grows too slow beyond them
+LOOP_BALL_COUNTS = (100, 1000)
+
+
+def extra_paddles(count: int) -> list:
+    """Returns count paddles spread over the middle of the court."""
+    return [Paddle(100 + (400 * index) // max(count, 1), (37 * index) % 300, 10, 60) for index in range(count)]
+
+
+def time_chaos(balls: int, paddles: int, broadphase: bool, ticks: int) -> float:
+    """Returns mean seconds per ChaosSimulation.step."""
+    game = chaos.ChaosSimulation(balls, extra_paddles=extra_paddles(paddles - 2), broadphase=broadphase)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        game.step(tick % 16)
+    return (time.perf_counter() - start) / ticks
+
+
+def time_loop(balls: int, ticks: int) -> float:
+    """Returns mean seconds per tick of stepping every ball through the scalar rules, one match per ball."""
+    games = [PongSimulation() for _ in range(balls)]
+    for game in games:
+        game.quiet = True
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for game in games:
+            game.move_ball()
+            game.handle_paddle_collision()
+            game.goal()
+    return (time.perf_counter() - start) / ticks
+
+
+def time_draw(balls: int, frames: int) -> float:
+    """Returns mean seconds per ChaosPong.draw."""
+    game = pong.ChaosPong(balls)
+    window = pong.get_window()
+    elapsed = 0.0
+    for tick in range(frames):
+        game.game.step(tick % 16)
+        start = time.perf_counter()
+        game.draw(window)
+        elapsed += time.perf_counter() - start
+    return elapsed / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chaos mode physics and frame time benchmark.")
+    parser.add_argument("--ticks", type=int, default=1000, help="Ticks per measurement.")
+    args = parser.parse_args()
+
+    print(f"{'balls':>7}{'paddles':>9}{'grid us':>10}{'all pairs us':>14}{'python loop us':>16}")
+    for balls in BALL_COUNTS:
+        for paddles in (2, 16):
+            grid = time_chaos(balls, paddles, True, args.ticks)
+            every_pair = time_chaos(balls, paddles, False, args.ticks)
+            loop = ""
+            if paddles == 2 and balls in LOOP_BALL_COUNTS:
+                loop = f"{time_loop(balls, max(args.ticks // 10, 1)) * 1e6:,.0f}"
+            print(f"{balls:>7,}{paddles:>9}{grid * 1e6:>10,.0f}{every_pair * 1e6:>14,.0f}{loop:>16}")
+
+    physics = time_chaos(1000, 2, True, args.ticks)
+    draw = time_draw(1000, args.ticks)
+    frame = physics + draw
+    print(f"1,000 balls: physics {physics * 1e3:.2f} ms + draw {draw * 1e3:.2f} ms = {frame * 1e3:.2f} ms/frame")
+    print(f"budget {FRAME_BUDGET * 1e3:.1f} ms, {1 / frame:,.0f} FPS possible")
+
+
+if __name__ == "__main__":
+    main()
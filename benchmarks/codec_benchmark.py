@@ -0,0 +1,88 @@
+"""Measures pong_3's snapshot codec: encode and decode throughput and bytes sent per tick.
+
+Snapshots come from typical headless bot matches. Each match is streamed through a SnapshotEncoder and
+SnapshotDecoder pair with acknowledgements arriving a fixed number of ticks late, as they would over a network
+with that round trip, and the mean encoded size is compared with sending the full state every tick.
+
+Usage: python benchmarks/codec_benchmark.py [--ticks N]
+   """
+
+import argparse
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "pong_3"))
+
+import codec  # noqa: E402
+from controllers import FollowBall, Predictive, RandomMoves, to_inputs  # noqa: E402
+from simulation import PongSimulation  # noqa: E402
+
+# Full state as one fixed struct: tick, ball x, y and velocities as floats, paddle ys and scores
+FULL_STATE = struct.Struct("<IffffhhBB")
+
+MATCHUPS = (
+    ("FollowBall vs RandomMoves", FollowBall, RandomMoves),
+    ("Predictive vs FollowBall", Predictive, FollowBall),
+    ("RandomMoves vs RandomMoves", RandomMoves, RandomMoves),
+)
+
+# Acknowledgement delays in ticks: none, and roughly 50 ms and 200 ms round trips at 60 ticks per second
+ACK_DELAYS = (1, 3, 12)
+
+
+def play(left, right, ticks: int) -> list:
+    """Plays a match with goal pauses and returns a snapshot per tick."""
+    left.reset(0)
+    right.reset(0)
+    game = PongSimulation(left.name, right.name, goal_pause_ticks=60, match_over_ticks=300)
+    snapshots = []
+    for tick in range(ticks):
+        game.update(to_inputs(left(game, game.paddle_left), right(game, game.paddle_right)))
+        snapshots.append(codec.quantize(game, tick))
+    return snapshots
+
+
+def stream(snapshots: list, ack_delay: int) -> tuple:
+    """Encodes and decodes a snapshot stream with late acknowledgements.
+
+    Returns:
+        tuple: total encoded bytes, encode seconds and decode seconds.
+    """
+    encoder, decoder = codec.SnapshotEncoder(), codec.SnapshotDecoder()
+    timer = time.perf_counter
+    size = encode_time = decode_time = 0
+    for index, snapshot in enumerate(snapshots):
+        start = timer()
+        data = encoder.encode(snapshot)
+        middle = timer()
+        decoder.decode(data)
+        decode_time += timer() - middle
+        encode_time += middle - start
+        size += len(data)
+        if index >= ack_delay:
+            encoder.ack(snapshots[index - ack_delay][0])
+    return size, encode_time, decode_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot codec throughput and size benchmark.")
+    parser.add_argument("--ticks", type=int, default=20_000, help="Ticks per match.")
+    args = parser.parse_args()
+
+    print(f"full state: {FULL_STATE.size} bytes/tick")
+    print(f"{'match':28}{'ack delay':>10}{'bytes/tick':>12}{'vs full':>9}{'encode/s':>12}{'decode/s':>12}")
+    for name, left, right in MATCHUPS:
+        snapshots = play(left(), right(), args.ticks)
+        for ack_delay in ACK_DELAYS:
+            size, encode_time, decode_time = stream(snapshots, ack_delay)
+            per_tick = size / len(snapshots)
+            print(
+                f"{name:28}{ack_delay:>10}{per_tick:>12.2f}{per_tick / FULL_STATE.size:>9.0%}"
+                f"{len(snapshots) / encode_time:>12,.0f}{len(snapshots) / decode_time:>12,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Measures environment steps per second of pong_3's VectorPongEnv against a pipe-and-pickle baseline.
+
+The baseline runs the same PongEnvs split across the same number of worker processes, but sends the actions to
+each worker and the observations, rewards and episode ends back as pickled objects over its pipe, which is what
+a vectorized environment without shared memory does. A single-process loop over the environments is shown too.
+
+Usage: python benchmarks/env_benchmark.py [--steps N] [--workers N]
+   """
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "pong_3"))
+
+import env  # noqa: E402
+from controllers import RandomMoves  # noqa: E402
+
+ENV_COUNTS = (8, 64, 256)
+
+
+def pickling_worker(connection, count: int):
+    """Steps count environments for each list of actions received and sends back the results."""
+    envs = [env.PongEnv(RandomMoves()) for _ in range(count)]
+    connection.send([single.reset(seed=index)[0] for index, single in enumerate(envs)])
+    while True:
+        actions = connection.recv()
+        if actions is None:
+            return
+        results = []
+        for single, action in zip(envs, actions):
+            observation, reward, terminated, truncated, _ = single.step(int(action))
+            if terminated or truncated:
+                observation = single.reset()[0]
+            results.append((observation, reward, terminated, truncated))
+        connection.send(results)
+
+
+def run_pickling(num_envs: int, workers: int, steps: int, actions) -> float:
+    """Returns steps per second of the pipe-and-pickle baseline."""
+    connections, processes, slices = [], [], []
+    for worker in range(workers):
+        first, last = num_envs * worker // workers, num_envs * (worker + 1) // workers
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=pickling_worker, args=(child, last - first), daemon=True)
+        process.start()
+        connections.append(parent)
+        processes.append(process)
+        slices.append(slice(first, last))
+    for connection in connections:
+        connection.recv()
+
+    start = time.perf_counter()
+    for step in range(steps):
+        for connection, share in zip(connections, slices):
+            connection.send(actions[step, share])
+        results = [result for connection in connections for result in connection.recv()]
+        observations = np.array([result[0] for result in results])  # noqa: F841
+    elapsed = time.perf_counter() - start
+
+    for connection in connections:
+        connection.send(None)
+    for process in processes:
+        process.join()
+    return steps / elapsed
+
+
+def run_shared(num_envs: int, workers: int, steps: int, actions) -> float:
+    """Returns steps per second of VectorPongEnv."""
+    with env.VectorPongEnv(num_envs, opponent=RandomMoves, workers=workers) as vector:
+        vector.reset(seed=0)
+        start = time.perf_counter()
+        for step in range(steps):
+            vector.step(actions[step])
+        return steps / (time.perf_counter() - start)
+
+
+def run_inline(num_envs: int, steps: int, actions) -> float:
+    """Returns steps per second of stepping the environments one after another in this process."""
+    envs = [env.PongEnv(RandomMoves()) for _ in range(num_envs)]
+    for index, single in enumerate(envs):
+        single.reset(seed=index)
+    start = time.perf_counter()
+    for step in range(steps):
+        for single, action in zip(envs, actions[step]):
+            _, _, terminated, truncated, _ = single.step(int(action))
+            if terminated or truncated:
+                single.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized environment throughput benchmark.")
+    parser.add_argument("--steps", type=int, default=2000, help="Vector steps per measurement.")
+    parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, 8), help="Worker processes.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"workers: {args.workers}, env steps/s (vector steps/s x envs)")
+    print(f"{'envs':>6}{'in-process':>14}{'pickled pipes':>16}{'shared memory':>16}{'speed-up':>10}")
+    for num_envs in ENV_COUNTS:
+        actions = rng.choice(env.ACTIONS, size=(args.steps, num_envs)).astype(np.int8)
+        workers = min(args.workers, num_envs)
+        inline = run_inline(num_envs, args.steps, actions) * num_envs
+        pickled = run_pickling(num_envs, workers, args.steps, actions) * num_envs
+        shared = run_shared(num_envs, workers, args.steps, actions) * num_envs
+        print(f"{num_envs:>6}{inline:>14,.0f}{pickled:>16,.0f}{shared:>16,.0f}{shared / pickled:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Measures pong_3's offscreen pixel observations in frames per second.
+
+Each PixelRenderer configuration draws the same bot match. For reference, the window path draws with Pong.draw
+and copies the window out with pygame.surfarray.array3d, which is how pixels had to be taken before. Runs under
+the SDL dummy video driver unless SDL_VIDEODRIVER is already set.
+
+Usage: python benchmarks/pixels_benchmark.py [--frames N]
+   """
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "pong_3"))
+
+import pixels  # noqa: E402
+import pong  # noqa: E402
+from controllers import FollowBall, RandomMoves, to_inputs  # noqa: E402
+from simulation import PongSimulation  # noqa: E402
+
+# (label, PixelRenderer keyword arguments)
+CONFIGURATIONS = (
+    ("rgb 600x400", {}),
+    ("gray 600x400", {"grayscale": True}),
+    ("gray 150x100", {"grayscale": True, "downsample": 4}),
+    ("gray 150x100 x4 stack", {"grayscale": True, "downsample": 4, "stack": 4}),
+    ("gray 75x50 x4 stack", {"grayscale": True, "downsample": 8, "stack": 4}),
+)
+
+
+def play(game, frames: int, draw) -> float:
+    """Plays a bot match, calling draw(game) after every tick, and returns draw calls per second."""
+    left, right = FollowBall(), RandomMoves()
+    right.reset(0)
+    elapsed = 0.0
+    for _ in range(frames):
+        game.step(to_inputs(left(game, game.paddle_left), right(game, game.paddle_right)))
+        if game.get_winner() is not None:
+            game.reset_scores()
+        start = time.perf_counter()
+        draw(game)
+        elapsed += time.perf_counter() - start
+    return frames / elapsed
+
+
+def main():
+    import pygame
+
+    parser = argparse.ArgumentParser(description="Offscreen pixel observation benchmark.")
+    parser.add_argument("--frames", type=int, default=5000, help="Frames to draw per configuration.")
+    args = parser.parse_args()
+
+    window = pong.get_window()
+
+    def draw_window(game):
+        game.draw(window)
+        return pygame.surfarray.array3d(window)
+
+    print(f"{'window + array3d':24}{play(pong.Pong(), args.frames, draw_window):>12,.0f} frames/s")
+    for label, options in CONFIGURATIONS:
+        renderer = pixels.PixelRenderer(**options)
+        print(f"{label:24}{play(PongSimulation(), args.frames, renderer.render):>12,.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compares pong_3's full-window repaint against the dirty rect renderer.
+
+Both renderers draw the same bot match frame for frame. Runs under the SDL dummy video driver unless
+SDL_VIDEODRIVER is already set, so it can run on machines without a display.
+
+Usage: python benchmarks/render_benchmark.py [--frames N]
+   """
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "pong_3"))
+
+import pong  # noqa: E402
+from controllers import FollowBall, RandomMoves, to_inputs  # noqa: E402
+
+
+def time_frames(dirty_rects: bool, frames: int) -> float:
+    """Plays a scripted match and times the draw calls.
+
+    Args:
+        dirty_rects (bool): use the dirty rect renderer instead of the full repaint.
+        frames (int): number of frames to draw.
+
+    Returns:
+        float: mean seconds per draw call.
+    """
+    game = pong.Pong(dirty_rects=dirty_rects)
+    left, right = FollowBall(), RandomMoves()
+    right.reset(0)
+    window = pong.get_window()
+    elapsed = 0.0
+    for _ in range(frames):
+        game.advance(to_inputs(left(game, game.paddle_left), right(game, game.paddle_right)))
+        if game.get_winner() is not None:
+            # Keep the five second winner screen out of the measurement
+            game.reset_scores()
+        start = time.perf_counter()
+        game.draw(window)
+        elapsed += time.perf_counter() - start
+    return elapsed / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full repaint vs dirty rect rendering benchmark.")
+    parser.add_argument("--frames", type=int, default=5000, help="Frames to draw per renderer.")
+    args = parser.parse_args()
+
+    full = time_frames(False, args.frames)
+    dirty = time_frames(True, args.frames)
+    print(f"full repaint: {full * 1e6:8.1f} us/frame")
+    print(f"dirty rects:  {dirty * 1e6:8.1f} us/frame")
+    print(f"speedup:      {full / dirty:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Load generator for pong_3's spectator fan-out.
+
+Publishes a bot match to many in-process subscribers for a number of ticks. Most subscribers read every frame as
+it arrives; a share of them only read every few ticks, so they fall behind and are dropped back to the latest
+keyframe. A sample of subscribers decodes everything it reads and is checked against the match state, and the
+time to publish each tick is compared with the frame budget.
+
+Usage: python benchmarks/spectator_load.py [--subscribers N] [--ticks N] [--slow-share F]
+   """
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "pong_3"))
+
+import codec  # noqa: E402
+import server  # noqa: E402
+import spectator  # noqa: E402
+from controllers import FollowBall, RandomMoves, to_inputs  # noqa: E402
+from simulation import PongSimulation  # noqa: E402
+
+# Seconds per tick at 60 ticks per second
+FRAME_BUDGET = 1 / 60
+
+# Ticks between reads of a slow subscriber, and subscribers that decode and check every frame they read
+SLOW_READ_INTERVAL = 200
+CHECKED_SUBSCRIBERS = 50
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spectator fan-out load generator.")
+    parser.add_argument("--subscribers", type=int, default=10_000, help="Simulated spectators.")
+    parser.add_argument("--ticks", type=int, default=1200, help="Ticks to publish.")
+    parser.add_argument("--slow-share", type=float, default=0.1, help="Share of spectators that read rarely.")
+    args = parser.parse_args()
+
+    left, right = FollowBall(), RandomMoves()
+    right.reset(0)
+    game = PongSimulation(goal_pause_ticks=60, match_over_ticks=300)
+    feed = spectator.SpectatorFeed()
+    subscribers = [feed.subscribe(spectator.Subscriber()) for _ in range(args.subscribers)]
+    slow_count = int(args.subscribers * args.slow_share)
+    fast, slow = subscribers[slow_count:], subscribers[:slow_count]
+    checked = {id(subscriber): codec.SnapshotDecoder() for subscriber in fast[:CHECKED_SUBSCRIBERS]}
+    checked.update({id(subscriber): codec.SnapshotDecoder() for subscriber in slow[:CHECKED_SUBSCRIBERS]})
+
+    publish_times = []
+    mismatches = 0
+    timer = time.perf_counter
+    for tick in range(args.ticks):
+        game.update(to_inputs(left(game, game.paddle_left), right(game, game.paddle_right)))
+        start = timer()
+        frame = feed.publish(game, tick)
+        publish_times.append(timer() - start)
+        expected = codec.quantize(game, tick)
+
+        readers = fast if tick % SLOW_READ_INTERVAL else subscribers
+        for subscriber in readers:
+            decoder = checked.get(id(subscriber))
+            snapshot = None
+            while subscriber.frames:
+                received = subscriber.frames.popleft()
+                if decoder is not None:
+                    snapshot = decoder.decode(received[server.HEADER.size :])
+                elif not subscriber.frames and received is not frame:
+                    # Every subscriber that is up to date holds the very object that was published
+                    mismatches += 1
+            # A subscriber dropped this tick has nothing current until it is resent the keyframe chain
+            if decoder is not None and not subscriber.lagging and snapshot != expected:
+                mismatches += 1
+
+    publish_times.sort()
+    resyncs = sum(subscriber.resyncs for subscriber in subscribers)
+    print(f"subscribers:      {args.subscribers:,} ({slow_count:,} slow)")
+    print(f"ticks published:  {args.ticks:,}")
+    print(f"publish p50:      {statistics.median(publish_times) * 1e3:8.3f} ms")
+    print(f"publish p99:      {publish_times[int(len(publish_times) * 0.99)] * 1e3:8.3f} ms")
+    print(f"publish max:      {publish_times[-1] * 1e3:8.3f} ms  (budget {FRAME_BUDGET * 1e3:.1f} ms)")
+    print(f"resyncs:          {resyncs:,}")
+    print(f"mismatches:       {mismatches}")
+    if mismatches or statistics.median(publish_times) > FRAME_BUDGET:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
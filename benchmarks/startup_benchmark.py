@@ -0,0 +1,72 @@
+"""Measures cold import time and time-to-first-frame of the pong versions that can be imported as modules.
+
+Each sample runs in a fresh interpreter so nothing is cached between runs. Runs under the SDL dummy video driver
+unless SDL_VIDEODRIVER is already set.
+
+Usage: python benchmarks/startup_benchmark.py [--runs N]
+   """
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# Versions exposing a Pong class; pong_1 is a script that starts playing when imported
+VERSIONS = ("pong_2", "pong_3")
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import pong
+print(time.perf_counter() - start)
+"""
+
+FIRST_FRAME_SNIPPET = """
+import time
+start = time.perf_counter()
+import pong
+game = pong.Pong()
+game.draw(pong.GAME_WINDOW)
+print(time.perf_counter() - start)
+"""
+
+
+def sample(version: str, snippet: str, runs: int) -> float:
+    """Runs a timing snippet in fresh interpreters.
+
+    Args:
+        version (str): directory holding the pong module.
+        snippet (str): code printing the seconds it measured.
+        runs (int): number of interpreters to start.
+
+    Returns:
+        float: median seconds over all runs.
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    cwd = os.path.join(REPO_ROOT, version)
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", snippet], cwd=cwd, env=env, check=True, capture_output=True, text=True
+        ).stdout
+        timings.append(float(output.split()[-1]))
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import and time-to-first-frame benchmark.")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters per measurement.")
+    args = parser.parse_args()
+
+    for version in VERSIONS:
+        import_time = sample(version, IMPORT_SNIPPET, args.runs)
+        first_frame = sample(version, FIRST_FRAME_SNIPPET, args.runs)
+        print(f"{version}: import {import_time * 1000:7.1f} ms   first frame {first_frame * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
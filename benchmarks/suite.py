@@ -0,0 +1,301 @@
+"""Benchmark suite comparing the cost of pong_1, pong_2 and pong_3.
+
+Every version is driven by the same seeded key script in a fresh interpreter under the SDL dummy video driver.
+Metrics, in nanoseconds (median over repeats):
+
+* frame_ns - one full game-loop iteration: paddles, physics, goals and draw. Available for every version.
+* physics_ns - move_ball and handle_paddle_collision for one tick. Not available for pong_1, whose loop is inline.
+* draw_ns - one Pong.draw call. Not available for pong_1.
+* goal_ns - one Pong.goal call that scores, with logging disabled.
+* goal_logging_overhead_ns - extra goal cost with the version's file logging set up (0 if it does not log).
+
+Usage:
+    python benchmarks/suite.py run [--output results.json]
+    python benchmarks/suite.py compare baseline.json results.json [--threshold 0.1]
+   """
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+VERSIONS = ("pong_1", "pong_2", "pong_3")
+
+# Input bits used by the key script, matching pong_3's simulation.LEFT_UP etc.
+LEFT_UP, LEFT_DOWN, RIGHT_UP, RIGHT_DOWN = 1, 2, 4, 8
+
+# Lower is better for every metric, so a rise beyond the threshold is a regression
+METRICS = ("frame_ns", "physics_ns", "draw_ns", "goal_ns", "goal_logging_overhead_ns")
+
+
+def key_script(seed: int, ticks: int) -> list:
+    """Builds a reproducible per-tick input script of held key combinations.
+
+    Args:
+        seed (int): random seed.
+        ticks (int): script length.
+
+    Returns:
+        list: input bits per tick.
+    """
+    rng = random.Random(seed)
+    inputs = []
+    while len(inputs) < ticks:
+        inputs.extend([rng.randrange(16)] * rng.randint(1, 30))
+    return inputs[:ticks]
+
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed() output, reporting keys from input bits."""
+
+    def __init__(self, key_bits: dict, inputs: int) -> None:
+        self.key_bits = key_bits
+        self.inputs = inputs
+
+    def __getitem__(self, key) -> bool:
+        return bool(self.inputs & self.key_bits.get(key, 0))
+
+
+def timer_overhead() -> int:
+    """Returns the median cost in ns of one back-to-back perf_counter_ns pair, subtracted from timed calls."""
+    timer = time.perf_counter_ns
+    samples = []
+    for _ in range(10_001):
+        start = timer()
+        samples.append(timer() - start)
+    return statistics.median(samples)
+
+
+def measure_pong_1(inputs: list) -> dict:
+    """Runs the pong_1 script with the key script, timing whole frames."""
+    import pygame
+
+    key_bits = {pygame.K_w: LEFT_UP, pygame.K_s: LEFT_DOWN, pygame.K_UP: RIGHT_UP, pygame.K_DOWN: RIGHT_DOWN}
+    frame = {"index": 0}
+
+    class InstantClock:
+        def tick(self, framerate=0):
+            return 0
+
+    def get_events():
+        frame["index"] += 1
+        return [pygame.event.Event(pygame.QUIT)] if frame["index"] > len(inputs) else []
+
+    pygame.time.Clock = InstantClock
+    pygame.time.delay = lambda milliseconds: None
+    pygame.event.get = get_events
+    # pong_1 finishes the frame it receives QUIT in, so the last input is repeated once
+    pygame.key.get_pressed = lambda: ScriptedKeys(key_bits, inputs[min(frame["index"], len(inputs)) - 1])
+
+    path = os.path.join(REPO_ROOT, "pong_1", "pong.py")
+    with open(path) as source:
+        code = compile(source.read(), path, "exec")
+    start = time.perf_counter_ns()
+    exec(code, {"__name__": "__main__"})
+    return {"frame_ns": (time.perf_counter_ns() - start) / len(inputs)}
+
+
+def measure_pong(version: str, inputs: list, goals: int) -> dict:
+    """Times physics, drawing, goals and a full loop iteration of pong_2 or pong_3."""
+    sys.path.insert(0, os.path.join(REPO_ROOT, version))
+    import pong
+    import pygame
+
+    if hasattr(pong, "PongSimulation"):
+        to_move_input = int
+    else:
+        key_bits = {pygame.K_w: LEFT_UP, pygame.K_s: LEFT_DOWN, pygame.K_UP: RIGHT_UP, pygame.K_DOWN: RIGHT_DOWN}
+
+        def to_move_input(bits):
+            return ScriptedKeys(key_bits, bits)
+
+    timer = time.perf_counter_ns
+    overhead = timer_overhead()
+    window = pong.GAME_WINDOW
+    game = pong.Pong()
+    moves = [to_move_input(bits) for bits in inputs]
+
+    def keep_match_running():
+        # Avoid the winner screen, which pauses for seconds in pong_2
+        if game.player_one.score >= pong.MAX_SCORE - 1 or game.player_two.score >= pong.MAX_SCORE - 1:
+            game.player_one.score = game.player_two.score = 0
+
+    physics = draw = 0
+    for move in moves:
+        game.move_paddle(move)
+        start = timer()
+        game.move_ball()
+        game.handle_paddle_collision()
+        physics += timer() - start - overhead
+        game.goal()
+        keep_match_running()
+        start = timer()
+        game.draw(window)
+        draw += timer() - start - overhead
+
+    start = timer()
+    for move in moves:
+        game.move_paddle(move)
+        game.move_ball()
+        game.handle_paddle_collision()
+        game.goal()
+        keep_match_running()
+        game.draw(window)
+    frame = (timer() - start) / len(moves)
+
+    def time_goals():
+        elapsed = 0
+        for _ in range(goals):
+            game.ball.x_position = -10
+            start = timer()
+            game.goal()
+            elapsed += timer() - start - overhead
+        return elapsed / goals
+
+    # pong_3 trees from before opt-in logging already configured a file handler in the working directory at import
+    logger_setup = sys.modules.get("logger_setup")
+    if logger_setup is not None and hasattr(logger_setup, "setup_logging"):
+        logger_setup.setup_logging(filename="pong.log")
+    logging.disable(logging.CRITICAL)
+    goal = time_goals()
+    logging.disable(logging.NOTSET)
+    logging_overhead = time_goals() - goal if logger_setup is not None else 0.0
+    if logger_setup is not None and hasattr(logger_setup, "shutdown_logging"):
+        logger_setup.shutdown_logging()
+
+    pygame.quit()
+    return {
+        "frame_ns": frame,
+        "physics_ns": physics / len(moves),
+        "draw_ns": draw / len(moves),
+        "goal_ns": goal,
+        "goal_logging_overhead_ns": logging_overhead,
+    }
+
+
+def worker(version: str, seed: int, ticks: int, goals: int):
+    """Measures one version in this interpreter and prints the metrics as JSON."""
+    import warnings
+
+    warnings.simplefilter("ignore")
+    inputs = key_script(seed, ticks)
+    metrics = measure_pong_1(inputs) if version == "pong_1" else measure_pong(version, inputs, goals)
+    print(json.dumps(metrics))
+
+
+def run(seed: int, ticks: int, goals: int, repeats: int) -> dict:
+    """Measures every version in fresh interpreters.
+
+    Args:
+        seed (int): key script seed.
+        ticks (int): ticks per measurement.
+        goals (int): goals timed per measurement.
+        repeats (int): fresh interpreters per version; each metric is the median.
+
+    Returns:
+        dict: metadata and per-version metrics.
+    """
+    import pygame
+
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    results = {}
+    for version in VERSIONS:
+        samples = []
+        with tempfile.TemporaryDirectory() as cwd:
+            for _ in range(repeats):
+                command = [sys.executable, os.path.abspath(__file__), "worker", version]
+                command += ["--seed", str(seed), "--ticks", str(ticks), "--goals", str(goals)]
+                output = subprocess.run(command, cwd=cwd, env=env, check=True, capture_output=True, text=True)
+                samples.append(json.loads(output.stdout.strip().splitlines()[-1]))
+        results[version] = {
+            metric: statistics.median(sample[metric] for sample in samples) for metric in samples[0]
+        }
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pygame": pygame.version.ver,
+            "seed": seed,
+            "ticks": ticks,
+            "goals": goals,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """Lists metrics that got slower than baseline by more than threshold.
+
+    Args:
+        baseline (dict): earlier run() output.
+        current (dict): later run() output.
+        threshold (float): allowed relative slowdown, e.g. 0.1 for 10%.
+
+    Returns:
+        list: (version, metric, baseline value, current value, relative change) per regression.
+    """
+    regressions = []
+    for version, metrics in current["results"].items():
+        for metric in METRICS:
+            old = baseline["results"].get(version, {}).get(metric)
+            new = metrics.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old > 0 else 0.0
+            print(f"{version:7} {metric:25} {old:12.0f} -> {new:12.0f} ns  {change:+7.1%}")
+            if change > threshold:
+                regressions.append((version, metric, old, new, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pong benchmark suite.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Measures every version and writes JSON.")
+    run_parser.add_argument("--output", help="File to write results to. Defaults to stdout.")
+    run_parser.add_argument("--repeats", type=int, default=3, help="Fresh interpreters per version.")
+
+    compare_parser = commands.add_parser("compare", help="Flags regressions between two result files.")
+    compare_parser.add_argument("baseline", help="Earlier results JSON.")
+    compare_parser.add_argument("current", help="Later results JSON.")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown.")
+
+    worker_parser = commands.add_parser("worker", help=argparse.SUPPRESS)
+    worker_parser.add_argument("version", choices=VERSIONS)
+
+    for sub_parser in (run_parser, worker_parser):
+        sub_parser.add_argument("--seed", type=int, default=0, help="Key script seed.")
+        sub_parser.add_argument("--ticks", type=int, default=2000, help="Ticks per measurement.")
+        sub_parser.add_argument("--goals", type=int, default=2000, help="Goals timed per measurement.")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        worker(args.version, args.seed, args.ticks, args.goals)
+    elif args.command == "run":
+        results = json.dumps(run(args.seed, args.ticks, args.goals, args.repeats), indent=2)
+        if args.output:
+            with open(args.output, "w") as output:
+                output.write(results + "\n")
+        else:
+            print(results)
+    else:
+        with open(args.baseline) as baseline, open(args.current) as current:
+            regressions = compare(json.load(baseline), json.load(current), args.threshold)
+        for version, metric, old, new, change in regressions:
+            print(f"REGRESSION {version} {metric}: {old:.0f} -> {new:.0f} ns ({change:+.1%})")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
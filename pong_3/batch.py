@@ -0,0 +1,246 @@
+"""This module contains a NumPy engine stepping many Pong matches in lockstep.
+
+Every match's ball, paddle and score state is held in one array per field and each rule of PongSimulation is
+applied as a masked vector operation, so a tick costs a fixed number of NumPy calls whatever the match count.
+Given the same inputs the results match PongSimulation tick for tick.
+   """
+
+import numpy as np
+
+from controllers import DOWN, UP
+from simulation import (
+    LEFT_DOWN,
+    LEFT_UP,
+    NO_INPUT,
+    RIGHT_DOWN,
+    RIGHT_UP,
+    PongSimulation,
+)
+from world import MatchWorld
+from logger_setup import logger
+
+# Values returned per match by BatchSimulation.step and get_winners
+NO_GOAL = 0
+PLAYER_ONE = 1
+PLAYER_TWO = 2
+
+
+def moves_to_inputs(left_moves, right_moves):
+    """Vectorized controllers.to_inputs, combining per-match paddle moves into input bits.
+
+    Args:
+        left_moves (numpy.ndarray): UP, IDLE or DOWN per match for the left paddles.
+        right_moves (numpy.ndarray): UP, IDLE or DOWN per match for the right paddles.
+
+    Returns:
+        numpy.ndarray: input bits per match for BatchSimulation.step.
+    """
+    left_moves = np.asarray(left_moves)
+    right_moves = np.asarray(right_moves)
+    return (
+        np.where(left_moves == UP, LEFT_UP, NO_INPUT)
+        | np.where(left_moves == DOWN, LEFT_DOWN, NO_INPUT)
+        | np.where(right_moves == UP, RIGHT_UP, NO_INPUT)
+        | np.where(right_moves == DOWN, RIGHT_DOWN, NO_INPUT)
+    )
+
+
+class BatchSimulation:
+    """Structure-of-arrays Pong engine advancing N matches per step call."""
+
+    def __init__(self, matches: int, template: PongSimulation = None) -> None:
+        """Batch simulation init.
+
+        Args:
+            matches (int): number of matches to run side by side.
+            template (PongSimulation, optional): match whose geometry and starting state every match copies.
+                Defaults to a fresh PongSimulation.
+        """
+        if template is None:
+            template = PongSimulation()
+        logger.info("Initializing batch simulation of %s matches.", matches)
+        self.matches = matches
+        ball = template.ball
+        left, right = template.paddle_left, template.paddle_right
+
+        # Geometry and rules shared by every match
+        self.config = template.config
+        self.window_width = template.config.window_width
+        self.window_height = template.config.window_height
+        self.max_score = template.config.max_score
+        self.ball_radius = ball.radius
+        self.ball_max_velocity = ball.max_velocity
+        self.ball_x_original = ball.x_position_original
+        self.ball_y_original = ball.y_position_original
+        self.left_x = left.x_position
+        self.left_width = left.width
+        self.left_height = left.height
+        self.left_y_original = left.y_position_original
+        self.right_x = right.x_position
+        self.right_height = right.height
+        self.right_y_original = right.y_position_original
+        self.left_velocity = left.paddle_velocity
+        self.right_velocity = right.paddle_velocity
+
+        # Per-match state, held as rows of one MatchWorld buffer. Ball fields are float64 so paddle returns are
+        # computed exactly as in Python; paddles and scores hold whole numbers.
+        self.world = MatchWorld(matches, template)
+        self.ball_x = self.world.ball_x
+        self.ball_y = self.world.ball_y
+        self.ball_x_velocity = self.world.ball_x_velocity
+        self.ball_y_velocity = self.world.ball_y_velocity
+        self.left_y = self.world.left_y
+        self.right_y = self.world.right_y
+        self.score_one = self.world.score_one
+        self.score_two = self.world.score_two
+
+        self._goals = np.zeros(matches, dtype=np.int8)
+
+    @property
+    def ticks(self) -> int:
+        """Ticks stepped since the matches were created."""
+        return int(self.world.ticks[0]) if self.matches else 0
+
+    def snapshot(self):
+        """Copies the state of every match in one buffer copy.
+
+        Returns:
+            numpy.ndarray: the copy, to pass to restore.
+        """
+        return self.world.snapshot()
+
+    def restore(self, snapshot):
+        """Returns every match to a snapshot.
+
+        Args:
+            snapshot (numpy.ndarray): a snapshot() result.
+        """
+        self.world.restore(snapshot)
+
+    def observe(self, left: bool = True):
+        """Builds every match's observation for one side, as controllers.observe does for a single paddle.
+
+        Passing the result to a BatchController's act_batch drives that side of all matches with one call.
+
+        Args:
+            left (bool, optional): observe for the left paddles, otherwise the right. Defaults to True.
+
+        Returns:
+            numpy.ndarray: (matches, 6) array of ball x, ball y, ball x velocity, ball y velocity, own paddle y
+                and opponent paddle y.
+        """
+        own, opponent = (self.left_y, self.right_y) if left else (self.right_y, self.left_y)
+        return np.column_stack((self.ball_x, self.ball_y, self.ball_x_velocity, self.ball_y_velocity, own, opponent))
+
+    def move_paddle(self, inputs):
+        """Handles paddle movement for every match.
+
+        Args:
+            inputs (int or numpy.ndarray): input bits per match, or one value applied to all matches.
+        """
+        inputs = np.asarray(inputs)
+        height = self.window_height
+        self.left_y -= self.left_velocity * (((inputs & LEFT_UP) != 0) & (self.left_y >= 0))
+        self.left_y += self.left_velocity * (((inputs & LEFT_DOWN) != 0) & (self.left_y <= height - self.left_height))
+        self.right_y -= self.right_velocity * (((inputs & RIGHT_UP) != 0) & (self.right_y >= 0))
+        self.right_y += self.right_velocity * (
+            ((inputs & RIGHT_DOWN) != 0) & (self.right_y <= height - self.right_height)
+        )
+
+    def move_ball(self):
+        """Handles changes in ball velocity for every match."""
+        self.ball_x += self.ball_x_velocity
+        self.ball_y += self.ball_y_velocity
+
+    def handle_paddle_collision(self):
+        """Handles ball collisions for every match."""
+        radius = self.ball_radius
+        ball_x, ball_y = self.ball_x, self.ball_y
+
+        walls = (ball_y <= radius) | (ball_y >= self.window_height - radius)
+        np.negative(self.ball_y_velocity, out=self.ball_y_velocity, where=walls)
+
+        hit = (ball_y >= self.left_y) & (ball_y <= self.left_y + self.left_height)
+        hit &= ball_x - radius <= self.left_x + self.left_width
+        if hit.any():
+            self._return_ball(hit, self.left_y, self.left_height)
+
+        hit = (ball_y >= self.right_y) & (ball_y <= self.right_y + self.right_height)
+        hit &= ball_x + radius >= self.right_x
+        if hit.any():
+            self._return_ball(hit, self.right_y, self.right_height)
+
+    def _return_ball(self, hit, paddle_y, paddle_height):
+        """Reverses the ball and applies PongSimulation.calculate_return_y_velocity where hit is set."""
+        np.negative(self.ball_x_velocity, out=self.ball_x_velocity, where=hit)
+        displacement_from_paddle = self.ball_y[hit] - (paddle_y[hit] + (paddle_height // 2))
+        reduction = (paddle_height // 2) / self.ball_max_velocity
+        self.ball_y_velocity[hit] = displacement_from_paddle / reduction
+
+    def reset(self, mask):
+        """Resets the paddle and ball positions as well as ball y_velocity where mask is set.
+
+        Args:
+            mask (numpy.ndarray): boolean array selecting the matches to reset.
+        """
+        self.ball_x[mask] = self.ball_x_original
+        self.ball_y[mask] = self.ball_y_original
+        self.ball_y_velocity[mask] = 0
+        self.left_y[mask] = self.left_y_original
+        self.right_y[mask] = self.right_y_original
+
+    def goal(self):
+        """Handles goal outcomes for every match.
+
+        Returns:
+            numpy.ndarray: NO_GOAL, PLAYER_ONE or PLAYER_TWO per match, naming who scored this tick.
+        """
+        goals = self._goals
+        goals.fill(NO_GOAL)
+        two_scored = self.ball_x < 0
+        one_scored = self.ball_x > self.window_width
+        scored = two_scored | one_scored
+        if scored.any():
+            goals[one_scored] = PLAYER_ONE
+            goals[two_scored] = PLAYER_TWO
+            self.score_one += one_scored
+            self.score_two += two_scored
+            self.reset(scored)
+        return goals
+
+    def get_winners(self):
+        """Returns which player, if any, has reached the config's max_score in each match.
+
+        Returns:
+            numpy.ndarray: NO_GOAL while a match is running, otherwise PLAYER_ONE or PLAYER_TWO.
+        """
+        winners = np.zeros(self.matches, dtype=np.int8)
+        winners[self.score_two >= self.max_score] = PLAYER_TWO
+        winners[self.score_one >= self.max_score] = PLAYER_ONE
+        return winners
+
+    def reset_scores(self, mask=None):
+        """Resets player scores ready for the next match.
+
+        Args:
+            mask (numpy.ndarray, optional): boolean array selecting the matches to reset. Defaults to all.
+        """
+        if mask is None:
+            mask = slice(None)
+        self.score_one[mask] = 0
+        self.score_two[mask] = 0
+
+    def step(self, inputs=NO_INPUT):
+        """Advances every match by one tick.
+
+        Args:
+            inputs (int or numpy.ndarray, optional): input bits per match. Defaults to NO_INPUT.
+
+        Returns:
+            numpy.ndarray: NO_GOAL, PLAYER_ONE or PLAYER_TWO per match. The array is reused by the next step.
+        """
+        self.world.ticks += 1
+        self.move_paddle(inputs)
+        self.move_ball()
+        self.handle_paddle_collision()
+        return self.goal()
@@ -0,0 +1,96 @@
+import random
+
+import batch
+import simulation
+import pytest
+
+
+@pytest.fixture
+def setup():
+    matches = 32
+    engine = batch.BatchSimulation(matches)
+    games = [simulation.PongSimulation() for _ in range(matches)]
+    yield (engine, games)
+
+
+def test_batch_matches_scalar_rules(setup):
+    engine, games = setup
+    rng = random.Random(1234)
+    goals_seen = 0
+    for _ in range(3000):
+        inputs = [rng.randrange(16) for _ in games]
+        goals = engine.step(inputs)
+        for index, game in enumerate(games):
+            scorer = game.step(inputs[index])
+            expected = batch.NO_GOAL
+            if scorer is game.player_one:
+                expected = batch.PLAYER_ONE
+            elif scorer is game.player_two:
+                expected = batch.PLAYER_TWO
+            assert goals[index] == expected
+            goals_seen += expected != batch.NO_GOAL
+
+            assert engine.ball_x[index] == game.ball.x_position
+            assert engine.ball_y[index] == game.ball.y_position
+            assert engine.ball_x_velocity[index] == game.ball.x_velocity
+            assert engine.ball_y_velocity[index] == game.ball.y_velocity
+            assert engine.left_y[index] == game.paddle_left.y_position
+            assert engine.right_y[index] == game.paddle_right.y_position
+            assert engine.score_one[index] == game.player_one.score
+            assert engine.score_two[index] == game.player_two.score
+    assert goals_seen > 0
+
+
+def test_winners_and_score_reset(setup):
+    engine, games = setup
+    engine.score_one[3] = simulation.MAX_SCORE
+    engine.score_two[5] = simulation.MAX_SCORE
+    winners = engine.get_winners()
+    assert winners[3] == batch.PLAYER_ONE
+    assert winners[5] == batch.PLAYER_TWO
+    assert winners.sum() == batch.PLAYER_ONE + batch.PLAYER_TWO
+    engine.reset_scores(winners != batch.NO_GOAL)
+    assert not engine.get_winners().any()
+
+
+def test_observe_matches_scalar_observations(setup):
+    from controllers import observe
+
+    engine, games = setup
+    for tick in range(50):
+        engine.step(tick % 16)
+        games[0].step(tick % 16)
+    assert tuple(engine.observe(left=True)[0]) == observe(games[0], games[0].paddle_left)
+    assert tuple(engine.observe(left=False)[0]) == observe(games[0], games[0].paddle_right)
+
+
+def test_moves_to_inputs():
+    from controllers import DOWN, IDLE, UP, to_inputs
+
+    moves = [UP, IDLE, DOWN]
+    inputs = batch.moves_to_inputs([left for left in moves for _ in moves], moves * 3)
+    assert list(inputs) == [to_inputs(left, right) for left in moves for right in moves]
+
+
+def test_batch_follows_template_config():
+    config = simulation.GameConfig(
+        window_width=400, window_height=300, paddle_height=60, paddle_velocity=7, ball_x_velocity=6, max_score=3
+    )
+    engine = batch.BatchSimulation(8, simulation.PongSimulation(config=config))
+    games = [simulation.PongSimulation(config=config) for _ in range(8)]
+    rng = random.Random(99)
+    for _ in range(2000):
+        inputs = [rng.randrange(16) for _ in games]
+        engine.step(inputs)
+        for index, game in enumerate(games):
+            game.step(inputs[index])
+            assert engine.ball_x[index] == game.ball.x_position
+            assert engine.ball_y[index] == game.ball.y_position
+            assert engine.left_y[index] == game.paddle_left.y_position
+            assert engine.right_y[index] == game.paddle_right.y_position
+            assert engine.score_one[index] == game.player_one.score
+            assert engine.score_two[index] == game.player_two.score
+    winners = engine.get_winners()
+    for index, game in enumerate(games):
+        winner = game.get_winner()
+        assert winners[index] == (batch.NO_GOAL if winner is None else 1 + (winner is game.player_two))
@@ -0,0 +1,248 @@
+"""This module contains chaos mode: hundreds of balls, and optionally more than two paddles, in one match.
+
+Balls are held structure-of-arrays in a BallCollection and every rule is a masked vector operation, as in
+batch.py. Testing every ball against every paddle would still cost balls x paddles per tick, so a uniform grid
+broadphase narrows the paddle tests down: each tick the balls are counting-sorted into grid cells, and a paddle is
+only tested against the balls in the cells it could be touched from. Goals are per ball: a ball crossing an end
+line scores for the other player and is served again from the centre line while the others play on.
+
+Bounces only happen off surfaces a ball is moving towards, so a ball cannot stick to a wall or inside a paddle
+however crowded the court gets.
+   """
+
+import numpy as np
+
+from batch import NO_GOAL, PLAYER_ONE, PLAYER_TWO
+from logger_setup import logger
+from simulation import NO_INPUT, WHITE, PongSimulation
+
+# Side length in pixels of the broadphase grid cells
+CELL_SIZE = 64
+
+
+class BallCollection:
+    """Position and velocity arrays for many balls of the same size and colour."""
+
+    def __init__(self, count: int, radius: int, colour: tuple = WHITE) -> None:
+        """Ball collection init.
+
+        Args:
+            count (int): number of balls.
+            radius (int): ball radius in pixels.
+            colour (tuple, optional): ball colour fill. Defaults to WHITE.
+        """
+        self.radius = radius
+        self.colour = colour
+        self.x_position = np.zeros(count)
+        self.y_position = np.zeros(count)
+        self.x_velocity = np.zeros(count)
+        self.y_velocity = np.zeros(count)
+
+    def __len__(self) -> int:
+        return len(self.x_position)
+
+
+class PaddleGrid:
+    """Uniform grid broadphase finding the balls that may touch each paddle."""
+
+    def __init__(self, width: int, height: int, cell_size: int = CELL_SIZE) -> None:
+        """Paddle grid init.
+
+        Args:
+            width (int): court width in pixels.
+            height (int): court height in pixels.
+            cell_size (int, optional): cell side length in pixels. Defaults to CELL_SIZE.
+        """
+        self.cell_size = cell_size
+        self.columns = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.cells = self.rows * self.columns
+        self.starts = np.zeros(self.cells + 1, dtype=np.intp)
+
+    def cell_range(self, paddle, radius: int) -> tuple:
+        """Returns the first and last row and column of the cells a ball touching a paddle can be centred in.
+
+        A ball can only touch a paddle while its centre is within one radius of the paddle's x extent and within
+        its y extent.
+        """
+        size, last_column, last_row = self.cell_size, self.columns - 1, self.rows - 1
+        return (
+            min(max(int(paddle.y_position // size), 0), last_row),
+            min(max(int((paddle.y_position + paddle.height) // size), 0), last_row),
+            min(max(int((paddle.x_position - radius) // size), 0), last_column),
+            min(max(int((paddle.x_position + paddle.width + radius) // size), 0), last_column),
+        )
+
+    def candidates(self, x_position, y_position, paddles: list, radius: int) -> list:
+        """Buckets the balls by cell and returns the balls in the cells of each paddle.
+
+        The balls are counting-sorted by cell, so the balls of a run of cells along a row are one slice of the
+        sorted order and each paddle costs a slice per row it spans.
+
+        Args:
+            x_position (numpy.ndarray): ball x positions.
+            y_position (numpy.ndarray): ball y positions.
+            paddles (list): the match's paddles.
+            radius (int): ball radius in pixels.
+
+        Returns:
+            list: array of ball indices per paddle.
+        """
+        # Truncating a scaled copy is far cheaper than floor division of floats; the clip catches both rounding
+        # towards zero just off the court and balls past the end lines
+        columns, scale = self.columns, 1 / self.cell_size
+        cells = (y_position * scale).astype(np.int16)
+        np.minimum(cells, self.rows - 1, out=cells)
+        np.maximum(cells, 0, out=cells)
+        cells *= columns
+        column = (x_position * scale).astype(np.int16)
+        np.minimum(column, columns - 1, out=column)
+        np.maximum(column, 0, out=column)
+        cells += column
+        # A stable sort of 16-bit keys is a radix sort, linear in the number of balls
+        order = np.argsort(cells, kind="stable")
+        starts = self.starts
+        np.cumsum(np.bincount(cells, minlength=self.cells), out=starts[1:])
+
+        found = []
+        for paddle in paddles:
+            first_row, last_row, first_column, last_column = self.cell_range(paddle, radius)
+            slices = [
+                order[starts[row * columns + first_column] : starts[row * columns + last_column + 1]]
+                for row in range(first_row, last_row + 1)
+            ]
+            found.append(slices[0] if len(slices) == 1 else np.concatenate(slices))
+        return found
+
+
+class ChaosSimulation:
+    """Match with many balls in play at once, stepped as arrays."""
+
+    def __init__(
+        self,
+        balls: int,
+        template: PongSimulation = None,
+        extra_paddles: list = (),
+        seed: int = 0,
+        broadphase: bool = True,
+    ) -> None:
+        """Chaos simulation init.
+
+        Args:
+            balls (int): number of balls in play.
+            template (PongSimulation, optional): match whose config, paddles, ball size and players are used.
+                Defaults to a fresh PongSimulation.
+            extra_paddles (list, optional): Paddles besides the left and right ones. A paddle in the left half of
+                the court returns balls to the right, and one in the right half to the left. Defaults to none.
+            seed (int, optional): seed of the serve directions. Defaults to 0.
+            broadphase (bool, optional): use the grid to pick which balls to test against each paddle, instead of
+                testing every ball against every paddle. Defaults to True.
+        """
+        if template is None:
+            template = PongSimulation()
+        logger.info("Initializing chaos simulation with %s balls.", balls)
+        self.config = config = template.config
+        self.paddle_left = template.paddle_left
+        self.paddle_right = template.paddle_right
+        self.paddles = [self.paddle_left, self.paddle_right, *extra_paddles]
+        self.player_one = template.player_one
+        self.player_two = template.player_two
+        self.ticks = 0
+
+        ball = template.ball
+        self.balls = BallCollection(balls, ball.radius, ball.colour)
+        self.ball_max_velocity = ball.max_velocity
+        self.serve_x = ball.x_position_original
+        self.serve_x_velocity = abs(ball.x_velocity)
+        self.grid = PaddleGrid(config.window_width, config.window_height) if broadphase else None
+        self.rng = np.random.default_rng(seed)
+        self._goals = np.zeros(balls, dtype=np.int8)
+        self.serve(np.arange(balls))
+
+    # Paddle input handling is shared with the two-player rules
+    move_paddle = PongSimulation.move_paddle
+
+    def serve(self, indices):
+        """Serves balls from random heights on the centre line, in random directions.
+
+        Args:
+            indices (numpy.ndarray): the balls to serve.
+        """
+        count = len(indices)
+        balls, radius, height = self.balls, self.balls.radius, self.config.window_height
+        balls.x_position[indices] = self.serve_x
+        balls.y_position[indices] = self.rng.uniform(radius, height - radius, count)
+        balls.x_velocity[indices] = (self.rng.integers(0, 2, count) * 2 - 1) * self.serve_x_velocity
+        balls.y_velocity[indices] = self.rng.uniform(-self.ball_max_velocity, self.ball_max_velocity, count)
+
+    def handle_wall_collisions(self):
+        """Bounces every ball moving into the top or bottom wall."""
+        balls, radius = self.balls, self.balls.radius
+        y_position, y_velocity = balls.y_position, balls.y_velocity
+        bounce = (y_position <= radius) & (y_velocity < 0)
+        bounce |= (y_position >= self.config.window_height - radius) & (y_velocity > 0)
+        np.negative(y_velocity, out=y_velocity, where=bounce)
+
+    def handle_paddle_collisions(self):
+        """Returns every ball moving into a paddle face, as PongSimulation.calculate_return_y_velocity would."""
+        balls, radius = self.balls, self.balls.radius
+        if self.grid is not None:
+            found = self.grid.candidates(balls.x_position, balls.y_position, self.paddles, radius)
+        else:
+            found = [np.arange(len(balls))] * len(self.paddles)
+
+        centre_x = self.config.window_width / 2
+        for paddle, indices in zip(self.paddles, found):
+            if not len(indices):
+                continue
+            x_position, y_position = balls.x_position[indices], balls.y_position[indices]
+            x_velocity = balls.x_velocity[indices]
+            hit = (y_position >= paddle.y_position) & (y_position <= paddle.y_position + paddle.height)
+            hit &= x_position - radius <= paddle.x_position + paddle.width
+            hit &= x_position + radius >= paddle.x_position
+            hit &= (x_velocity > 0) if paddle.x_position >= centre_x else (x_velocity < 0)
+            if not hit.any():
+                continue
+            indices = indices[hit]
+            balls.x_velocity[indices] = -x_velocity[hit]
+            displacement_from_paddle = y_position[hit] - (paddle.y_position + (paddle.height // 2))
+            balls.y_velocity[indices] = displacement_from_paddle / ((paddle.height // 2) / self.ball_max_velocity)
+
+    def goal(self):
+        """Scores and re-serves every ball past an end line.
+
+        Returns:
+            numpy.ndarray: NO_GOAL, PLAYER_ONE or PLAYER_TWO per ball, naming who it scored for this tick.
+        """
+        goals = self._goals
+        goals.fill(NO_GOAL)
+        x_position = self.balls.x_position
+        two_scored = x_position < 0
+        one_scored = x_position > self.config.window_width
+        scored = np.flatnonzero(two_scored | one_scored)
+        if len(scored):
+            goals[one_scored] = PLAYER_ONE
+            goals[two_scored] = PLAYER_TWO
+            self.player_one.score += int(np.count_nonzero(one_scored))
+            self.player_two.score += int(np.count_nonzero(two_scored))
+            self.serve(scored)
+        return goals
+
+    def step(self, inputs: int = NO_INPUT):
+        """Advances every ball by one tick.
+
+        Args:
+            inputs (int, optional): Input bits held this tick, moving the left and right paddles. Defaults to
+                NO_INPUT.
+
+        Returns:
+            numpy.ndarray: NO_GOAL, PLAYER_ONE or PLAYER_TWO per ball, valid until the next step.
+        """
+        self.ticks += 1
+        self.move_paddle(inputs)
+        balls = self.balls
+        balls.x_position += balls.x_velocity
+        balls.y_position += balls.y_velocity
+        self.handle_wall_collisions()
+        self.handle_paddle_collisions()
+        return self.goal()
@@ -0,0 +1,71 @@
+import random
+
+import batch
+import chaos
+import numpy as np
+import pytest
+import simulation
+
+
+@pytest.fixture
+def setup():
+    game = chaos.ChaosSimulation(200, seed=3)
+    balls = game.balls
+    yield (game, balls)
+
+
+def extra_paddles():
+    return [simulation.Paddle(150 + 60 * index, 50 * index, 10, 80) for index in range(6)]
+
+
+def test_broadphase_matches_testing_every_pair():
+    grid = chaos.ChaosSimulation(500, extra_paddles=extra_paddles(), seed=1)
+    every_pair = chaos.ChaosSimulation(500, extra_paddles=extra_paddles(), seed=1, broadphase=False)
+    rng = random.Random(5)
+    goals = 0
+    for _ in range(2000):
+        inputs = rng.randrange(16)
+        assert np.array_equal(grid.step(inputs), every_pair.step(inputs))
+        goals += np.count_nonzero(grid._goals)
+    for name in ("x_position", "y_position", "x_velocity", "y_velocity"):
+        assert np.array_equal(getattr(grid.balls, name), getattr(every_pair.balls, name))
+    assert goals == grid.player_one.score + grid.player_two.score > 0
+    assert (grid.player_one.score, grid.player_two.score) == (every_pair.player_one.score, every_pair.player_two.score)
+
+
+def test_goals_are_per_ball(setup):
+    game, balls = setup
+    balls.x_position[:] = 300
+    balls.x_velocity[:] = 1
+    balls.y_velocity[:] = 0
+    balls.x_position[7] = simulation.WINDOW_WIDTH
+    balls.x_position[9] = 0
+    balls.x_velocity[9] = -1
+    goals = game.step()
+    assert np.flatnonzero(goals).tolist() == [7, 9]
+    assert (goals[7], goals[9]) == (batch.PLAYER_ONE, batch.PLAYER_TWO)
+    assert (game.player_one.score, game.player_two.score) == (1, 1)
+    assert balls.x_position[7] == balls.x_position[9] == game.serve_x
+    assert abs(balls.x_velocity[7]) == game.serve_x_velocity
+    assert np.all(balls.x_position[:7] == 301)
+
+
+def test_bounces_only_off_surfaces_moved_towards(setup):
+    game, balls = setup
+    left = game.paddle_left
+    balls.x_position[:] = 300
+    balls.y_position[:] = 200
+    balls.x_velocity[:] = 1
+    balls.y_velocity[:] = 0
+    # Moving into the left paddle's face, and already inside it heading out
+    balls.x_position[0:2] = left.x_position + left.width + balls.radius
+    balls.x_velocity[0:2] = (-1, 1)
+    balls.y_position[0:2] = left.y_position + left.height // 2 + 10
+    # Moving into the top wall, and just inside it heading away
+    balls.y_position[2:4] = 1
+    balls.y_velocity[2:4] = (-1, 1)
+    game.step()
+    # Returned as PongSimulation.calculate_return_y_velocity would, 10 pixels below the paddle centre
+    assert balls.x_velocity[0] == 1 and balls.y_velocity[0] == 10 / ((left.height // 2) / game.ball_max_velocity)
+    assert balls.x_velocity[1] == 1 and balls.y_velocity[1] == 0
+    assert balls.y_velocity[2] == 1 and balls.y_velocity[3] == 1
@@ -0,0 +1,235 @@
+"""This module contains a compact binary codec for match state snapshots.
+
+A snapshot is a tuple of integers: a sequence number followed by the FIELDS of a match, quantized by SCALES.
+A keyframe writes every field as a zigzag varint. A delta names the snapshot it is relative to, which should be
+the last one the receiver acknowledged, and writes a bitmask of the changed fields followed by the varint
+difference of each changed field only, so unchanged fields such as scores and idle paddles cost nothing.
+
+Layout, every integer a varint: keyframe = KEYFRAME, sequence, fields; delta = DELTA, sequence, sequence minus
+base sequence, changed mask, differences of the changed fields in FIELDS order.
+   """
+
+from collections import OrderedDict
+
+# Message kinds, the first byte of every encoded snapshot
+KEYFRAME = 0
+DELTA = 1
+
+# Snapshot fields after the sequence number, and the factor each is multiplied by before rounding, so the ball is
+# sent to 1/BALL_SCALE of a pixel and paddles and scores exactly
+FIELDS = ("ball_x", "ball_y", "ball_x_velocity", "ball_y_velocity", "left_y", "right_y", "score_one", "score_two")
+BALL_SCALE = 64
+SCALES = (BALL_SCALE,) * 4 + (1,) * 4
+
+# Unacknowledged snapshots an encoder keeps, and decoded snapshots a decoder keeps, as delta bases
+HISTORY = 128
+
+
+def quantize(game, sequence: int) -> tuple:
+    """Builds a snapshot of a match.
+
+    Args:
+        game (PongSimulation): the match.
+        sequence (int): snapshot number, increasing by at least one per snapshot, e.g. the server tick.
+
+    Returns:
+        tuple: sequence followed by the quantized FIELDS.
+    """
+    ball = game.ball
+    return (
+        sequence,
+        round(ball.x_position * BALL_SCALE),
+        round(ball.y_position * BALL_SCALE),
+        round(ball.x_velocity * BALL_SCALE),
+        round(ball.y_velocity * BALL_SCALE),
+        game.paddle_left.y_position,
+        game.paddle_right.y_position,
+        game.player_one.score,
+        game.player_two.score,
+    )
+
+
+def dequantize(snapshot: tuple) -> tuple:
+    """Converts a snapshot back to game units.
+
+    Args:
+        snapshot (tuple): a quantize() result.
+
+    Returns:
+        tuple: sequence followed by ball x, y, x velocity, y velocity, paddle ys and scores.
+    """
+    return (snapshot[0],) + tuple(value / scale if scale != 1 else value for value, scale in zip(snapshot[1:], SCALES))
+
+
+def _write_varint(out: bytearray, value: int):
+    """Appends a non-negative integer, 7 bits per byte, low bits first."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_signed(out: bytearray, value: int):
+    """Appends a signed integer as a zigzag varint, so small magnitudes of either sign take one byte."""
+    _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+
+
+def _read_varint(data: bytes, offset: int) -> tuple:
+    """Reads a varint, returning the value and the offset after it."""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _read_signed(data: bytes, offset: int) -> tuple:
+    """Reads a zigzag varint, returning the value and the offset after it."""
+    value, offset = _read_varint(data, offset)
+    return (value >> 1) ^ -(value & 1), offset
+
+
+def encode_keyframe(snapshot: tuple) -> bytes:
+    """Encodes a snapshot on its own.
+
+    Args:
+        snapshot (tuple): a quantize() result.
+
+    Returns:
+        bytes: the encoded keyframe.
+    """
+    out = bytearray((KEYFRAME,))
+    _write_varint(out, snapshot[0])
+    for value in snapshot[1:]:
+        _write_signed(out, value)
+    return bytes(out)
+
+
+def encode_delta(snapshot: tuple, base: tuple) -> bytes:
+    """Encodes a snapshot as the changes from an earlier one.
+
+    Args:
+        snapshot (tuple): a quantize() result.
+        base (tuple): an earlier snapshot the receiver holds.
+
+    Returns:
+        bytes: the encoded delta.
+    """
+    out = bytearray((DELTA,))
+    _write_varint(out, snapshot[0])
+    _write_varint(out, snapshot[0] - base[0])
+    mask_at = len(out)
+    out.append(0)
+    mask = 0
+    for bit, (value, base_value) in enumerate(zip(snapshot[1:], base[1:])):
+        if value != base_value:
+            mask |= 1 << bit
+            _write_signed(out, value - base_value)
+    out[mask_at] = mask
+    return bytes(out)
+
+
+def decode(data: bytes, bases: dict) -> tuple:
+    """Decodes a keyframe or delta.
+
+    Args:
+        data (bytes): an encoded snapshot.
+        bases (dict): earlier snapshots by sequence number, for deltas.
+
+    Returns:
+        tuple: the snapshot.
+
+    Raises:
+        KeyError: a delta's base snapshot is not in bases.
+    """
+    sequence, offset = _read_varint(data, 1)
+    if data[0] == KEYFRAME:
+        values = []
+        for _ in FIELDS:
+            value, offset = _read_signed(data, offset)
+            values.append(value)
+        return (sequence, *values)
+
+    gap, offset = _read_varint(data, offset)
+    mask = data[offset]
+    offset += 1
+    values = list(bases[sequence - gap])
+    values[0] = sequence
+    for bit in range(len(FIELDS)):
+        if mask & (1 << bit):
+            difference, offset = _read_signed(data, offset)
+            values[bit + 1] += difference
+    return tuple(values)
+
+
+class SnapshotEncoder:
+    """Encodes a stream of snapshots for one receiver as deltas against the last snapshot it acknowledged."""
+
+    def __init__(self) -> None:
+        """Snapshot encoder init."""
+        self.sent = OrderedDict()
+        self.base = None
+
+    def encode(self, snapshot: tuple, cache: dict = None) -> bytes:
+        """Encodes a snapshot, as a keyframe until the receiver has acknowledged one.
+
+        Args:
+            snapshot (tuple): a quantize() result.
+            cache (dict, optional): encodings of this snapshot by base sequence, shared between encoders sending
+                the same snapshot to different receivers so each distinct encoding is built once. Defaults to None.
+
+        Returns:
+            bytes: the encoded snapshot.
+        """
+        self.sent[snapshot[0]] = snapshot
+        if len(self.sent) > HISTORY:
+            self.sent.popitem(last=False)
+            if self.base is not None and self.base[0] not in self.sent:
+                # The receiver may have dropped this base from its own history by now
+                self.base = None
+        base_sequence = None if self.base is None else self.base[0]
+        if cache is not None and base_sequence in cache:
+            return cache[base_sequence]
+        data = encode_keyframe(snapshot) if self.base is None else encode_delta(snapshot, self.base)
+        if cache is not None:
+            cache[base_sequence] = data
+        return data
+
+    def ack(self, sequence: int):
+        """Records that the receiver holds a snapshot, making it the base of later deltas.
+
+        Args:
+            sequence (int): the acknowledged snapshot's sequence number.
+        """
+        snapshot = self.sent.get(sequence)
+        if snapshot is None or (self.base is not None and sequence <= self.base[0]):
+            return
+        self.base = snapshot
+        while next(iter(self.sent)) < sequence:
+            self.sent.popitem(last=False)
+
+
+class SnapshotDecoder:
+    """Decodes a stream of snapshots, keeping recent ones as delta bases."""
+
+    def __init__(self) -> None:
+        """Snapshot decoder init."""
+        self.received = OrderedDict()
+
+    def decode(self, data: bytes) -> tuple:
+        """Decodes a snapshot and keeps it as a possible base.
+
+        Args:
+            data (bytes): an encoded snapshot.
+
+        Returns:
+            tuple: the snapshot.
+        """
+        snapshot = decode(data, self.received)
+        self.received[snapshot[0]] = snapshot
+        if len(self.received) > HISTORY:
+            self.received.popitem(last=False)
+        return snapshot
@@ -0,0 +1,57 @@
+import codec
+import pytest
+from controllers import FollowBall, RandomMoves, to_inputs
+from simulation import PongSimulation
+
+
+@pytest.fixture
+def setup():
+    left, right = FollowBall(), RandomMoves()
+    right.reset(3)
+    game = PongSimulation(goal_pause_ticks=30)
+    snapshots = []
+    for tick in range(1500):
+        game.update(to_inputs(left(game, game.paddle_left), right(game, game.paddle_right)))
+        snapshots.append(codec.quantize(game, tick))
+    yield snapshots
+
+
+def test_keyframe_and_delta_round_trip(setup):
+    snapshots = setup
+    for base, snapshot in zip(snapshots, snapshots[7:]):
+        assert codec.decode(codec.encode_keyframe(snapshot), {}) == snapshot
+        assert codec.decode(codec.encode_delta(snapshot, base), {base[0]: base}) == snapshot
+
+
+def test_unchanged_fields_cost_nothing():
+    base = (10, 100, -200, 320, 0, 150, 150, 2, 4)
+    assert len(codec.encode_delta((11,) + base[1:], base)) == 4
+    moved = (11, 420, -200, 320, 0, 150, 155, 2, 4)
+    assert len(codec.encode_delta(moved, base)) == 4 + 2 + 1
+
+
+def test_stream_with_late_acks(setup):
+    snapshots = setup
+    encoder, decoder = codec.SnapshotEncoder(), codec.SnapshotDecoder()
+    delivered = []
+    for index, snapshot in enumerate(snapshots):
+        data = encoder.encode(snapshot)
+        if index % 5 == 4:
+            # Lost on the way, so never acknowledged
+            continue
+        assert decoder.decode(data) == snapshot
+        delivered.append((index, snapshot[0]))
+        acknowledged = [sequence for sent, sequence in delivered if sent <= index - 3]
+        if acknowledged:
+            encoder.ack(acknowledged[-1])
+    assert encoder.base is not None
+
+
+def test_stale_base_falls_back_to_keyframe(setup):
+    snapshots = setup
+    encoder = codec.SnapshotEncoder()
+    encoder.encode(snapshots[0])
+    encoder.ack(snapshots[0][0])
+    for snapshot in snapshots[1 : codec.HISTORY + 1]:
+        data = encoder.encode(snapshot)
+    assert data[0] == codec.KEYFRAME
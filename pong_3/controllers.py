@@ -0,0 +1,252 @@
+"""This module contains the paddle controller interface and the pygame-free controllers.
+
+A controller is called once per tick with the simulation and the paddle it owns and returns UP, IDLE or DOWN.
+Controllers that subclass BatchController instead answer for many paddles at once through act_batch, which
+choose_moves uses to make one call per controller per tick however many paddles or matches it drives.
+   """
+
+from abc import ABC, abstractmethod
+import random
+
+from predictor import TrajectoryPredictor, paddle_face_x
+from simulation import LEFT_DOWN, LEFT_UP, NO_INPUT, RIGHT_DOWN, RIGHT_UP
+
+# Paddle moves a controller can return
+UP = -1
+IDLE = 0
+DOWN = 1
+
+
+def move_towards(paddle, target_y: float, dead_zone: int) -> int:
+    """Chooses the move bringing the paddle centre towards target_y.
+
+    Args:
+        paddle (Paddle): the paddle to move.
+        target_y (float): height to centre the paddle on.
+        dead_zone (int): distance from the paddle centre within which the paddle holds still.
+
+    Returns:
+        int: UP, IDLE or DOWN.
+    """
+    offset = target_y - (paddle.y_position + paddle.height // 2)
+    if offset < -dead_zone:
+        return UP
+    if offset > dead_zone:
+        return DOWN
+    return IDLE
+
+
+def observe(game, paddle) -> tuple:
+    """Builds the observation a policy sees for one paddle.
+
+    Args:
+        game (PongSimulation): the match being played.
+        paddle (Paddle): the paddle being controlled.
+
+    Returns:
+        tuple: ball x, ball y, ball x velocity, ball y velocity, own paddle y and opponent paddle y.
+    """
+    ball = game.ball
+    opponent = game.paddle_right if paddle is game.paddle_left else game.paddle_left
+    return (
+        ball.x_position,
+        ball.y_position,
+        ball.x_velocity,
+        ball.y_velocity,
+        paddle.y_position,
+        opponent.y_position,
+    )
+
+
+def to_inputs(left_move: int, right_move: int) -> int:
+    """Combines the left and right paddle moves into simulation input bits.
+
+    Args:
+        left_move (int): UP, IDLE or DOWN for the left paddle.
+        right_move (int): UP, IDLE or DOWN for the right paddle.
+
+    Returns:
+        int: input bits for PongSimulation.step
+    """
+    inputs = NO_INPUT
+    if left_move == UP:
+        inputs |= LEFT_UP
+    elif left_move == DOWN:
+        inputs |= LEFT_DOWN
+    if right_move == UP:
+        inputs |= RIGHT_UP
+    elif right_move == DOWN:
+        inputs |= RIGHT_DOWN
+    return inputs
+
+
+class Controller:
+    """Base paddle controller. Subclasses override __call__ and, if they hold state, reset."""
+
+    @property
+    def name(self) -> str:
+        """Name given to the Player this controller plays as."""
+        return type(self).__name__
+
+    def reset(self, seed: int) -> None:
+        """Prepares the controller for a new match.
+
+        Args:
+            seed (int): match seed, used by controllers with randomness so matches are reproducible.
+        """
+
+    def __call__(self, game, paddle) -> int:
+        """Chooses this tick's move.
+
+        Args:
+            game (PongSimulation): the match being played.
+            paddle (Paddle): the paddle this controller moves.
+
+        Returns:
+            int: UP, IDLE or DOWN.
+        """
+        return IDLE
+
+
+class FollowBall(Controller):
+    """Moves the paddle centre towards the ball's height."""
+
+    def __init__(self, dead_zone: int = 10) -> None:
+        """FollowBall init.
+
+        Args:
+            dead_zone (int, optional): distance from the paddle centre within which the paddle holds still.
+                Defaults to 10.
+        """
+        self.dead_zone = dead_zone
+
+    def __call__(self, game, paddle) -> int:
+        return move_towards(paddle, game.ball.y_position, self.dead_zone)
+
+
+class Predictive(Controller):
+    """Moves the paddle to where the ball will cross it, and back to the middle while the ball moves away."""
+
+    def __init__(self, dead_zone: int = 10) -> None:
+        """Predictive init.
+
+        Args:
+            dead_zone (int, optional): distance from the paddle centre within which the paddle holds still.
+                Defaults to 10.
+        """
+        self.dead_zone = dead_zone
+        self.predictor = TrajectoryPredictor()
+
+    def reset(self, seed: int) -> None:
+        self.predictor = TrajectoryPredictor()
+
+    def __call__(self, game, paddle) -> int:
+        height = game.config.window_height
+        intercept = self.predictor.predict(game.ball, paddle_face_x(paddle, game.ball), game.ticks, height)
+        target_y = height / 2 if intercept is None else intercept.y_position
+        return move_towards(paddle, target_y, self.dead_zone)
+
+
+class RandomMoves(Controller):
+    """Picks a random move each tick from a per-match seeded generator."""
+
+    def __init__(self) -> None:
+        """RandomMoves init."""
+        self.rng = random.Random()
+
+    def reset(self, seed: int) -> None:
+        self.rng.seed(seed)
+
+    def __call__(self, game, paddle) -> int:
+        return self.rng.choice((UP, IDLE, DOWN))
+
+
+class Replay(Controller):
+    """Plays back a recorded sequence of moves, then holds still."""
+
+    def __init__(self, moves) -> None:
+        """Replay init.
+
+        Args:
+            moves (list): UP, IDLE or DOWN per tick.
+        """
+        self.moves = moves
+        self.position = 0
+
+    def reset(self, seed: int) -> None:
+        self.position = 0
+
+    def __call__(self, game, paddle) -> int:
+        if self.position >= len(self.moves):
+            return IDLE
+        move = self.moves[self.position]
+        self.position += 1
+        return move
+
+
+class BatchController(Controller, ABC):
+    """Controller answering for many paddles in one act_batch call. Subclasses must implement act_batch."""
+
+    @abstractmethod
+    def act_batch(self, observations):
+        """Chooses moves for several paddles at once.
+
+        Args:
+            observations (list): an observe() tuple per paddle, or an (N, 6) array from BatchSimulation.observe.
+
+        Returns:
+            list: UP, IDLE or DOWN per observation, in the same order.
+        """
+
+    def __call__(self, game, paddle) -> int:
+        return self.act_batch([observe(game, paddle)])[0]
+
+
+class Policy(BatchController):
+    """Adapts a batched policy function, such as a neural network's forward pass, to the controller API."""
+
+    def __init__(self, policy, name: str = "Policy") -> None:
+        """Policy init.
+
+        Args:
+            policy (callable): maps a list or array of observations to a move per observation.
+            name (str, optional): name given to the Player. Defaults to "Policy".
+        """
+        self.policy = policy
+        self.policy_name = name
+
+    @property
+    def name(self) -> str:
+        return self.policy_name
+
+    def act_batch(self, observations):
+        return self.policy(observations)
+
+
+def choose_moves(assignments) -> list:
+    """Asks every controller for its paddle's move, batching calls to BatchControllers.
+
+    Each BatchController is called once with the observations of all paddles it drives; other controllers are
+    called per paddle.
+
+    Args:
+        assignments (list): (controller, game, paddle) tuples.
+
+    Returns:
+        list: UP, IDLE or DOWN per assignment, in the same order.
+    """
+    moves = [IDLE] * len(assignments)
+    batches = {}
+    for index, (controller, game, paddle) in enumerate(assignments):
+        if isinstance(controller, BatchController):
+            batches.setdefault(id(controller), (controller, [], []))
+            _, indices, observations = batches[id(controller)]
+            indices.append(index)
+            observations.append(observe(game, paddle))
+        else:
+            moves[index] = controller(game, paddle)
+
+    for controller, indices, observations in batches.values():
+        for index, move in zip(indices, controller.act_batch(observations)):
+            moves[index] = move
+    return moves
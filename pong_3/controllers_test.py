@@ -0,0 +1,47 @@
+import controllers
+import match
+import pytest
+import simulation
+
+
+class CountingPolicy(controllers.BatchController):
+    def __init__(self):
+        self.calls = 0
+
+    def act_batch(self, observations):
+        self.calls += 1
+        return [controllers.UP if ball_y < own_y else controllers.DOWN for _, ball_y, _, _, own_y, _ in observations]
+
+
+def test_batch_controller_called_once_for_all_paddles():
+    policy = CountingPolicy()
+    games = [simulation.PongSimulation() for _ in range(4)]
+    assignments = [(policy, game, paddle) for game in games for paddle in game.get_paddles()]
+    moves = controllers.choose_moves(assignments)
+    assert policy.calls == 1
+    assert len(moves) == 8
+
+
+def test_batch_controller_requires_act_batch():
+    class Incomplete(controllers.BatchController):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_lockstep_matches_one_at_a_time():
+    policy = controllers.Policy(lambda observations: [controllers.UP for _ in observations])
+    seeds = list(range(3))
+    lockstep = match.play_lockstep(policy, controllers.FollowBall(), seeds, max_ticks=5000)
+    single = [match.play_match(policy, controllers.FollowBall(), seed, max_ticks=5000) for seed in seeds]
+    assert lockstep == single
+    assert all(result.winner == "FollowBall" for result in lockstep)
+
+
+def test_replay_plays_moves_then_idles():
+    replay = controllers.Replay([controllers.UP, controllers.DOWN])
+    game = simulation.PongSimulation()
+    assert [replay(game, game.paddle_left) for _ in range(3)] == [controllers.UP, controllers.DOWN, controllers.IDLE]
+    replay.reset(0)
+    assert replay(game, game.paddle_left) == controllers.UP
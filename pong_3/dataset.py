@@ -0,0 +1,246 @@
+"""This module contains an on-disk trajectory store for training paddle policies.
+
+A dataset is a directory holding one raw little-endian file per column, so every record has a fixed size and a
+reader can numpy.memmap each column for zero-copy random access. Writers buffer records and append them a chunk at
+a time, then append the chunk's (first record, record count) to chunks.bin. Readers only see records covered by
+that index, so a dataset interrupted mid-write stays readable, and shuffled minibatches are streamed by shuffling
+chunk order and then records within a bounded window of chunks, so datasets far larger than RAM can be read.
+   """
+
+import json
+import os
+
+import numpy as np
+
+from controllers import to_inputs
+from match import MAX_MATCH_TICKS
+from simulation import DEFAULT_CONFIG, GameConfig, PongSimulation
+
+FORMAT_VERSION = 1
+
+# Column names and dtypes of one record: the state before a tick, the inputs held that tick and the reward
+# the left player received for it
+COLUMNS = (
+    ("ball_x", "<f4"),
+    ("ball_y", "<f4"),
+    ("ball_x_velocity", "<f4"),
+    ("ball_y_velocity", "<f4"),
+    ("left_y", "<i2"),
+    ("right_y", "<i2"),
+    ("score_one", "u1"),
+    ("score_two", "u1"),
+    ("inputs", "u1"),
+    ("reward", "i1"),
+)
+
+# Records buffered before a chunk is appended to the column files
+CHUNK_RECORDS = 4096
+
+META_FILE = "meta.json"
+CHUNKS_FILE = "chunks.bin"
+
+
+def _column_path(path: str, name: str) -> str:
+    return os.path.join(path, f"{name}.bin")
+
+
+def _read_chunks(path: str):
+    """Returns the chunk index of a dataset as an (N, 2) array of first record and record count."""
+    chunks_path = os.path.join(path, CHUNKS_FILE)
+    if not os.path.exists(chunks_path):
+        return np.empty((0, 2), dtype="<i8")
+    return np.fromfile(chunks_path, dtype="<i8").reshape(-1, 2)
+
+
+class TrajectoryWriter:
+    """Appends records to a dataset directory, creating it if needed."""
+
+    def __init__(self, path: str, chunk_records: int = CHUNK_RECORDS) -> None:
+        """Trajectory writer init.
+
+        Args:
+            path (str): dataset directory.
+            chunk_records (int, optional): records per appended chunk. Defaults to CHUNK_RECORDS.
+        """
+        self.path = path
+        self.chunk_records = chunk_records
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as meta_file:
+                meta = json.load(meta_file)
+            if meta["version"] != FORMAT_VERSION or [tuple(column) for column in meta["columns"]] != list(COLUMNS):
+                raise ValueError(f"{path} holds a dataset with a different layout")
+        else:
+            with open(meta_path, "w") as meta_file:
+                json.dump({"version": FORMAT_VERSION, "columns": COLUMNS}, meta_file)
+
+        chunks = _read_chunks(path)
+        self.records = int(chunks[-1].sum()) if len(chunks) else 0
+        # Drop column data from a chunk whose index entry was never written, so appends stay aligned
+        for name, dtype in COLUMNS:
+            with open(_column_path(path, name), "ab") as column_file:
+                column_file.truncate(self.records * np.dtype(dtype).itemsize)
+        self.buffers = {name: np.empty(chunk_records, dtype=dtype) for name, dtype in COLUMNS}
+        self.buffered = 0
+
+    def append(self, game: PongSimulation, inputs: int, reward: int = 0):
+        """Buffers one record, taking the state from a match before its tick is run.
+
+        Args:
+            game (PongSimulation): the match, in the state the inputs were chosen from.
+            inputs (int): input bits held this tick.
+            reward (int, optional): reward for the tick; it is usually only known after the tick and set with
+                set_reward. Defaults to 0.
+        """
+        if self.buffered == self.chunk_records:
+            self.flush()
+        ball = game.ball
+        index = self.buffered
+        buffers = self.buffers
+        buffers["ball_x"][index] = ball.x_position
+        buffers["ball_y"][index] = ball.y_position
+        buffers["ball_x_velocity"][index] = ball.x_velocity
+        buffers["ball_y_velocity"][index] = ball.y_velocity
+        buffers["left_y"][index] = game.paddle_left.y_position
+        buffers["right_y"][index] = game.paddle_right.y_position
+        buffers["score_one"][index] = game.player_one.score
+        buffers["score_two"][index] = game.player_two.score
+        buffers["inputs"][index] = inputs
+        buffers["reward"][index] = reward
+        self.buffered += 1
+
+    def set_reward(self, reward: int):
+        """Sets the reward of the last appended record.
+
+        Args:
+            reward (int): 1 if the left player scored on that tick, -1 if the right player did, otherwise 0.
+        """
+        self.buffers["reward"][self.buffered - 1] = reward
+
+    def append_columns(self, **columns):
+        """Appends many records at once, e.g. one per match of a BatchSimulation tick.
+
+        Args:
+            **columns (numpy.ndarray): an equal-length array for every column in COLUMNS.
+        """
+        self.flush()
+        count = len(columns["inputs"])
+        self._write({name: np.asarray(columns[name], dtype=dtype) for name, dtype in COLUMNS}, count)
+
+    def flush(self):
+        """Appends the buffered records to the column files as one chunk."""
+        if self.buffered:
+            self._write({name: buffer[: self.buffered] for name, buffer in self.buffers.items()}, self.buffered)
+            self.buffered = 0
+
+    def _write(self, columns: dict, count: int):
+        """Appends one chunk of column data, then its index entry."""
+        for name, values in columns.items():
+            with open(_column_path(self.path, name), "ab") as column_file:
+                column_file.write(values.tobytes())
+        with open(os.path.join(self.path, CHUNKS_FILE), "ab") as chunks_file:
+            chunks_file.write(np.array([self.records, count], dtype="<i8").tobytes())
+        self.records += count
+
+    def close(self):
+        """Flushes any buffered records."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def record_match(
+    writer: TrajectoryWriter,
+    left,
+    right,
+    seed: int = 0,
+    max_ticks: int = MAX_MATCH_TICKS,
+    config: GameConfig = DEFAULT_CONFIG,
+):
+    """Plays one headless match between two controllers, appending a record per tick.
+
+    Args:
+        writer (TrajectoryWriter): dataset to append to.
+        left (Controller): controller for the left paddle.
+        right (Controller): controller for the right paddle.
+        seed (int, optional): match seed passed to both controllers. Defaults to 0.
+        max_ticks (int, optional): tick limit. Defaults to MAX_MATCH_TICKS.
+        config (GameConfig, optional): gameplay settings. Defaults to DEFAULT_CONFIG.
+
+    Returns:
+        PongSimulation: the match in its final state.
+    """
+    left.reset(seed)
+    right.reset(seed)
+    game = PongSimulation(left.name, right.name, config=config)
+    while game.ticks < max_ticks:
+        inputs = to_inputs(left(game, game.paddle_left), right(game, game.paddle_right))
+        writer.append(game, inputs)
+        scorer = game.step(inputs)
+        if scorer is not None:
+            writer.set_reward(1 if scorer is game.player_one else -1)
+            if game.get_winner() is not None:
+                break
+    return game
+
+
+class TrajectoryDataset:
+    """Read-only, memory-mapped view of a dataset directory."""
+
+    def __init__(self, path: str) -> None:
+        """Trajectory dataset init.
+
+        Args:
+            path (str): dataset directory.
+        """
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as meta_file:
+            meta = json.load(meta_file)
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"{path} holds a version {meta['version']} dataset, expected {FORMAT_VERSION}")
+        self.chunks = _read_chunks(path)
+        self.records = int(self.chunks[-1].sum()) if len(self.chunks) else 0
+        self.columns = {
+            name: np.memmap(_column_path(path, name), dtype=dtype, mode="r", shape=(self.records,))
+            if self.records
+            else np.empty(0, dtype=dtype)
+            for name, dtype in meta["columns"]
+        }
+
+    def __len__(self) -> int:
+        return self.records
+
+    def __getitem__(self, index) -> dict:
+        """Returns the records at an index, slice or index array, one array per column.
+
+        Slices return views of the mapped files; index arrays copy only the selected records.
+        """
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def iter_minibatches(self, batch_size: int, seed: int = None, window_chunks: int = 8):
+        """Streams the whole dataset once as shuffled minibatches.
+
+        Chunks are visited in random order, window_chunks at a time, and the records of each window are shuffled
+        together, so at most window_chunks chunks of records are read into memory at once.
+
+        Args:
+            batch_size (int): records per minibatch; the last one of each window may be smaller.
+            seed (int, optional): shuffle seed. Defaults to None, unseeded.
+            window_chunks (int, optional): chunks shuffled together. Defaults to 8.
+
+        Yields:
+            dict: one array per column. Records within a minibatch are in file order, which keeps reads sequential.
+        """
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(self.chunks))
+        for window_start in range(0, len(order), window_chunks):
+            window = self.chunks[np.sort(order[window_start : window_start + window_chunks])]
+            indices = np.concatenate([np.arange(start, start + count) for start, count in window])
+            rng.shuffle(indices)
+            for batch_start in range(0, len(indices), batch_size):
+                yield self[np.sort(indices[batch_start : batch_start + batch_size])]
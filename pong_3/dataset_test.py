@@ -0,0 +1,50 @@
+import dataset
+import numpy as np
+import pytest
+from controllers import FollowBall, RandomMoves
+
+
+@pytest.fixture
+def setup(tmp_path):
+    path = str(tmp_path / "trajectories")
+    with dataset.TrajectoryWriter(path, chunk_records=500) as writer:
+        games = [dataset.record_match(writer, FollowBall(), RandomMoves(), seed) for seed in range(3)]
+    yield (path, games)
+
+
+def test_records_every_tick(setup):
+    path, games = setup
+    data = dataset.TrajectoryDataset(path)
+    assert len(data) == sum(game.ticks for game in games)
+    assert isinstance(data.columns["ball_x"], np.memmap)
+    first = data[0]
+    assert first["ball_x"] == games[0].ball.x_position_original
+    assert first["score_one"] == first["score_two"] == 0
+    rewards = data[:]["reward"]
+    assert (rewards == 1).sum() == sum(game.player_one.score for game in games)
+    assert (rewards == -1).sum() == sum(game.player_two.score for game in games)
+
+
+def test_minibatches_cover_dataset_once(setup):
+    path, games = setup
+    data = dataset.TrajectoryDataset(path)
+    seen = []
+    for batch in data.iter_minibatches(64, seed=1, window_chunks=2):
+        assert len(batch["inputs"]) <= 64
+        seen.append(np.column_stack([batch["ball_x"], batch["ball_y"], batch["left_y"], batch["right_y"]]))
+    seen = np.concatenate(seen)
+    expected = np.column_stack([data[:]["ball_x"], data[:]["ball_y"], data[:]["left_y"], data[:]["right_y"]])
+    assert len(seen) == len(data)
+    assert sorted(map(tuple, seen.tolist())) == sorted(map(tuple, expected.tolist()))
+
+
+def test_appends_after_unindexed_data(setup):
+    path, games = setup
+    records = len(dataset.TrajectoryDataset(path))
+    with open(dataset._column_path(path, "inputs"), "ab") as column_file:
+        column_file.write(b"\xff" * 10)
+    with dataset.TrajectoryWriter(path) as writer:
+        writer.append_columns(**{name: np.full(3, 2) for name, _ in dataset.COLUMNS})
+    data = dataset.TrajectoryDataset(path)
+    assert len(data) == records + 3
+    assert list(data[records:]["inputs"]) == [2, 2, 2]
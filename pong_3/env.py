@@ -0,0 +1,277 @@
+"""This module contains a reset/step environment for training paddle policies, and a vectorized version of it.
+
+PongEnv follows the gym convention: reset returns an observation and an info dict, and step takes an action and
+returns the next observation, a reward, whether the episode terminated or was truncated, and an info dict. The
+agent plays the left paddle against a Controller on the right. A goal for the agent is rewarded +1 and a goal
+against it -1, and an episode terminates when a player reaches MAX_SCORE.
+
+VectorPongEnv runs K PongEnvs split across worker processes. Observations, actions, rewards and episode ends
+live in one multiprocessing.shared_memory block mapped as NumPy arrays by the parent and every worker, so a step
+writes the actions in place, wakes each worker with a short fixed-size command over its pipe and waits for an
+empty reply; nothing per environment is pickled.
+   """
+
+import os
+import random
+import struct
+
+import numpy as np
+
+from controllers import DOWN, IDLE, UP, FollowBall, observe, to_inputs
+from match import MAX_MATCH_TICKS
+from simulation import DEFAULT_CONFIG, GameConfig, PongSimulation
+
+# Actions an agent can take, so a policy choosing action indices can step with ACTIONS[index]
+ACTIONS = (UP, IDLE, DOWN)
+
+# Length of an observe() tuple: ball x, ball y, ball x velocity, ball y velocity, own paddle y, opponent paddle y
+OBSERVATION_SIZE = 6
+
+# Shared buffers of a VectorPongEnv, as (name, dtype, values per environment)
+BUFFERS = (
+    ("observations", np.float32, OBSERVATION_SIZE),
+    ("final_observations", np.float32, OBSERVATION_SIZE),
+    ("rewards", np.float32, 1),
+    ("actions", np.int8, 1),
+    ("terminated", np.bool_, 1),
+    ("truncated", np.bool_, 1),
+)
+
+# Worker commands: the command byte, and the seed for RESET
+COMMAND = struct.Struct("<Bq")
+STEP = 0
+RESET = 1
+CLOSE = 2
+NO_SEED = -1
+
+
+class PongEnv:
+    """Single match environment in which the agent plays the left paddle."""
+
+    def __init__(self, opponent=None, max_ticks: int = MAX_MATCH_TICKS, config: GameConfig = DEFAULT_CONFIG) -> None:
+        """Pong environment init.
+
+        Args:
+            opponent (Controller, optional): controller for the right paddle. Defaults to FollowBall().
+            max_ticks (int, optional): ticks after which an undecided episode is truncated. Defaults to
+                MAX_MATCH_TICKS.
+            config (GameConfig, optional): gameplay settings of every episode. Defaults to DEFAULT_CONFIG.
+        """
+        self.opponent = FollowBall() if opponent is None else opponent
+        self.max_ticks = max_ticks
+        self.config = config
+        self.rng = random.Random()
+        self.game = None
+
+    def observation(self) -> np.ndarray:
+        """Returns the agent's view of the match, as controllers.observe builds it for the left paddle."""
+        return np.array(observe(self.game, self.game.paddle_left), dtype=np.float32)
+
+    def reset(self, seed: int = None) -> tuple:
+        """Starts a new episode.
+
+        Args:
+            seed (int, optional): reseeds the generator that seeds each episode's opponent. Defaults to None,
+                continuing from the previous episodes.
+
+        Returns:
+            tuple: the first observation and an info dict.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.opponent.reset(self.rng.randrange(2**31))
+        self.game = PongSimulation("Agent", self.opponent.name, config=self.config)
+        return self.observation(), {}
+
+    def step(self, action: int) -> tuple:
+        """Runs one tick with the agent's move and the opponent's.
+
+        Args:
+            action (int): UP, IDLE or DOWN for the left paddle.
+
+        Returns:
+            tuple: observation, reward, terminated, truncated and an info dict with the scores and ticks.
+        """
+        game = self.game
+        scorer = game.step(to_inputs(action, self.opponent(game, game.paddle_right)))
+        reward = 0.0
+        terminated = False
+        if scorer is not None:
+            reward = 1.0 if scorer is game.player_one else -1.0
+            terminated = game.get_winner() is not None
+        truncated = not terminated and game.ticks >= self.max_ticks
+        info = {"score_one": game.player_one.score, "score_two": game.player_two.score, "ticks": game.ticks}
+        return self.observation(), reward, terminated, truncated, info
+
+
+def _layout(num_envs: int) -> tuple:
+    """Places the BUFFERS back to back, each 8-byte aligned.
+
+    Returns:
+        tuple: (name, dtype, shape, offset) per buffer, and the total size in bytes.
+    """
+    layout = []
+    offset = 0
+    for name, dtype, width in BUFFERS:
+        shape = (num_envs, width) if width > 1 else (num_envs,)
+        layout.append((name, dtype, shape, offset))
+        offset += -(-np.dtype(dtype).itemsize * num_envs * width // 8) * 8
+    return layout, offset
+
+
+def _map_buffers(buffer, num_envs: int) -> dict:
+    """Returns a NumPy array per buffer name, viewing a shared memory buffer laid out by _layout."""
+    return {
+        name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        for name, dtype, shape, offset in _layout(num_envs)[0]
+    }
+
+
+def _run_worker(connection, memory_name: str, num_envs: int, first: int, envs: list):
+    """Worker process loop stepping envs, the environments first to first + len(envs) - 1, on command."""
+    from multiprocessing import shared_memory
+
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        buffers = _map_buffers(memory.buf, num_envs)
+        observations, final_observations = buffers["observations"], buffers["final_observations"]
+        rewards, actions = buffers["rewards"], buffers["actions"]
+        terminated, truncated = buffers["terminated"], buffers["truncated"]
+        while True:
+            command, seed = COMMAND.unpack(connection.recv_bytes())
+            if command == CLOSE:
+                break
+            for index, env in enumerate(envs, first):
+                if command == RESET:
+                    observations[index] = env.reset(None if seed == NO_SEED else seed + index)[0]
+                    continue
+                observation, rewards[index], terminated[index], truncated[index], _ = env.step(int(actions[index]))
+                if terminated[index] or truncated[index]:
+                    final_observations[index] = observation
+                    observation = env.reset()[0]
+                observations[index] = observation
+            connection.send_bytes(b"")
+        # Drop the views before closing, as the mapping cannot close while arrays still export it
+        del buffers, observations, final_observations, rewards, actions, terminated, truncated
+    finally:
+        memory.close()
+        connection.close()
+
+
+class VectorPongEnv:
+    """K PongEnvs stepped together in worker processes, exchanging data through shared memory.
+
+    step returns the shared arrays themselves, which the next step overwrites; copy them to keep them. An
+    environment whose episode ends is reset within the same step, so its row of observations already belongs
+    to the next episode and the last observation of the finished one is in final_observations.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        opponent=FollowBall,
+        max_ticks: int = MAX_MATCH_TICKS,
+        workers: int = None,
+        config: GameConfig = DEFAULT_CONFIG,
+    ):
+        """Vector Pong environment init.
+
+        Args:
+            num_envs (int): environments to run.
+            opponent (callable, optional): builds each environment's opponent controller. Must be picklable, such
+                as a Controller class. Defaults to FollowBall.
+            max_ticks (int, optional): ticks after which an undecided episode is truncated. Defaults to
+                MAX_MATCH_TICKS.
+            workers (int, optional): worker processes, each stepping a contiguous share of the environments.
+                Defaults to the CPU count, at most num_envs.
+            config (GameConfig, optional): gameplay settings of every episode. Defaults to DEFAULT_CONFIG.
+        """
+        import multiprocessing
+        from multiprocessing import shared_memory
+
+        self.num_envs = num_envs
+        workers = min(workers or os.cpu_count() or 1, num_envs)
+        self.memory = shared_memory.SharedMemory(create=True, size=_layout(num_envs)[1])
+        buffers = _map_buffers(self.memory.buf, num_envs)
+        self.observations = buffers["observations"]
+        self.final_observations = buffers["final_observations"]
+        self.rewards = buffers["rewards"]
+        self.actions = buffers["actions"]
+        self.terminated = buffers["terminated"]
+        self.truncated = buffers["truncated"]
+
+        self.connections = []
+        self.processes = []
+        for worker in range(workers):
+            first, last = num_envs * worker // workers, num_envs * (worker + 1) // workers
+            envs = [PongEnv(opponent(), max_ticks, config) for _ in range(first, last)]
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_run_worker, args=(child, self.memory.name, num_envs, first, envs), daemon=True
+            )
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def _command(self, command: int, seed: int = NO_SEED):
+        """Sends a command to every worker, then waits until all of them have carried it out."""
+        message = COMMAND.pack(command, seed)
+        for connection in self.connections:
+            connection.send_bytes(message)
+        for connection in self.connections:
+            try:
+                connection.recv_bytes()
+            except EOFError:
+                raise RuntimeError("A VectorPongEnv worker exited unexpectedly") from None
+
+    def reset(self, seed: int = None) -> tuple:
+        """Starts a new episode in every environment.
+
+        Args:
+            seed (int, optional): environment i is reset with seed + i. Defaults to None, continuing from the
+                previous episodes.
+
+        Returns:
+            tuple: the (K, 6) observations and an info dict.
+        """
+        self._command(RESET, NO_SEED if seed is None else seed)
+        return self.observations, {}
+
+    def step(self, actions) -> tuple:
+        """Runs one tick in every environment.
+
+        Args:
+            actions (numpy.ndarray): UP, IDLE or DOWN per environment.
+
+        Returns:
+            tuple: observations, rewards, terminated and truncated arrays, and an info dict holding
+                final_observations.
+        """
+        self.actions[:] = actions
+        self._command(STEP)
+        info = {"final_observations": self.final_observations}
+        return self.observations, self.rewards, self.terminated, self.truncated, info
+
+    def close(self):
+        """Stops the workers and frees the shared memory."""
+        if self.memory is None:
+            return
+        for connection in self.connections:
+            try:
+                connection.send_bytes(COMMAND.pack(CLOSE, NO_SEED))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join()
+        del self.observations, self.final_observations, self.rewards, self.actions, self.terminated, self.truncated
+        self.memory.close()
+        self.memory.unlink()
+        self.memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,66 @@
+import numpy as np
+
+import controllers
+import env
+import pytest
+import simulation
+
+
+@pytest.fixture
+def setup():
+    vector = env.VectorPongEnv(4, opponent=controllers.RandomMoves, max_ticks=400, workers=2)
+    yield vector
+    vector.close()
+
+
+def test_episode_rewards_goals_and_ends_at_max_score():
+    single = env.PongEnv()
+    observation, _ = single.reset(seed=0)
+    assert observation.shape == (env.OBSERVATION_SIZE,)
+    assert observation[4] == single.game.paddle_left.y_position
+
+    # Hiding at the top lets every straight return past, so the opponent wins every point
+    rewards = []
+    terminated = truncated = False
+    while not (terminated or truncated):
+        observation, reward, terminated, truncated, info = single.step(controllers.UP)
+        rewards.append(reward)
+    assert terminated and not truncated
+    assert rewards.count(-1.0) == simulation.MAX_SCORE
+    assert rewards.count(0.0) == len(rewards) - simulation.MAX_SCORE
+    assert (info["score_one"], info["score_two"]) == (0, simulation.MAX_SCORE)
+
+
+def test_vector_env_matches_single_envs(setup):
+    vector = setup
+    singles = [env.PongEnv(controllers.RandomMoves(), max_ticks=400) for _ in range(vector.num_envs)]
+    observations, _ = vector.reset(seed=7)
+    expected = np.array([single.reset(seed=7 + index)[0] for index, single in enumerate(singles)])
+    assert np.array_equal(observations, expected)
+
+    rng = np.random.default_rng(0)
+    ends = 0
+    for _ in range(1000):
+        actions = rng.choice(env.ACTIONS, size=vector.num_envs)
+        observations, rewards, terminated, truncated, info = vector.step(actions)
+        for index, single in enumerate(singles):
+            observation, reward, done, cut, _ = single.step(int(actions[index]))
+            assert (rewards[index], terminated[index], truncated[index]) == (reward, done, cut)
+            if done or cut:
+                ends += 1
+                assert np.array_equal(info["final_observations"][index], observation)
+                observation, _ = single.reset()
+            assert np.array_equal(observations[index], observation)
+    assert ends >= vector.num_envs
+
+
+def test_close_frees_shared_memory():
+    from multiprocessing import shared_memory
+
+    vector = env.VectorPongEnv(2, workers=2)
+    name = vector.memory.name
+    vector.close()
+    assert all(not process.is_alive() for process in vector.processes)
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+    vector.close()
@@ -1,11 +1,160 @@
+"""This module contains the logging setup for the Pong game.
+
+Importing it configures nothing. The game calls setup_logging() once from main(); after that log records are
+handed to a bounded queue and written to the log file by a background QueueListener thread, so a slow disk never
+stalls the game loop.
+   """
+
+import atexit
 import logging
+import logging.handlers
+import queue
 
 FILENAME = "pong.log"
 LOGFORMAT = "%(asctime)s:%(levelname)s:%(name)s:%(message)s"
-DEFAULT_LEVEL = "logging.info"
+DATEFORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_LEVEL = logging.INFO
 
+# Records buffered for the background writer before the drop policy applies
+QUEUE_SIZE = 10_000
+
+# What to do with a record when the buffer is full
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+DROP_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
 
-logging.basicConfig(
-    filename=FILENAME, level=logging.INFO, format=LOGFORMAT, datefmt="%Y-%m-%d %H:%M:%S"
-)
 logger = logging.getLogger("main")
+
+_listener = None
+_queue_handler = None
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for a bounded queue that drops records, rather than blocking, when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue, drop_policy: str = DROP_NEWEST) -> None:
+        """Bounded queue handler init.
+
+        Args:
+            log_queue (queue.Queue): queue shared with the QueueListener.
+            drop_policy (str, optional): DROP_NEWEST, DROP_OLDEST or BLOCK. Defaults to DROP_NEWEST.
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy {drop_policy!r}, expected one of {DROP_POLICIES}")
+        super().__init__(log_queue)
+        self.drop_policy = drop_policy
+        self.dropped = 0
+
+    def prepare(self, record):
+        """Queues the record as is so the writer thread, not the game thread, formats the message.
+
+        Log arguments must therefore be values that will not change before the record is written, such as the names
+        and numbers the game logs. Records carrying exception info are still formatted here, while the traceback is
+        current.
+
+        Args:
+            record (logging.LogRecord): the record being logged.
+
+        Returns:
+            logging.LogRecord: the record to queue.
+        """
+        if record.exc_info:
+            return super().prepare(record)
+        return record
+
+    def enqueue(self, record):
+        """Queues a record, applying the drop policy if the queue is full.
+
+        Args:
+            record (logging.LogRecord): the prepared record.
+        """
+        if self.drop_policy == BLOCK:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        self.dropped += 1
+        if self.drop_policy == DROP_OLDEST:
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop waits for room in a full bounded queue instead of raising queue.Full."""
+
+    def enqueue_sentinel(self):
+        """Queues the stop sentinel behind the records still waiting, blocking until the writer makes room."""
+        self.queue.put(self._sentinel)
+
+
+def setup_logging(
+    filename: str = FILENAME,
+    level: int = DEFAULT_LEVEL,
+    queue_size: int = QUEUE_SIZE,
+    drop_policy: str = DROP_NEWEST,
+):
+    """Routes log records through a bounded queue to a file written by a background thread.
+
+    Calling it again while logging is already set up does nothing. The file is only created on the first write.
+
+    Args:
+        filename (str, optional): log file path. Defaults to FILENAME.
+        level (int, optional): root logger level. Defaults to DEFAULT_LEVEL.
+        queue_size (int, optional): records buffered before the drop policy applies. Defaults to QUEUE_SIZE.
+        drop_policy (str, optional): DROP_NEWEST, DROP_OLDEST or BLOCK. Defaults to DROP_NEWEST.
+
+    Returns:
+        BoundedQueueHandler: the handler attached to the root logger, exposing the dropped record count.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _queue_handler
+
+    file_handler = logging.FileHandler(filename, delay=True)
+    file_handler.setFormatter(logging.Formatter(LOGFORMAT, datefmt=DATEFORMAT))
+    log_queue = queue.Queue(queue_size)
+    _queue_handler = BoundedQueueHandler(log_queue, drop_policy)
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+    _listener = DrainingQueueListener(log_queue, file_handler)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _queue_handler
+
+
+def shutdown_logging():
+    """Flushes queued records to the file, notes how many records were dropped and stops the background writer."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    try:
+        _listener.stop()
+        if _queue_handler.dropped:
+            # Written straight to the file, after the queued records, now that the listener has stopped
+            record = logger.makeRecord(
+                logger.name,
+                logging.WARNING,
+                __file__,
+                0,
+                "Dropped %s log records while the log queue was full.",
+                (_queue_handler.dropped,),
+                None,
+            )
+            for handler in _listener.handlers:
+                handler.handle(record)
+    finally:
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
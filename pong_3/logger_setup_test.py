@@ -0,0 +1,87 @@
+import logging
+import queue
+import time
+
+import logger_setup
+import pytest
+
+
+def make_record(message):
+    return logging.LogRecord("main", logging.INFO, __file__, 0, message, None, None)
+
+
+@pytest.mark.parametrize(
+    "drop_policy, kept",
+    [(logger_setup.DROP_NEWEST, ["a", "b"]), (logger_setup.DROP_OLDEST, ["b", "c"])],
+)
+def test_full_queue_applies_drop_policy(drop_policy, kept):
+    log_queue = queue.Queue(2)
+    handler = logger_setup.BoundedQueueHandler(log_queue, drop_policy)
+    for message in "abc":
+        handler.handle(make_record(message))
+    assert handler.dropped == 1
+    assert [log_queue.get_nowait().getMessage() for _ in range(2)] == kept
+
+
+def test_setup_writes_in_background(tmp_path):
+    log_file = tmp_path / "pong.log"
+    handler = logger_setup.setup_logging(filename=str(log_file))
+    try:
+        assert logger_setup.setup_logging() is handler
+        logger_setup.logger.info("Written by the listener.")
+    finally:
+        logger_setup.shutdown_logging()
+    assert "INFO:main:Written by the listener." in log_file.read_text()
+    assert handler not in logging.getLogger().handlers
+
+
+def test_records_formatted_by_writer(tmp_path):
+    log_file = tmp_path / "pong.log"
+    logger_setup.setup_logging(filename=str(log_file))
+    try:
+        logger_setup.logger.info("Player: %s, has scored. Total score is now: %s", "Player 1", 3)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger_setup.logger.exception("Failed")
+    finally:
+        logger_setup.shutdown_logging()
+    text = log_file.read_text()
+    assert "Player: Player 1, has scored. Total score is now: 3" in text
+    assert "ValueError: boom" in text
+
+
+def test_dropped_count_is_written_to_the_log_file(tmp_path):
+    log_file = tmp_path / "pong.log"
+    handler = logger_setup.setup_logging(filename=str(log_file))
+    try:
+        logger_setup.logger.info("Before shutdown.")
+        handler.dropped = 3
+    finally:
+        logger_setup.shutdown_logging()
+    lines = log_file.read_text().splitlines()
+    assert lines[-1].endswith("WARNING:main:Dropped 3 log records while the log queue was full.")
+
+
+def test_shutdown_drains_a_full_queue(tmp_path):
+    log_file = tmp_path / "pong.log"
+    handler = logger_setup.setup_logging(filename=str(log_file), queue_size=5)
+    file_handler = logger_setup._listener.handlers[0]
+    emit = file_handler.emit
+
+    def slow_emit(record):
+        time.sleep(0.01)
+        emit(record)
+
+    file_handler.emit = slow_emit
+    try:
+        for number in range(20):
+            logger_setup.logger.info("Record %s", number)
+        assert handler.dropped
+    finally:
+        logger_setup.shutdown_logging()
+    assert logger_setup._listener is None
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 20 - handler.dropped + 1
+    assert lines[0].endswith("Record 0")
+    assert lines[-1].endswith(f"Dropped {handler.dropped} log records while the log queue was full.")
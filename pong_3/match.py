@@ -0,0 +1,174 @@
+"""This module contains the headless match runner used by tournaments.
+
+It only depends on the simulation core and controllers, so process-pool workers can import it without pygame.
+   """
+
+from dataclasses import dataclass
+
+from controllers import choose_moves, to_inputs
+from simulation import DEFAULT_CONFIG, GameConfig, PongSimulation
+
+# Ticks after which an undecided match is recorded as a draw
+MAX_MATCH_TICKS = 100_000
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """Outcome of one headless match"""
+
+    pairing: int
+    seed: int
+    winner: str
+    score_one: int
+    score_two: int
+    rally_lengths: tuple
+    ticks: int
+
+
+def play_match(
+    left,
+    right,
+    seed: int = 0,
+    pairing: int = 0,
+    max_ticks: int = MAX_MATCH_TICKS,
+    config: GameConfig = DEFAULT_CONFIG,
+) -> MatchResult:
+    """Plays one match between two controllers until a player reaches the config's max_score.
+
+    Args:
+        left (Controller): controller for the left paddle.
+        right (Controller): controller for the right paddle.
+        seed (int, optional): match seed passed to both controllers. Defaults to 0.
+        pairing (int, optional): index of the pairing, copied into the result. Defaults to 0.
+        max_ticks (int, optional): tick limit after which the match is a draw. Defaults to MAX_MATCH_TICKS.
+        config (GameConfig, optional): gameplay settings. Defaults to DEFAULT_CONFIG.
+
+    Returns:
+        MatchResult: winner name (None for a draw), final scores, paddle returns per point and ticks played.
+    """
+    left.reset(seed)
+    right.reset(seed)
+    game = PongSimulation(left.name, right.name, config=config)
+    ball = game.ball
+    paddle_left, paddle_right = game.paddle_left, game.paddle_right
+
+    rally_lengths = []
+    returns = 0
+    winner = None
+    while game.ticks < max_ticks:
+        x_velocity = ball.x_velocity
+        scorer = game.step(to_inputs(left(game, paddle_left), right(game, paddle_right)))
+        if scorer is not None:
+            rally_lengths.append(returns)
+            returns = 0
+            winner = game.get_winner()
+            if winner is not None:
+                break
+        elif ball.x_velocity != x_velocity:
+            returns += 1
+
+    return MatchResult(
+        pairing=pairing,
+        seed=seed,
+        winner=None if winner is None else winner.name,
+        score_one=game.player_one.score,
+        score_two=game.player_two.score,
+        rally_lengths=tuple(rally_lengths),
+        ticks=game.ticks,
+    )
+
+
+def play_matches(
+    pairing: int,
+    left,
+    right,
+    first_seed: int,
+    count: int,
+    max_ticks: int = MAX_MATCH_TICKS,
+    config: GameConfig = DEFAULT_CONFIG,
+):
+    """Plays a chunk of consecutive matches for one pairing. This is the unit of work sent to pool workers.
+
+    Args:
+        pairing (int): index of the pairing.
+        left (Controller): controller for the left paddle.
+        right (Controller): controller for the right paddle.
+        first_seed (int): seed of the first match; following matches use consecutive seeds.
+        count (int): number of matches to play.
+        max_ticks (int, optional): tick limit per match. Defaults to MAX_MATCH_TICKS.
+        config (GameConfig, optional): gameplay settings. Defaults to DEFAULT_CONFIG.
+
+    Returns:
+        list: a MatchResult per match played.
+    """
+    return [
+        play_match(left, right, seed, pairing, max_ticks, config) for seed in range(first_seed, first_seed + count)
+    ]
+
+
+def play_lockstep(
+    left, right, seeds, pairing: int = 0, max_ticks: int = MAX_MATCH_TICKS, config: GameConfig = DEFAULT_CONFIG
+):
+    """Plays several matches between the same two controllers side by side, one tick of every match at a time.
+
+    Moves are gathered with choose_moves, so a BatchController is called once per tick for all of its paddles
+    instead of once per paddle. The controllers are shared by every match and should therefore not keep per-match
+    state; they are reset once with the first seed.
+
+    Args:
+        left (Controller): controller for every left paddle.
+        right (Controller): controller for every right paddle.
+        seeds (list): one seed per match, copied into the results.
+        pairing (int, optional): index of the pairing, copied into the results. Defaults to 0.
+        max_ticks (int, optional): tick limit per match. Defaults to MAX_MATCH_TICKS.
+        config (GameConfig, optional): gameplay settings of every match. Defaults to DEFAULT_CONFIG.
+
+    Returns:
+        list: a MatchResult per seed, in the same order.
+    """
+    left.reset(seeds[0])
+    right.reset(seeds[0])
+    games = [PongSimulation(left.name, right.name, config=config) for _ in seeds]
+    rally_lengths = [[] for _ in seeds]
+    returns = [0] * len(seeds)
+    winners = [None] * len(seeds)
+    running = list(range(len(seeds)))
+
+    for _ in range(max_ticks):
+        if not running:
+            break
+        assignments = []
+        for index in running:
+            game = games[index]
+            assignments.append((left, game, game.paddle_left))
+            assignments.append((right, game, game.paddle_right))
+        moves = choose_moves(assignments)
+
+        still_running = []
+        for position, index in enumerate(running):
+            game = games[index]
+            x_velocity = game.ball.x_velocity
+            scorer = game.step(to_inputs(moves[2 * position], moves[2 * position + 1]))
+            if scorer is not None:
+                rally_lengths[index].append(returns[index])
+                returns[index] = 0
+                winners[index] = game.get_winner()
+                if winners[index] is not None:
+                    continue
+            elif game.ball.x_velocity != x_velocity:
+                returns[index] += 1
+            still_running.append(index)
+        running = still_running
+
+    return [
+        MatchResult(
+            pairing=pairing,
+            seed=seed,
+            winner=None if winner is None else winner.name,
+            score_one=game.player_one.score,
+            score_two=game.player_two.score,
+            rally_lengths=tuple(rallies),
+            ticks=game.ticks,
+        )
+        for seed, game, winner, rallies in zip(seeds, games, winners, rally_lengths)
+    ]
@@ -0,0 +1,160 @@
+"""This module contains an offscreen renderer producing pixel observations for agents that learn from pixels.
+
+Frames are drawn straight into a NumPy buffer: every frame slot of the buffer is wrapped in a pygame Surface by
+pygame.image.frombuffer, so drawing writes the observation memory itself and nothing is copied out afterwards.
+Grayscale frames are 8-bit palette surfaces holding one luminance byte per pixel, and downsampling draws the
+shapes at the reduced size instead of scaling a full-size frame. As in the dirty rect renderer, a frame slot is
+not cleared before drawing; only the rects drawn into it last time are erased. For frame stacking the buffer holds
+every frame slot twice, stack slots apart, and each frame is drawn into both copies, so the latest stack is always
+one contiguous slice of the buffer, oldest frame first. No display is opened, so this runs under the SDL dummy
+driver or with no video driver at all.
+
+Only the paddles and ball are drawn; scores and messages are left out of the observation.
+   """
+
+import numpy as np
+import pygame
+
+from env import PongEnv
+from simulation import BLACK, WINDOW_HEIGHT, WINDOW_WIDTH
+
+# Palette of grayscale surfaces, mapping every pixel value to the same luminance
+GRAY_PALETTE = [(value, value, value) for value in range(256)]
+
+
+def luminance(colour: tuple) -> int:
+    """Returns the ITU-R BT.601 luma of an RGB colour, the pixel value it is drawn as in grayscale frames."""
+    red, green, blue = colour[:3]
+    return round(0.299 * red + 0.587 * green + 0.114 * blue)
+
+
+class PixelRenderer:
+    """Draws matches into a stack of NumPy frames without a display."""
+
+    def __init__(
+        self,
+        downsample: int = 1,
+        grayscale: bool = False,
+        stack: int = 1,
+        width: int = WINDOW_WIDTH,
+        height: int = WINDOW_HEIGHT,
+    ) -> None:
+        """Pixel renderer init.
+
+        Args:
+            downsample (int, optional): factor the width and height are divided by. Defaults to 1.
+            grayscale (bool, optional): one luminance byte per pixel instead of RGB. Defaults to False.
+            stack (int, optional): latest frames returned together by render. Defaults to 1.
+            width (int, optional): playfield width in game pixels. Defaults to WINDOW_WIDTH.
+            height (int, optional): playfield height in game pixels. Defaults to WINDOW_HEIGHT.
+        """
+        self.downsample = downsample
+        self.grayscale = grayscale
+        self.stack = stack
+        self.width = width // downsample
+        self.height = height // downsample
+        shape = (2 * stack, self.height, self.width) if grayscale else (2 * stack, self.height, self.width, 3)
+        self.buffer = np.zeros(shape, dtype=np.uint8)
+        self.surfaces = []
+        for frame in self.buffer:
+            surface = pygame.image.frombuffer(frame, (self.width, self.height), "P" if grayscale else "RGB")
+            if grayscale:
+                surface.set_palette(GRAY_PALETTE)
+            self.surfaces.append(surface)
+        self.background = luminance(BLACK) if grayscale else BLACK
+        # Rects drawn into each frame slot, erased before it is drawn again
+        self.drawn = [[] for _ in self.surfaces]
+        self.position = 0
+
+    def reset(self):
+        """Clears the stacked frames, e.g. at the start of an episode."""
+        self.buffer[...] = self.background
+        self.drawn = [[] for _ in self.surfaces]
+        self.position = 0
+
+    def colour(self, colour: tuple):
+        """Returns the value a game colour is drawn with."""
+        return luminance(colour) if self.grayscale else colour
+
+    def draw(self, surface, game) -> list:
+        """Draws the paddles and ball of a match onto a surface, without clearing it first.
+
+        Args:
+            surface (pygame.Surface): a frame slot of the buffer, or any surface of the renderer's size.
+            game (PongSimulation): the match to draw.
+
+        Returns:
+            list: the pygame.Rect each item covered.
+        """
+        scale = 1 / self.downsample
+        rects = []
+        for paddle in (game.paddle_left, game.paddle_right):
+            rect = pygame.draw.rect(
+                surface,
+                self.colour(paddle.colour),
+                (
+                    paddle.x_position * scale,
+                    paddle.y_position * scale,
+                    max(paddle.width * scale, 1),
+                    max(paddle.height * scale, 1),
+                ),
+            )
+            rects.append(rect)
+        ball = game.ball
+        rect = pygame.draw.circle(
+            surface,
+            self.colour(ball.colour),
+            (ball.x_position * scale, ball.y_position * scale),
+            max(ball.radius * scale, 1),
+        )
+        rects.append(rect)
+        return rects
+
+    def render(self, game) -> np.ndarray:
+        """Draws the current frame of a match and returns the latest stack of frames.
+
+        The result is a view of the renderer's buffer, which later renders overwrite; copy it to keep it.
+
+        Args:
+            game (PongSimulation): the match to draw.
+
+        Returns:
+            numpy.ndarray: (stack, height, width) uint8 frames for grayscale, otherwise (stack, height, width, 3),
+                oldest first. Until stack frames have been rendered after a reset, the older ones are blank.
+        """
+        slot = self.position
+        for index in (slot, slot + self.stack):
+            surface = self.surfaces[index]
+            for rect in self.drawn[index]:
+                surface.fill(self.background, rect)
+            self.drawn[index] = self.draw(surface, game)
+        self.position = (slot + 1) % self.stack
+        return self.buffer[slot + 1 : slot + 1 + self.stack]
+
+
+class PixelPongEnv(PongEnv):
+    """PongEnv whose observations are rendered frames instead of controllers.observe tuples.
+
+    Observations are views of the renderer's buffer, valid until the next step or reset.
+    """
+
+    def __init__(self, opponent=None, renderer: PixelRenderer = None, **kwargs) -> None:
+        """Pixel Pong environment init.
+
+        Args:
+            opponent (Controller, optional): controller for the right paddle. Defaults to FollowBall().
+            renderer (PixelRenderer, optional): renderer drawing the observations. Defaults to full-size RGB
+                frames of the config's window size, without stacking.
+            **kwargs: passed on to PongEnv.
+        """
+        super().__init__(opponent, **kwargs)
+        if renderer is None:
+            renderer = PixelRenderer(width=self.config.window_width, height=self.config.window_height)
+        self.renderer = renderer
+
+    def observation(self) -> np.ndarray:
+        return self.renderer.render(self.game)
+
+    def reset(self, seed: int = None) -> tuple:
+        self.renderer.reset()
+        return super().reset(seed)
@@ -0,0 +1,67 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pixels
+import pygame
+import pytest
+import simulation
+
+
+@pytest.fixture
+def setup():
+    game = simulation.PongSimulation()
+    yield game
+
+
+def test_rgb_frame_matches_window_layout(setup):
+    game = setup
+    renderer = pixels.PixelRenderer()
+    frames = renderer.render(game)
+    assert frames.shape == (1, simulation.WINDOW_HEIGHT, simulation.WINDOW_WIDTH, 3)
+    assert np.shares_memory(frames, renderer.buffer)
+
+    window = pygame.Surface((simulation.WINDOW_WIDTH, simulation.WINDOW_HEIGHT))
+    renderer.draw(window, game)
+    assert np.array_equal(frames[0], pygame.surfarray.array3d(window).transpose(1, 0, 2))
+    left = game.paddle_left
+    assert tuple(frames[0, left.y_position + 1, left.x_position + 1]) == left.colour
+    assert tuple(frames[0, 0, 0]) == simulation.BLACK
+
+
+def test_grayscale_downsampled_frames_stack_oldest_first(setup):
+    game = setup
+    renderer = pixels.PixelRenderer(downsample=4, grayscale=True, stack=3)
+    rows = []
+    for _ in range(5):
+        frames = renderer.render(game)
+        ball_row = round(game.ball.y_position / 4)
+        rows.append(np.flatnonzero(frames[-1, ball_row] == 255))
+        game.step()
+    assert frames.shape == (3, simulation.WINDOW_HEIGHT // 4, simulation.WINDOW_WIDTH // 4)
+    assert frames.dtype == np.uint8
+    # The last three frames show the ball in the order it moved
+    for frame, columns in zip(frames, rows[-3:]):
+        assert np.array_equal(np.flatnonzero(frame[round(game.ball.y_position / 4)] == 255), columns)
+
+    renderer.reset()
+    frames = renderer.render(game)
+    assert not frames[:2].any() and frames[2].any()
+
+
+def test_pixel_env_observes_frames():
+    env = pixels.PixelPongEnv(renderer=pixels.PixelRenderer(downsample=2, grayscale=True, stack=4))
+    observation, _ = env.reset(seed=0)
+    assert observation.shape == (4, simulation.WINDOW_HEIGHT // 2, simulation.WINDOW_WIDTH // 2)
+    observation, reward, terminated, truncated, _ = env.step(0)
+    assert observation[-1].any() and observation[-2].any() and not observation[0].any()
+
+
+def test_pixel_env_frames_follow_its_config():
+    config = simulation.GameConfig(window_width=320, window_height=240, paddle_height=40)
+    env = pixels.PixelPongEnv(config=config)
+    observation, _ = env.reset(seed=0)
+    assert observation.shape == (1, 240, 320, 3)
+    right = env.game.paddle_right
+    assert tuple(observation[0, right.y_position + 1, right.x_position + 1]) == right.colour
@@ -1,230 +1,217 @@
 """This module contains the classes and functionality to run a basic version of the Pong video game 
+
+   The game rules live in simulation.py; this module is the pygame front-end drawing and driving them.
+   Importing it is cheap and has no side effects: pygame is imported when a game is created, and the window,
+   fonts and logging are only set up once a game is drawn or run.
    """
 __version__ = "3.0"
 
-# TODO - refactor constants to use config file or revert to defaults
-
 from dataclasses import dataclass
-import pygame
-from logger_setup import logger
-
-# Defining window size
-WINDOW_WIDTH = 600
-WINDOW_HEIGHT = 400
-logger.info("Window set to width: %s, and height: %s", WINDOW_WIDTH, WINDOW_HEIGHT)
-
-# Defining colour tuples in RGB
-# TODO - refactor colours to ENUM
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
+import os
+
+from simulation import (
+    BLACK,
+    DEFAULT_CONFIG,
+    GameConfig,
+    GameState,
+    MAX_SCORE,
+    NO_INPUT,
+    WHITE,
+    WINDOW_HEIGHT,
+    WINDOW_WIDTH,
+    Ball,
+    Paddle,
+    Player,
+    PongSimulation,
+)
+from controllers import DOWN, IDLE, UP, Controller, choose_moves, to_inputs
+from logger_setup import logger, setup_logging
+from match import MAX_MATCH_TICKS, MatchResult, play_matches
+from text_cache import TextCache
 
 # Game limiting FPS
 FPS_LIMIT = 60
 
-# Paddle size
-PADDLE_HEIGHT = 100
-PADDLE_WIDTH = 20
+# Physics ticks per second, independent of the render rate
+TICK_RATE = 60
 
-# Score to reach
-MAX_SCORE = 5
+# Seconds play is held after a goal and after a match is won
+GOAL_PAUSE_SECONDS = 1
+MATCH_OVER_SECONDS = 5
 
-# Game window and name
-GAME_WINDOW = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Pong")
+# Longest frame time fed to the physics accumulator, so a stall does not trigger a burst of catch-up ticks
+MAX_FRAME_TIME = 0.25
 
+# Game window, opened by get_window on first use
+_game_window = None
 
-# TODO - add __str__ support
-class Paddle:
-    """Paddle class used to create paddles for the pong game."""
 
-    def __init__(self, x_position, y_position, width, height, colour=WHITE, paddle_velocity=4) -> None:
-        """Paddle class init.
+def get_window(size: tuple = (WINDOW_WIDTH, WINDOW_HEIGHT)):
+    """Returns the game window, initialising pygame and opening the window on the first call.
 
-        Args:
-            x_position (int): current x position
-            y_position (int): current y position
-            width (int): width in pixels
-            height (int): height in pixels
-            colour (tuple, optional): paddle fill colour
-            paddle_velocity (int, optional): paddle velocity. Defaults to 4.
-        """
-        self.x_position = x_position
-        self.y_position = self.y_position_original = y_position
-        self.width = width
-        self.height = height
-        self.colour = colour
-        self.paddle_velocity = paddle_velocity
+    Args:
+        size (tuple, optional): window width and height; an open window of another size is resized. Defaults
+            to (WINDOW_WIDTH, WINDOW_HEIGHT).
 
-    def move(self, up=True):
-        """Changes the paddle's xy positions.
+    Returns:
+        pygame.Surface: The Pong game window.
+    """
+    global _game_window
+    if _game_window is None or _game_window.get_size() != tuple(size):
+        import pygame
 
-        Args:
-            up (bool): Signals whether to add or remove the y velocity. Defaults to True.
-        """
-        if up:
-            self.y_position += self.paddle_velocity
-        else:
-            self.y_position -= self.paddle_velocity
+        pygame.init()
+        _game_window = pygame.display.set_mode(size)
+        pygame.display.set_caption("Pong")
+    return _game_window
 
 
-# TODO - add __str__ support
-class Ball:
-    """Ball class used to create a ball for the ball game."""
+def __getattr__(name):
+    """Opens the window lazily when the GAME_WINDOW module attribute is first read."""
+    if name == "GAME_WINDOW":
+        return get_window()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    def __init__(
-        self,
-        x_position: int,
-        y_position: int,
-        radius: int,
-        x_velocity: int = 5,
-        y_velocity: int = 0,
-        colour: tuple = WHITE,
-        max_velocity: int = 5,
-    ) -> None:
-        """Ball class init.
+
+class Keyboard(Controller):
+    """Controller moving a paddle with two keyboard keys."""
+
+    def __init__(self, up_key: int, down_key: int) -> None:
+        """Keyboard init.
 
         Args:
-            x_position (int): current x position.
-            y_position (int): current y position.
-            radius (int): ball radius in pixels.
-            x_velocity (int, optional): x velocity. Defaults to 5.
-            y_velocity (int, optional): y velocity. Defaults to 0.
-            colour (tuple, optional): ball colour fill. Defaults to WHITE.
-            max_velocity (int, optional): max potential velocity. Defaults to 5.
+            up_key (int): pygame key constant moving the paddle up.
+            down_key (int): pygame key constant moving the paddle down.
         """
-        self.x_position = self.x_position_original = x_position
-        self.y_position = self.y_position_original = y_position
-        self.radius = radius
-        self.x_velocity = x_velocity
-        self.y_velocity = y_velocity
-        self.max_velocity = max_velocity
-        self.colour = colour
+        self.up_key = up_key
+        self.down_key = down_key
 
+    def __call__(self, game, paddle) -> int:
+        import pygame
 
-# TODO - add __str__ support
-@dataclass
-class Player:
-    """Example Player class"""
-
-    name: str
-    score: int = 0
+        keys = pygame.key.get_pressed()
+        if keys[self.up_key] and not keys[self.down_key]:
+            return UP
+        if keys[self.down_key] and not keys[self.up_key]:
+            return DOWN
+        return IDLE
 
 
-class Pong:
-    """Pong game class handling game flow and logic"""
+class Pong(PongSimulation):
+    """Pong game class handling game flow and rendering on top of the simulation core"""
 
-    def __init__(self, player_one_name: str = "Player 1", player_two_name: str = "Player 2") -> None:
+    def __init__(
+        self,
+        player_one_name: str = "Player 1",
+        player_two_name: str = "Player 2",
+        dirty_rects: bool = False,
+        continuous_collisions: bool = False,
+        left_controller: Controller = None,
+        right_controller: Controller = None,
+        config: GameConfig = DEFAULT_CONFIG,
+    ) -> None:
         """Pong game class init.
 
         Args:
             player_one_name (str, optional): Player one's name. Defaults to "Player 1".
             player_two_name (str, optional): Player two's name. Defaults to "Player 2".
+            dirty_rects (bool, optional): Redraw and update only the changed parts of the window. Defaults to False.
+            continuous_collisions (bool, optional): Use swept ball collisions. Defaults to False.
+            left_controller (Controller, optional): drives the left paddle. Defaults to the W and S keys.
+            right_controller (Controller, optional): drives the right paddle. Defaults to the up and down arrows.
+            config (GameConfig, optional): window, paddle, ball and scoring settings. Defaults to DEFAULT_CONFIG.
         """
+        import pygame
+        from renderer import DirtyRectRenderer
+
         logger.info("Initializing Pong game.")
-        pygame.init()
+        super().__init__(player_one_name, player_two_name, continuous_collisions=continuous_collisions, config=config)
         self.clock = pygame.time.Clock()
-        self.game_font = pygame.font.SysFont("Britannic", 50)
-
-        self.paddle_left = Paddle(
-            x_position=10,
-            y_position=WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2,
-            width=PADDLE_WIDTH,
-            height=PADDLE_HEIGHT,
-            colour=WHITE,
-        )
-        self.paddle_right = Paddle(
-            x_position=WINDOW_WIDTH - PADDLE_WIDTH - 10,
-            y_position=WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2,
-            width=PADDLE_WIDTH,
-            height=PADDLE_HEIGHT,
-            colour=WHITE,
-        )
-        self.ball = Ball(
-            x_position=WINDOW_WIDTH // 2,
-            y_position=WINDOW_HEIGHT // 2,
-            radius=5,
-            x_velocity=5,
-            y_velocity=0,
-            colour=WHITE,
-        )
-
-        self.player_one = Player(player_one_name, 0)
-        self.player_two = Player(player_two_name, 0)
+        self._game_font = None
+        self.text_cache = TextCache()
+        self.score_surfaces = {}
+        self.previous_positions = self.get_positions()
+        self.renderer = DirtyRectRenderer(BLACK) if dirty_rects else None
+        self.left_controller = left_controller or Keyboard(pygame.K_w, pygame.K_s)
+        self.right_controller = right_controller or Keyboard(pygame.K_UP, pygame.K_DOWN)
+        self.recorder = None
+
+    @property
+    def game_font(self):
+        """The score and winner font, loaded on first use as looking up system fonts is slow."""
+        if self._game_font is None:
+            import pygame
+
+            pygame.font.init()
+            self._game_font = pygame.font.SysFont("Britannic", 50)
+        return self._game_font
+
+    def get_positions(self):
+        """Returns the positions rendering interpolates between.
 
-    def move_paddle(self, keys):
-        """Handles paddle movement
-
-        Args:
-            keys (pygame.key.ScancodeWrapper): A list of key presses.
+        Returns:
+            tuple: ball x, ball y, left paddle y and right paddle y.
         """
+        return (self.ball.x_position, self.ball.y_position, self.paddle_left.y_position, self.paddle_right.y_position)
 
-        if keys[pygame.K_w] and self.paddle_left.y_position >= 0:
-            self.paddle_left.y_position -= 5
-        if keys[pygame.K_s] and self.paddle_left.y_position <= WINDOW_HEIGHT - self.paddle_left.height:
-            self.paddle_left.y_position += 5
-
-        if keys[pygame.K_UP] and self.paddle_right.y_position >= 0:
-            self.paddle_right.y_position -= 5
-        if keys[pygame.K_DOWN] and self.paddle_right.y_position <= WINDOW_HEIGHT - self.paddle_right.height:
-            self.paddle_right.y_position += 5
+    def read_controllers(self) -> int:
+        """Asks both paddle controllers for this tick's moves.
 
-    def move_ball(self):
-        """Handles changes in ball velocity"""
-        self.ball.x_position += self.ball.x_velocity
-        self.ball.y_position += self.ball.y_velocity
+        Returns:
+            int: input bits for PongSimulation.step
+        """
+        left_move, right_move = choose_moves(
+            [(self.left_controller, self, self.paddle_left), (self.right_controller, self, self.paddle_right)]
+        )
+        return to_inputs(left_move, right_move)
 
-    # TODO - add docstring
-    def get_paddles(self):
-        return [self.paddle_left, self.paddle_right]
+    def advance(self, inputs: int):
+        """Runs one game tick, remembering the positions before it for interpolation.
 
-    # TODO - add docstring
-    def get_ball(self):
-        return self.ball
+        Args:
+            inputs (int): input bits held this tick.
 
-    def calculate_return_y_velocity(self, paddle: Paddle, ball: Ball) -> int:
-        """Helper function to calculate y velocity after paddle collision
+        Returns:
+            Player: the player who scored this tick, or None.
+        """
+        self.previous_positions = self.get_positions()
+        if self.recorder is not None:
+            self.recorder.record(inputs)
+        scorer = self.update(inputs)
+        if scorer is not None or self.state != GameState.PLAYING:
+            # Snap to the serve instead of sweeping the ball back across the court
+            self.previous_positions = self.get_positions()
+        return scorer
+
+    def interpolate_positions(self, alpha: float):
+        """Blends the previous and current tick positions.
 
         Args:
-            paddle (Paddle): paddle the ball hit
-            ball (Ball): the ball
+            alpha (float): 0 gives the previous tick, 1 the current tick.
 
         Returns:
-            int: calculated y velocity
+            tuple: ball x, ball y, left paddle y and right paddle y.
         """
-        displacement_from_paddle = ball.y_position - (paddle.y_position + (paddle.height // 2))
-        reduction = (paddle.height // 2) / ball.max_velocity
-        y_velocity = displacement_from_paddle / reduction
-        return y_velocity
-
-    # TODO - change to handle ball collision or separate paddle and ceiling collisions.
-    # TODO - refactor so that ball and paddle collisions happen at paddle borders instead of before/after paddle edges
-    def handle_paddle_collision(self):
-        """Handles ball collisions."""
-        if self.ball.y_position <= 0 + self.ball.radius or self.ball.y_position >= WINDOW_HEIGHT - self.ball.radius:
-            self.ball.y_velocity *= -1
-
-        if (
-            self.ball.y_position >= self.paddle_left.y_position
-            and self.ball.y_position <= self.paddle_left.y_position + self.paddle_left.height
-        ):
-            if self.ball.x_position - self.ball.radius <= self.paddle_left.x_position + self.paddle_left.width:
-                self.ball.x_velocity *= -1
-                self.ball.y_velocity = self.calculate_return_y_velocity(self.paddle_left, self.ball)
-
-        if (
-            self.ball.y_position >= self.paddle_right.y_position
-            and self.ball.y_position <= self.paddle_right.y_position + self.paddle_right.height
-        ):
-            if self.ball.x_position + self.ball.radius >= self.paddle_right.x_position:
-                self.ball.x_velocity *= -1
-                self.ball.y_velocity = self.calculate_return_y_velocity(self.paddle_right, self.ball)
+        if alpha >= 1:
+            return self.get_positions()
+        return tuple(
+            previous + (current - previous) * alpha
+            for previous, current in zip(self.previous_positions, self.get_positions())
+        )
 
-    def draw(self, window):
+    def draw(self, window, alpha: float = 1.0):
         """Handles the drawing of visual elements to the game window
 
         Args:
             window (pygame.display): The Pong game window.
+            alpha (float, optional): How far between the previous and current physics tick to draw. Defaults to 1.0.
         """
+        import pygame
+
+        ball_x, ball_y, left_y, right_y = self.interpolate_positions(alpha)
+        if self.renderer is not None:
+            self.draw_dirty_rects(window, ball_x, ball_y, left_y, right_y)
+            return
 
         # Reset canvas
         window.fill(BLACK)
@@ -235,7 +222,7 @@ class Pong:
             self.paddle_left.colour,
             (
                 self.paddle_left.x_position,
-                self.paddle_left.y_position,
+                left_y,
                 self.paddle_left.width,
                 self.paddle_left.height,
             ),
@@ -245,111 +232,466 @@ class Pong:
             self.paddle_right.colour,
             (
                 self.paddle_right.x_position,
-                self.paddle_right.y_position,
+                right_y,
                 self.paddle_right.width,
                 self.paddle_right.height,
             ),
         )
 
         # Draws the scores
-        score_one_text = self.game_font.render(f"{self.player_one.score}", 1, WHITE)
-        score_two_text = self.game_font.render(f"{self.player_two.score}", 1, WHITE)
-        window.blit(score_one_text, (WINDOW_WIDTH // 4 - score_one_text.get_width() // 2, 20))
+        score_one_text = self.get_score_surface(self.player_one)
+        score_two_text = self.get_score_surface(self.player_two)
+        width = self.config.window_width
+        window.blit(score_one_text, (width // 4 - score_one_text.get_width() // 2, 20))
         window.blit(
             score_two_text,
-            (WINDOW_WIDTH * (3 / 4) - score_two_text.get_width() // 2, 20),
+            (width * (3 / 4) - score_two_text.get_width() // 2, 20),
         )
 
         # Draw the ball
         pygame.draw.circle(
             window,
             self.ball.colour,
-            (self.ball.x_position, self.ball.y_position),
+            (ball_x, ball_y),
             self.ball.radius,
         )
 
         # Detect if there is a winner
         # TODO - refactor this to send winner a player name
-        if self.player_one.score >= MAX_SCORE or self.player_two.score >= MAX_SCORE:
+        if self.state == GameState.MATCH_OVER:
             self.winner(window)
         else:
             pygame.display.update()
 
+    def draw_dirty_rects(self, window, ball_x, ball_y, left_y, right_y):
+        """Draws the frame through the dirty rect renderer, touching only what changed since the last frame.
+
+        Args:
+            window (pygame.display): The Pong game window.
+            ball_x (float): ball x position to draw at.
+            ball_y (float): ball y position to draw at.
+            left_y (float): left paddle y position to draw at.
+            right_y (float): right paddle y position to draw at.
+
+        Returns:
+            list: the rects passed to pygame.display.update.
+        """
+        import pygame
+
+        if self.state == GameState.MATCH_OVER:
+            self.winner(window)
+            self.renderer.invalidate()
+            return [window.get_rect()]
+
+        left, right, ball = self.paddle_left, self.paddle_right, self.ball
+        player_one, player_two = self.player_one, self.player_two
+        width = self.config.window_width
+        items = [
+            ("score_one", player_one.score, lambda window: self.blit_score(window, player_one, width // 4)),
+            (
+                "score_two",
+                player_two.score,
+                lambda window: self.blit_score(window, player_two, width * (3 / 4)),
+            ),
+            (
+                "paddle_left",
+                left_y,
+                lambda window: pygame.draw.rect(
+                    window, left.colour, (left.x_position, left_y, left.width, left.height)
+                ),
+            ),
+            (
+                "paddle_right",
+                right_y,
+                lambda window: pygame.draw.rect(
+                    window, right.colour, (right.x_position, right_y, right.width, right.height)
+                ),
+            ),
+            (
+                "ball",
+                (ball_x, ball_y),
+                lambda window: pygame.draw.circle(window, ball.colour, (ball_x, ball_y), ball.radius),
+            ),
+        ]
+        return self.renderer.draw(window, items)
+
+    def blit_score(self, window, player: Player, centre_x: float):
+        """Writes a player's score centred on centre_x at the top of the window.
+
+        Args:
+            window (pygame.display): The Pong game window.
+            player (Player): the player whose score to write.
+            centre_x (float): x position to centre the text on.
+
+        Returns:
+            pygame.Rect: the area written to.
+        """
+        score_text = self.get_score_surface(player)
+        return window.blit(score_text, (centre_x - score_text.get_width() // 2, 20))
+
+    def get_score_surface(self, player: Player):
+        """Returns the rendered score for a player, looking it up again only after the score changes.
+
+        Args:
+            player (Player): the player whose score to render.
+
+        Returns:
+            pygame.Surface: the rendered score text.
+        """
+        score, surface = self.score_surfaces.get(id(player), (None, None))
+        if score != player.score:
+            surface = self.text_cache.render(self.game_font, f"{player.score}", WHITE)
+            self.score_surfaces[id(player)] = (player.score, surface)
+        return surface
+
     # TODO - refactor winner() - to take a name
     def winner(self, window):
-        """Handles writing to the window and resetting the game if a winner is identified.
+        """Handles writing the winner to the window while the match is over.
+
+        The match over pause and the score reset are run by the simulation state machine, so this returns at once.
 
         Args:
             window (pygame.display): The Pong game window.
         """
-        if self.player_one.score >= MAX_SCORE:
-            winning_text = f"{self.player_one.name} has won!"
-            logger.info("Player: %s, has own the game.", self.player_one.name)
-        elif self.player_two.score >= MAX_SCORE:
-            winning_text = f"{self.player_two.name} has won!"
-            logger.info("Player: %s, has own the game.", self.player_two.name)
-
-        text_to_write = self.game_font.render(winning_text, 1, WHITE)
+        import pygame
+
+        winning_text = f"{self.get_winner().name} has won!"
+        text_to_write = self.text_cache.render(self.game_font, winning_text, WHITE)
         window.fill(BLACK)
         window.blit(
             text_to_write,
             (
-                WINDOW_WIDTH // 2 - text_to_write.get_width() // 2,
-                WINDOW_HEIGHT // 2 - text_to_write.get_height() // 2,
+                self.config.window_width // 2 - text_to_write.get_width() // 2,
+                self.config.window_height // 2 - text_to_write.get_height() // 2,
             ),
         )
-        logger.info("Resetting player scores.")
-        self.player_one.score = 0
-        self.player_two.score = 0
         pygame.display.update()
-        pygame.time.delay(5000)
 
-    def reset(self):
-        """Resets the paddle and ball positions as well as ball y_velocity. Ball x_velocity is not impacted."""
-        logger.info("Resetting ball and paddles to original positions.")
-        self.ball.x_position = self.ball.x_position_original
-        self.ball.y_position = self.ball.y_position_original
-        self.ball.y_velocity = 0
+    def run_game(self, tick_rate: int = TICK_RATE, fps_limit: int = FPS_LIMIT, profiler=None):
+        """Contains the game loop. Handles window closure.
 
-        self.paddle_left.y_position = self.paddle_left.y_position_original
+        Physics advances in fixed ticks of 1 / tick_rate seconds from an accumulator of elapsed time, so the game
+        plays at the same speed whatever the render rate. A slow frame runs several ticks before drawing once.
 
-        self.paddle_right.y_position = self.paddle_right.y_position_original
+        Args:
+            tick_rate (int, optional): physics ticks per second. Defaults to TICK_RATE.
+            fps_limit (int, optional): maximum frames drawn per second. Defaults to FPS_LIMIT.
+            profiler (FrameProfiler, optional): times each phase of every frame, with paddle movement charged to
+                input rather than physics. Defaults to None, in which case the loop runs uninstrumented.
+        """
+        import pygame
 
-    def goal(self):
-        """Handles a goal outcome"""
-        if self.ball.x_position < 0:
-            self.player_two.score += 1
-            logger.info("Player: %s, has scored. Total score is now: %s", self.player_two.name, self.player_two.score)
-            self.reset()
+        run = True
+        logger.info("Setting the game loop controller run to: %s", run)
+        logger.info("Physics at %s ticks per second, rendering capped at %s FPS.", tick_rate, fps_limit)
+        tick_time = 1 / tick_rate
+        self.goal_pause_ticks = round(GOAL_PAUSE_SECONDS * tick_rate)
+        self.match_over_ticks = round(MATCH_OVER_SECONDS * tick_rate)
+        accumulator = 0.0
+        window = get_window((self.config.window_width, self.config.window_height))
+
+        if profiler is not None:
+            self.run_profiled_loop(window, tick_time, fps_limit, profiler)
+            pygame.quit()
+            return
+
+        # Keep in step with run_profiled_loop, which is this loop with a lap after every phase
+        while run:
+            accumulator += min(self.clock.tick(fps_limit) / 1000, MAX_FRAME_TIME)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    run = False
+                    logger.info("Game encountered pygame.QUIT signal, game closing.")
+                    break
+
+            while accumulator >= tick_time:
+                self.advance(self.read_controllers())
+                accumulator -= tick_time
+            self.draw(window, accumulator / tick_time)
+
+        pygame.quit()
 
-        elif self.ball.x_position > WINDOW_WIDTH:
-            self.player_one.score += 1
-            logger.info("Player: %s, has scored. Total score is now: %s", self.player_one.name, self.player_one.score)
-            self.reset()
+    def run_profiled_loop(self, window, tick_time: float, fps_limit: int, profiler):
+        """The run_game loop with each phase timed by a FrameProfiler, returning when the window is closed.
+
+        It is kept apart from run_game so that the unprofiled loop makes no profiling calls at all.
+
+        Args:
+            window (pygame.display): The Pong game window.
+            tick_time (float): seconds per physics tick.
+            fps_limit (int): maximum frames drawn per second.
+            profiler (FrameProfiler): the profiler to record into.
+        """
+        import pygame
+        from profiler import DRAW, EVENTS, INPUT, PHYSICS, WAIT
 
-    def run_game(self):
-        """Contains the game loop. Handles window closure."""
         run = True
-        logger.info("Setting the game loop controller run to: %s", run)
+        accumulator = 0.0
+        profiler.install()
+        profiler.wrap(self, "move_paddle", INPUT)
+        try:
+            profiler.start()
+            while run:
+                accumulator += min(self.clock.tick(fps_limit) / 1000, MAX_FRAME_TIME)
+                profiler.lap(WAIT)
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        run = False
+                        logger.info("Game encountered pygame.QUIT signal, game closing.")
+                        break
+                profiler.lap(EVENTS)
+
+                while accumulator >= tick_time:
+                    inputs = self.read_controllers()
+                    profiler.lap(INPUT)
+                    self.advance(inputs)
+                    profiler.lap(PHYSICS)
+                    accumulator -= tick_time
+                self.draw(window, accumulator / tick_time)
+                profiler.lap(DRAW)
+                profiler.end_frame(window)
+        finally:
+            profiler.uninstall()
+        logger.info("Frame profile:\n%s", profiler.report())
+
+
+class ChaosPong:
+    """Chaos mode front-end: a ChaosSimulation played with the keyboard and drawn to the game window."""
+
+    def __init__(self, balls: int, config: GameConfig = DEFAULT_CONFIG, seed: int = 0) -> None:
+        """Chaos Pong init.
+
+        Args:
+            balls (int): number of balls in play.
+            config (GameConfig, optional): window, paddle, ball and scoring settings. Defaults to DEFAULT_CONFIG.
+            seed (int, optional): seed of the serve directions. Defaults to 0.
+        """
+        import pygame
+        from chaos import ChaosSimulation
+
+        self.game = ChaosSimulation(balls, PongSimulation(config=config), seed=seed)
+        self.clock = pygame.time.Clock()
+        self.left_controller = Keyboard(pygame.K_w, pygame.K_s)
+        self.right_controller = Keyboard(pygame.K_UP, pygame.K_DOWN)
+        self.text_cache = TextCache()
+        self._game_font = None
+        self._ball_sprite = None
+
+    def ball_sprite(self):
+        """Returns one ball drawn on a transparent surface, blitted once per ball instead of drawing circles."""
+        if self._ball_sprite is None:
+            import pygame
+
+            balls = self.game.balls
+            self._ball_sprite = pygame.Surface((2 * balls.radius + 1, 2 * balls.radius + 1), pygame.SRCALPHA)
+            pygame.draw.circle(self._ball_sprite, balls.colour, (balls.radius, balls.radius), balls.radius)
+        return self._ball_sprite
+
+    def draw(self, window):
+        """Draws the paddles, every ball and the scores, then updates the window.
+
+        Args:
+            window (pygame.display): The Pong game window.
+        """
+        import pygame
+
+        if self._game_font is None:
+            pygame.font.init()
+            self._game_font = pygame.font.SysFont("Britannic", 50)
+        game = self.game
+        window.fill(BLACK)
+        for paddle in game.paddles:
+            pygame.draw.rect(
+                window, paddle.colour, (paddle.x_position, paddle.y_position, paddle.width, paddle.height)
+            )
+        sprite, radius = self.ball_sprite(), game.balls.radius
+        window.blits(
+            [
+                (sprite, (x - radius, y - radius))
+                for x, y in zip(game.balls.x_position.tolist(), game.balls.y_position.tolist())
+            ],
+            doreturn=False,
+        )
+        width = game.config.window_width
+        for player, centre_x in ((game.player_one, width // 4), (game.player_two, width * (3 / 4))):
+            score_text = self.text_cache.render(self._game_font, f"{player.score}", WHITE)
+            window.blit(score_text, (centre_x - score_text.get_width() // 2, 20))
+        pygame.display.update()
+
+    def run_game(self, tick_rate: int = TICK_RATE, fps_limit: int = FPS_LIMIT):
+        """Contains the chaos mode loop, stepping physics in fixed ticks as Pong.run_game does.
+
+        Args:
+            tick_rate (int, optional): physics ticks per second. Defaults to TICK_RATE.
+            fps_limit (int, optional): maximum frames drawn per second. Defaults to FPS_LIMIT.
+        """
+        import pygame
 
+        game = self.game
+        logger.info("Starting chaos mode with %s balls.", len(game.balls))
+        window = get_window((game.config.window_width, game.config.window_height))
+        tick_time = 1 / tick_rate
+        accumulator = 0.0
+        run = True
         while run:
-            self.clock.tick(FPS_LIMIT)
-            self.draw(GAME_WINDOW)
+            accumulator += min(self.clock.tick(fps_limit) / 1000, MAX_FRAME_TIME)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     run = False
                     logger.info("Game encountered pygame.QUIT signal, game closing.")
                     break
 
-            keys = pygame.key.get_pressed()
-            self.move_paddle(keys)
-            self.move_ball()
-            self.handle_paddle_collision()
-            self.goal()
+            while accumulator >= tick_time:
+                left_move = self.left_controller(game, game.paddle_left)
+                right_move = self.right_controller(game, game.paddle_right)
+                game.step(to_inputs(left_move, right_move))
+                accumulator -= tick_time
+            self.draw(window)
 
         pygame.quit()
 
 
+@dataclass
+class PairingSummary:
+    """Running totals for one pairing of a tournament"""
+
+    matches: int = 0
+    left_wins: int = 0
+    right_wins: int = 0
+    draws: int = 0
+    ticks: int = 0
+    points: int = 0
+    returns: int = 0
+    longest_rally: int = 0
+
+
+class TournamentSummary:
+    """Aggregates match results as they arrive, keeping only per-pairing totals in memory."""
+
+    def __init__(self, pairings: int) -> None:
+        """Tournament summary init.
+
+        Args:
+            pairings (int): number of pairings in the tournament.
+        """
+        self.pairings = [PairingSummary() for _ in range(pairings)]
+
+    def add(self, result: MatchResult):
+        """Folds one match result into its pairing's totals.
+
+        Args:
+            result (MatchResult): the finished match.
+        """
+        summary = self.pairings[result.pairing]
+        summary.matches += 1
+        if result.winner is None:
+            summary.draws += 1
+        elif result.score_one > result.score_two:
+            summary.left_wins += 1
+        else:
+            summary.right_wins += 1
+        summary.ticks += result.ticks
+        summary.points += len(result.rally_lengths)
+        summary.returns += sum(result.rally_lengths)
+        summary.longest_rally = max(summary.longest_rally, *result.rally_lengths, 0)
+
+
+def iter_tournament(
+    pairings,
+    matches: int,
+    workers: int = None,
+    chunk_size: int = 50,
+    max_ticks: int = MAX_MATCH_TICKS,
+    config: GameConfig = DEFAULT_CONFIG,
+):
+    """Plays every pairing headless across a process pool, yielding results as chunks finish.
+
+    Only a couple of chunks per worker are in flight at once, so memory does not grow with the match count.
+
+    Args:
+        pairings (list): (left controller, right controller) tuples. Controllers must be picklable.
+        matches (int): number of matches to play per pairing, seeded 0 to matches - 1.
+        workers (int, optional): pool size. Defaults to the CPU count.
+        chunk_size (int, optional): matches per pool task. Defaults to 50.
+        max_ticks (int, optional): tick limit per match. Defaults to MAX_MATCH_TICKS.
+        config (GameConfig, optional): gameplay settings of every match. Defaults to DEFAULT_CONFIG.
+
+    Yields:
+        MatchResult: each finished match, in completion order.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+    workers = workers or os.cpu_count() or 1
+    logger.info("Starting tournament of %s pairings x %s matches on %s workers.", len(pairings), matches, workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for pairing, (left, right) in enumerate(pairings):
+            for first_seed in range(0, matches, chunk_size):
+                count = min(chunk_size, matches - first_seed)
+                pending.add(
+                    executor.submit(play_matches, pairing, left, right, first_seed, count, max_ticks, config)
+                )
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+        for future in as_completed(pending):
+            yield from future.result()
+
+
+def run_tournament(
+    pairings,
+    matches: int,
+    workers: int = None,
+    chunk_size: int = 50,
+    on_result=None,
+    config: GameConfig = DEFAULT_CONFIG,
+):
+    """Plays a tournament and aggregates its results.
+
+    Args:
+        pairings (list): (left controller, right controller) tuples. Controllers must be picklable.
+        matches (int): number of matches to play per pairing.
+        workers (int, optional): pool size. Defaults to the CPU count.
+        chunk_size (int, optional): matches per pool task. Defaults to 50.
+        on_result (callable, optional): called with each MatchResult as it arrives.
+        config (GameConfig, optional): gameplay settings of every match. Defaults to DEFAULT_CONFIG.
+
+    Returns:
+        TournamentSummary: per-pairing totals.
+    """
+    summary = TournamentSummary(len(pairings))
+    for result in iter_tournament(pairings, matches, workers, chunk_size, config=config):
+        summary.add(result)
+        if on_result is not None:
+            on_result(result)
+    return summary
+
+
+def run_sweep(axes: list, base: GameConfig, matches: int, cache_path: str):
+    """Plays a Predictive vs RandomMoves sweep over a grid of settings and prints each config's totals.
+
+    Args:
+        axes (list): NAME=VALUES strings, each a setting and the values to try.
+        base (GameConfig): settings not swept.
+        matches (int): matches per config, seeded 0 to matches - 1.
+        cache_path (str): result cache directory.
+    """
+    from controllers import Predictive, RandomMoves
+    from sweep import ResultCache, config_grid, iter_sweep, parse_axis
+
+    axes = [parse_axis(axis) for axis in axes]
+    configs = config_grid(axes, base)
+    cache = ResultCache(cache_path)
+    summary = TournamentSummary(len(configs))
+    for result in iter_sweep(configs, Predictive(), RandomMoves(), range(matches), cache):
+        summary.add(result)
+    for config, totals in zip(configs, summary.pairings):
+        settings = ", ".join(f"{name}={getattr(config, name)}" for name, _ in axes)
+        print(f"{settings}: {totals}")
+    print(f"{cache.hits} points cached, {cache.misses} played")
+
+
 def parse_args():
     import argparse
 
@@ -358,6 +700,48 @@ def parse_args():
         epilog="This is the end of the help section.",
     )
     parser.add_argument("-d", "--debug", help="Runs the program in debug mode.", action="store_true")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="Physics ticks per second.")
+    parser.add_argument("--fps", type=int, default=FPS_LIMIT, help="Maximum frames drawn per second.")
+    parser.add_argument("--dirty-rects", help="Redraws only the changed parts of the window.", action="store_true")
+    parser.add_argument(
+        "--continuous-collisions", help="Sweeps the ball so fast balls cannot pass paddles.", action="store_true"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.txt",
+        metavar="FILE",
+        help="Times each phase of the game loop, dumping the report to FILE (default profile.txt).",
+    )
+    parser.add_argument(
+        "--profile-overlay", help="Draws frame times and the phase breakdown on screen.", action="store_true"
+    )
+    parser.add_argument("--record", metavar="FILE", help="Records the session's inputs to FILE for replay.")
+    parser.add_argument(
+        "--replay", metavar="FILE", help="Replays a recording headless, checks it and prints the final scores."
+    )
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Hosts networked matches on PORT instead of a game.")
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address --serve listens on. Defaults to this machine only; use 0.0.0.0 to accept remote players.",
+    )
+    parser.add_argument(
+        "-t", "--tournament", type=int, metavar="MATCHES", help="Plays MATCHES headless bot matches instead of a game."
+    )
+    parser.add_argument("--config", metavar="FILE", help="Reads gameplay settings from a JSON config file.")
+    parser.add_argument("--chaos", type=int, metavar="BALLS", help="Plays chaos mode with BALLS balls at once.")
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        metavar="NAME=VALUES",
+        help="Sweeps a setting over comma separated values with headless bot matches instead of a game; repeat "
+        "for a grid, e.g. --sweep paddle_height=60,80,100 --sweep ball_max_velocity=5,7.",
+    )
+    parser.add_argument("--sweep-matches", type=int, default=20, metavar="N", help="Matches per sweep point.")
+    parser.add_argument(
+        "--sweep-cache", default="sweep_cache", metavar="DIR", help="Directory caching sweep results between runs."
+    )
     args, unknown = parser.parse_known_args()
     if args.debug:
         import logging
@@ -367,13 +751,54 @@ def parse_args():
     if unknown:
         for arg in unknown:
             logger.info("Unhandled argument %s", arg)
+    return args
 
 
 def main():
     """The entry point to the program"""
-    parse_args()
-    game = Pong()
-    game.run_game()
+    setup_logging()
+    args = parse_args()
+    config = GameConfig.load(args.config) if args.config else DEFAULT_CONFIG
+    if args.sweep:
+        run_sweep(args.sweep, config, args.sweep_matches, args.sweep_cache)
+        return
+    if args.tournament:
+        from controllers import FollowBall, RandomMoves
+
+        pairings = [(RandomMoves(), RandomMoves()), (FollowBall(), RandomMoves()), (RandomMoves(), FollowBall())]
+        summary = run_tournament(pairings, args.tournament, config=config)
+        for (left, right), totals in zip(pairings, summary.pairings):
+            print(f"{left.name} vs {right.name}: {totals}")
+        return
+    if args.serve is not None:
+        import asyncio
+
+        from server import serve
+
+        asyncio.run(serve(args.host, args.serve, args.tick_rate, config))
+        return
+    if args.chaos:
+        ChaosPong(args.chaos, config).run_game(args.tick_rate, args.fps)
+        return
+    if args.replay:
+        from replay import Recording, replay
+
+        game = replay(Recording.load(args.replay))
+        print(f"{game.player_one.name} {game.player_one.score} - {game.player_two.score} {game.player_two.name}")
+        return
+    game = Pong(dirty_rects=args.dirty_rects, continuous_collisions=args.continuous_collisions, config=config)
+    if args.record:
+        from replay import InputRecorder
+
+        game.recorder = InputRecorder(game)
+    profiler = None
+    if args.profile or args.profile_overlay:
+        from profiler import FrameProfiler
+
+        profiler = FrameProfiler(overlay=args.profile_overlay, dump_path=args.profile)
+    game.run_game(args.tick_rate, args.fps, profiler)
+    if game.recorder is not None:
+        game.recorder.finish().save(args.record)
 
 
 if __name__ == "__main__":
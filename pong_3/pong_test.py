@@ -1,4 +1,9 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
 import pong
+import pygame
 import pytest
 
 
@@ -18,3 +23,117 @@ def test_y_velocity_calculation(setup):
     left_paddle.y_position += 10
     y_velocity = game.calculate_return_y_velocity(left_paddle, ball)
     assert y_velocity != 0
+
+
+def test_tournament_aggregates_results():
+    from controllers import FollowBall, RandomMoves
+
+    pairings = [(FollowBall(), RandomMoves()), (RandomMoves(), RandomMoves())]
+    results = []
+    summary = pong.run_tournament(pairings, 6, workers=2, chunk_size=4, on_result=results.append)
+    assert len(results) == 12
+    assert [totals.matches for totals in summary.pairings] == [6, 6]
+    assert summary.pairings[0].left_wins == 6
+    for totals in summary.pairings:
+        assert totals.left_wins + totals.right_wins + totals.draws == totals.matches
+    assert sorted(result.seed for result in results if result.pairing == 1) == list(range(6))
+
+
+def test_tournament_plays_under_its_config():
+    from controllers import FollowBall, RandomMoves
+    from match import play_match
+    from simulation import GameConfig
+
+    config = GameConfig(window_height=300, paddle_height=60, max_score=2)
+    results = []
+    pong.run_tournament([(FollowBall(), RandomMoves())], 3, workers=1, on_result=results.append, config=config)
+    assert [max(result.score_one, result.score_two) for result in results] == [2, 2, 2]
+    for result in results:
+        assert result == play_match(FollowBall(), RandomMoves(), result.seed, config=config)
+
+
+def test_interpolation_between_ticks(setup):
+    game, left_paddle, right_paddle, ball = setup
+    start_x = ball.x_position
+    game.advance(pong.NO_INPUT)
+    halfway = game.interpolate_positions(0.5)
+    assert halfway[0] == start_x + ball.x_velocity / 2
+    assert game.interpolate_positions(1.0)[0] == ball.x_position
+
+
+def test_interpolation_snaps_on_goal(setup):
+    game, left_paddle, right_paddle, ball = setup
+    ball.x_position = pong.WINDOW_WIDTH
+    ball.y_position = pong.WINDOW_HEIGHT - 10
+    assert game.advance(pong.NO_INPUT) is game.player_one
+    assert game.interpolate_positions(0.0) == game.get_positions()
+
+
+def test_dirty_rects_match_full_repaint():
+    from controllers import FollowBall, RandomMoves, to_inputs
+
+    pong.get_window()
+    full, dirty = pong.Pong(), pong.Pong(dirty_rects=True)
+    full_window = pygame.Surface((pong.WINDOW_WIDTH, pong.WINDOW_HEIGHT))
+    dirty_window = pygame.Surface((pong.WINDOW_WIDTH, pong.WINDOW_HEIGHT))
+    left, right = FollowBall(), RandomMoves()
+    right.reset(7)
+    for frame in range(400):
+        inputs = to_inputs(left(full, full.paddle_left), right(full, full.paddle_right))
+        full.advance(inputs)
+        dirty.advance(inputs)
+        full.draw(full_window, 0.5)
+        dirty.draw(dirty_window, 0.5)
+        assert pygame.image.tobytes(full_window, "RGB") == pygame.image.tobytes(dirty_window, "RGB")
+    full_area = pong.WINDOW_WIDTH * pong.WINDOW_HEIGHT
+    dirty.advance(pong.NO_INPUT)
+    updates = dirty.draw_dirty_rects(dirty_window, *dirty.get_positions())
+    assert 0 < sum(rect.width * rect.height for rect in updates) < full_area // 10
+
+
+def test_steady_state_frames_render_no_text(setup):
+    game, left_paddle, right_paddle, ball = setup
+    window = pong.get_window()
+    game.draw(window)
+    misses = game.text_cache.misses
+    lookups = game.text_cache.hits + misses
+    for _ in range(10):
+        game.advance(pong.NO_INPUT)
+        game.draw(window)
+    assert game.text_cache.misses == misses
+    assert game.text_cache.hits + game.text_cache.misses == lookups
+    game.player_one.score += 1
+    game.draw(window)
+    assert game.text_cache.misses == misses + 1
+
+
+def test_import_has_no_side_effects(tmp_path):
+    import subprocess
+    import sys
+
+    code = (
+        "import logging, sys, pong; "
+        "assert not {'pygame', 'argparse', 'concurrent.futures.process'} & set(sys.modules); "
+        "assert not logging.getLogger().handlers"
+    )
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(pong.__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_chaos_mode_draws_every_ball():
+    game = pong.ChaosPong(300)
+    window = pong.get_window()
+    game.game.step()
+    game.draw(window)
+    pixels = pygame.surfarray.pixels3d(window)
+    for x, y in zip(game.game.balls.x_position[:20], game.game.balls.y_position[:20]):
+        assert tuple(pixels[int(x), int(y)]) == game.game.balls.colour
+    del pixels
+
+
+def test_server_listens_locally_by_default(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["pong.py", "--serve", "5000"])
+    assert pong.parse_args().host == "127.0.0.1"
+    monkeypatch.setattr("sys.argv", ["pong.py", "--serve", "5000", "--host", "0.0.0.0"])
+    assert pong.parse_args().host == "0.0.0.0"
@@ -0,0 +1,113 @@
+"""This module contains a closed-form predictor of where the ball will cross a given x position.
+
+Between paddle hits the ball travels in a straight line folded by the walls at radius and the court height minus
+radius, so its height at any time is a triangle wave and the intercept can be computed in constant time instead of
+simulating ahead tick by tick. Wall reflections are ideal, which is exact with continuous collisions and within
+one tick's y movement per bounce with the discrete collision rules.
+   """
+
+from dataclasses import dataclass
+
+from simulation import WINDOW_HEIGHT
+
+
+@dataclass(frozen=True)
+class Intercept:
+    """Predicted crossing of the ball with a vertical line"""
+
+    y_position: float
+    ticks: float
+
+
+def fold_y(y_position: float, radius: int, height: int = WINDOW_HEIGHT) -> float:
+    """Maps an unbounded ball height back into the court by reflecting it off both walls.
+
+    Args:
+        y_position (float): height the ball would reach with no walls.
+        radius (int): ball radius in pixels.
+        height (int, optional): court height in pixels. Defaults to WINDOW_HEIGHT.
+
+    Returns:
+        float: the height after every wall reflection.
+    """
+    span = height - 2 * radius
+    if span <= 0:
+        return height / 2
+    offset = (y_position - radius) % (2 * span)
+    return radius + (offset if offset <= span else 2 * span - offset)
+
+
+def predict_intercept(ball, target_x: float, height: int = WINDOW_HEIGHT):
+    """Predicts where and when the ball's centre next reaches target_x.
+
+    Args:
+        ball (Ball): the ball in play.
+        target_x (float): x position of the line to cross.
+        height (int, optional): court height in pixels. Defaults to WINDOW_HEIGHT.
+
+    Returns:
+        Intercept: the crossing height and ticks until it, or None if the ball is not moving towards target_x.
+    """
+    if ball.x_velocity == 0:
+        return None
+    ticks = (target_x - ball.x_position) / ball.x_velocity
+    if ticks < 0:
+        return None
+    return Intercept(fold_y(ball.y_position + ball.y_velocity * ticks, ball.radius, height), ticks)
+
+
+def paddle_face_x(paddle, ball) -> float:
+    """Returns the x position of the ball's centre when it touches the paddle's inner face.
+
+    Args:
+        paddle (Paddle): the paddle.
+        ball (Ball): the ball in play.
+
+    Returns:
+        float: the face x position.
+    """
+    if paddle.x_position < ball.x_position_original:
+        return paddle.x_position + paddle.width + ball.radius
+    return paddle.x_position - ball.radius
+
+
+class TrajectoryPredictor:
+    """Caches a ball intercept until a paddle hit or reset changes the ball's path."""
+
+    def __init__(self) -> None:
+        """Trajectory predictor init."""
+        self._key = None
+        self._origin = None
+        self._intercept = None
+        self.hits = 0
+        self.misses = 0
+
+    def predict(self, ball, target_x: float, tick: int, height: int = WINDOW_HEIGHT):
+        """Predicts where and when the ball next reaches target_x, reusing the last result while it still holds.
+
+        The cached prediction is kept while the ball keeps the same speed (wall bounces only flip the sign of
+        y_velocity) and is still where the prediction placed it; a paddle hit or reset therefore recomputes it.
+
+        Args:
+            ball (Ball): the ball in play.
+            target_x (float): x position of the line to cross.
+            tick (int): current simulation tick, e.g. PongSimulation.ticks.
+            height (int, optional): court height in pixels. Defaults to WINDOW_HEIGHT.
+
+        Returns:
+            Intercept: the crossing height and ticks remaining until it, or None if the ball is moving away.
+        """
+        key = (target_x, ball.x_velocity, abs(ball.y_velocity), height)
+        if key == self._key:
+            origin_tick, origin_x = self._origin
+            if abs(origin_x + ball.x_velocity * (tick - origin_tick) - ball.x_position) < 1e-6:
+                self.hits += 1
+                if self._intercept is None or self._intercept.ticks < tick - origin_tick:
+                    return None
+                return Intercept(self._intercept.y_position, self._intercept.ticks - (tick - origin_tick))
+
+        self.misses += 1
+        self._key = key
+        self._origin = (tick, ball.x_position)
+        self._intercept = predict_intercept(ball, target_x, height)
+        return self._intercept
@@ -0,0 +1,47 @@
+import predictor
+import simulation
+import pytest
+
+
+@pytest.fixture
+def setup():
+    game = simulation.PongSimulation(continuous_collisions=True)
+    game.paddle_left.y_position = game.paddle_right.y_position = -1000
+    yield (game, game.ball)
+
+
+def test_intercept_matches_swept_simulation(setup):
+    game, ball = setup
+    ball.x_velocity = -3
+    ball.y_velocity = 7.5
+    target_x = 40
+    intercept = predictor.predict_intercept(ball, target_x)
+    ticks = int(intercept.ticks)
+    for _ in range(ticks):
+        game.sweep_ball()
+    game.sweep_ball(intercept.ticks - ticks)
+    assert ball.x_position == pytest.approx(target_x)
+    assert ball.y_position == pytest.approx(intercept.y_position)
+
+
+def test_no_intercept_when_moving_away(setup):
+    game, ball = setup
+    assert predictor.predict_intercept(ball, 0) is None
+
+
+def test_prediction_cached_until_paddle_hit(setup):
+    game, ball = setup
+    ball.y_velocity = 9
+    cache = predictor.TrajectoryPredictor()
+    target_x = predictor.paddle_face_x(game.paddle_right, ball)
+    first = cache.predict(ball, target_x, game.ticks)
+    for _ in range(40):
+        game.step()
+        again = cache.predict(ball, target_x, game.ticks)
+        assert again.y_position == first.y_position
+        assert again.ticks == pytest.approx(first.ticks - game.ticks)
+    assert (cache.hits, cache.misses) == (40, 1)
+
+    ball.x_velocity *= -1
+    cache.predict(ball, target_x, game.ticks)
+    assert cache.misses == 2
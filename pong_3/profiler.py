@@ -0,0 +1,311 @@
+"""This module contains a per-phase profiler for the Pong game loop.
+
+Pong.run_game times every phase of a frame with perf_counter_ns when it is given a FrameProfiler, and records
+the per-frame totals into fixed-size log-scale histograms. Without a profiler run_game keeps its uninstrumented
+loop, which makes no profiling calls, so profiling costs nothing while disabled. Results can be drawn as an
+overlay and dumped to a file periodically.
+   """
+
+from array import array
+import time
+
+from simulation import BLACK, WHITE
+
+# Frame phases, in the order they run. Time spent in pygame.display.update and in log handlers is charged to
+# DISPLAY and LOG instead of the phase that called them, INPUT covers reading the controllers and moving the
+# paddles, and PROFILER is the overlay and dump cost itself.
+WAIT = "wait"
+EVENTS = "events"
+INPUT = "input"
+PHYSICS = "physics"
+DRAW = "draw"
+DISPLAY = "display"
+LOG = "log"
+PROFILER = "profiler"
+PHASES = (WAIT, EVENTS, INPUT, PHYSICS, DRAW, DISPLAY, LOG, PROFILER)
+
+# Whole frame, from the end of one frame to the end of the next
+FRAME = "frame"
+
+# Histogram buckets per power of two, so a recorded value is within 1 / 2 ** SUB_BUCKET_BITS of the true one
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Enough buckets for any 64-bit nanosecond count
+BUCKETS = 64 * SUB_BUCKETS
+
+# Seconds between file dumps and between overlay text refreshes
+DUMP_INTERVAL = 10
+OVERLAY_INTERVAL = 0.5
+
+
+def bucket_index(value: int) -> int:
+    """Returns the histogram bucket holding a non-negative integer.
+
+    Values below 2 * SUB_BUCKETS get a bucket each; above that every power of two is split into SUB_BUCKETS.
+
+    Args:
+        value (int): the value to bucket, e.g. a duration in ns.
+
+    Returns:
+        int: the bucket index.
+    """
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return value
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def bucket_value(index: int) -> int:
+    """Returns the smallest value held by a histogram bucket, the inverse of bucket_index.
+
+    Args:
+        index (int): the bucket index.
+
+    Returns:
+        int: the bucket's lower bound.
+    """
+    shift = max((index >> SUB_BUCKET_BITS) - 1, 0)
+    return (index - (shift << SUB_BUCKET_BITS)) << shift
+
+
+class Histogram:
+    """Fixed-size log-scale histogram of durations in nanoseconds."""
+
+    def __init__(self) -> None:
+        """Histogram init."""
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int):
+        """Adds one duration.
+
+        Args:
+            value (int): duration in ns.
+        """
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> int:
+        """Returns the duration below which percent of the recorded durations fall, to bucket resolution.
+
+        Args:
+            percent (float): between 0 and 100.
+
+        Returns:
+            int: duration in ns, 0 if nothing was recorded.
+        """
+        rank = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bucket_value(index), self.max)
+        return 0
+
+    def mean(self) -> float:
+        """Returns the mean duration in ns, 0 if nothing was recorded."""
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self):
+        """Forgets every recorded duration."""
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+
+class FrameProfiler:
+    """Times the phases of each game-loop frame.
+
+    The loop calls start once, lap after each phase and end_frame after each frame. install routes
+    pygame.display.update and the root log handlers through timed wrappers, and wrap any other function, until
+    uninstall is called.
+    """
+
+    def __init__(self, overlay: bool = False, dump_path: str = None, dump_interval: float = DUMP_INTERVAL) -> None:
+        """Frame profiler init.
+
+        Args:
+            overlay (bool, optional): draw frame time percentiles and the phase breakdown on the window.
+                Defaults to False.
+            dump_path (str, optional): file the report is rewritten to every dump_interval seconds and on
+                uninstall. Defaults to None, no file.
+            dump_interval (float, optional): seconds between dumps. Defaults to DUMP_INTERVAL.
+        """
+        self.overlay = overlay
+        self.dump_path = dump_path
+        self.dump_interval_ns = int(dump_interval * 1e9)
+        self.histograms = {phase: Histogram() for phase in PHASES + (FRAME,)}
+        self.frames = 0
+        self._phase_ns = dict.fromkeys(PHASES, 0)
+        self._nested_ns = 0
+        self._last = self._frame_start = self._last_dump = time.perf_counter_ns()
+        self._overlay_surface = None
+        self._overlay_refreshed = 0
+        self._font = None
+        self._patched = []
+
+    def timed(self, phase: str, function):
+        """Wraps a function so the time spent in it is charged to phase rather than to the phase calling it.
+
+        Args:
+            phase (str): one of PHASES.
+            function (callable): the function to time.
+
+        Returns:
+            callable: the timed wrapper.
+        """
+        timer = time.perf_counter_ns
+        phase_ns = self._phase_ns
+
+        def timed_function(*args, **kwargs):
+            start = timer()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = timer() - start
+                phase_ns[phase] += elapsed
+                self._nested_ns += elapsed
+
+        return timed_function
+
+    def wrap(self, owner, name: str, phase: str):
+        """Replaces owner.name with a timed wrapper charging it to phase, until uninstall restores it.
+
+        Args:
+            owner (object): module, class or instance holding the function, e.g. pygame.display.
+            name (str): attribute name of the function.
+            phase (str): one of PHASES.
+        """
+        # None for functions found on the owner's class, whose instance attribute uninstall deletes again
+        self._patched.append((owner, name, vars(owner).get(name)))
+        setattr(owner, name, self.timed(phase, getattr(owner, name)))
+
+    def install(self):
+        """Starts timing pygame.display.update as DISPLAY and root log handlers as LOG."""
+        import logging
+
+        import pygame
+
+        self.wrap(pygame.display, "update", DISPLAY)
+        for handler in logging.getLogger().handlers:
+            self.wrap(handler, "handle", LOG)
+
+    def uninstall(self):
+        """Restores the functions replaced by install and writes a last dump."""
+        while self._patched:
+            owner, name, original = self._patched.pop()
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        if self.dump_path is not None:
+            self.dump()
+
+    def start(self):
+        """Marks the start of the first frame."""
+        self._last = self._frame_start = self._last_dump = time.perf_counter_ns()
+        self._nested_ns = 0
+
+    def lap(self, phase: str):
+        """Charges the time since the previous lap, less any timed calls made in it, to phase.
+
+        Args:
+            phase (str): one of PHASES.
+        """
+        now = time.perf_counter_ns()
+        self._phase_ns[phase] += now - self._last - self._nested_ns
+        self._last = now
+        self._nested_ns = 0
+
+    def end_frame(self, window=None):
+        """Draws the overlay and dumps the report when due, then records the frame into the histograms.
+
+        Args:
+            window (pygame.Surface, optional): window to draw the overlay on. Defaults to None, no overlay.
+        """
+        if self.overlay and window is not None:
+            self.draw_overlay(window)
+        if self.dump_path is not None and self._last - self._last_dump >= self.dump_interval_ns:
+            self.dump()
+            self._last_dump = self._last
+        self.lap(PROFILER)
+
+        histograms = self.histograms
+        phase_ns = self._phase_ns
+        for phase in PHASES:
+            histograms[phase].record(phase_ns[phase])
+            phase_ns[phase] = 0
+        histograms[FRAME].record(self._last - self._frame_start)
+        self._frame_start = self._last
+        self.frames += 1
+
+    def reset(self):
+        """Forgets every recorded frame."""
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.frames = 0
+
+    def summary(self) -> list:
+        """Summarises the recorded frames.
+
+        Returns:
+            list: (name, mean, p50, p99, max) per phase, in ns, starting with the whole frame.
+        """
+        summary = []
+        for name in (FRAME,) + PHASES:
+            histogram = self.histograms[name]
+            summary.append((name, histogram.mean(), histogram.percentile(50), histogram.percentile(99), histogram.max))
+        return summary
+
+    def report(self) -> str:
+        """Formats the summary as a table in milliseconds.
+
+        Returns:
+            str: the report text.
+        """
+        lines = [f"{self.frames} frames", f"{'phase':10}{'mean':>9}{'p50':>9}{'p99':>9}{'max':>9}  ms"]
+        for name, mean, median, p99, longest in self.summary():
+            lines.append(f"{name:10}{mean / 1e6:9.3f}{median / 1e6:9.3f}{p99 / 1e6:9.3f}{longest / 1e6:9.3f}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self):
+        """Rewrites the report to dump_path."""
+        with open(self.dump_path, "w") as dump_file:
+            dump_file.write(self.report())
+
+    def draw_overlay(self, window):
+        """Draws the frame time percentiles and phase breakdown at the top centre of the window.
+
+        The text is re-rendered every OVERLAY_INTERVAL seconds and blitted on every frame in between.
+
+        Args:
+            window (pygame.Surface): The Pong game window.
+        """
+        import pygame
+
+        if self._overlay_surface is None or self._last - self._overlay_refreshed >= OVERLAY_INTERVAL * 1e9:
+            if self._font is None:
+                pygame.font.init()
+                self._font = pygame.font.Font(None, 18)
+            summary = self.summary()
+            _, _, frame_p50, frame_p99, _ = summary[0]
+            lines = [f"frame p50 {frame_p50 / 1e6:.2f} ms  p99 {frame_p99 / 1e6:.2f} ms"]
+            lines += [f"{name} {mean / 1e6:.3f} ms" for name, mean, _, _, _ in summary[1:]]
+            rendered = [self._font.render(line, True, WHITE, BLACK) for line in lines]
+            line_height = self._font.get_linesize()
+            width = max(surface.get_width() for surface in rendered)
+            self._overlay_surface = pygame.Surface((width, line_height * len(rendered)))
+            self._overlay_surface.fill(BLACK)
+            for row, surface in enumerate(rendered):
+                self._overlay_surface.blit(surface, (0, row * line_height))
+            self._overlay_refreshed = self._last
+
+        position = (window.get_width() // 2 - self._overlay_surface.get_width() // 2, 70)
+        pygame.display.update(window.blit(self._overlay_surface, position))
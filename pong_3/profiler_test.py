@@ -0,0 +1,121 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import profiler
+import pygame
+import pytest
+
+
+@pytest.fixture
+def setup():
+    yield profiler.FrameProfiler()
+
+
+def test_buckets_round_trip():
+    for value in list(range(100)) + [1_000, 16_666_667, 2**40 + 12345]:
+        index = profiler.bucket_index(value)
+        low = profiler.bucket_value(index)
+        assert low <= value < profiler.bucket_value(index + 1)
+        assert value - low <= value / profiler.SUB_BUCKETS
+    assert profiler.bucket_index(2**64 - 1) < profiler.BUCKETS
+
+
+def test_histogram_percentiles():
+    histogram = profiler.Histogram()
+    assert histogram.percentile(99) == 0
+    for value in range(1, 101):
+        histogram.record(value * 1_000)
+    assert histogram.count == 100
+    assert histogram.mean() == 50_500
+    assert 44_000 <= histogram.percentile(50) <= 50_000
+    assert 88_000 <= histogram.percentile(99) <= 100_000
+    assert histogram.max == 100_000
+    assert 87_500 <= histogram.percentile(100) <= histogram.max
+
+
+def test_timed_calls_are_charged_to_their_own_phase(setup):
+    frame_profiler = setup
+    slow_update = frame_profiler.timed(profiler.DISPLAY, lambda: pygame.time.wait(20))
+    frame_profiler.start()
+    slow_update()
+    frame_profiler.lap(profiler.DRAW)
+    frame_profiler.end_frame()
+
+    summary = {name: mean for name, mean, _, _, _ in frame_profiler.summary()}
+    assert summary[profiler.DISPLAY] >= 15e6
+    assert summary[profiler.DRAW] < 5e6
+    assert frame_profiler.frames == 1
+    assert sum(summary[phase] for phase in profiler.PHASES) == summary[profiler.FRAME]
+
+
+def test_run_game_profile_dump(tmp_path):
+    import pong
+
+    dump_path = tmp_path / "profile.txt"
+    frame_profiler = profiler.FrameProfiler(overlay=True, dump_path=str(dump_path))
+    update = pygame.display.update
+    game = pong.Pong()
+    pong.get_window()
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    try:
+        game.run_game(profiler=frame_profiler)
+    finally:
+        pong._game_window = None
+    assert pygame.display.update is update
+    assert "move_paddle" not in vars(game)
+    assert frame_profiler.frames == 1
+    report = dump_path.read_text()
+    assert report.startswith("1 frames")
+    for phase in profiler.PHASES:
+        assert phase in report
+
+
+def test_paddle_movement_is_charged_to_input():
+    import pong
+
+    frame_profiler = profiler.FrameProfiler()
+    game = pong.Pong()
+
+    def slow_move_paddle(inputs):
+        pygame.time.wait(2)
+
+    game.move_paddle = slow_move_paddle
+    pong.get_window()
+    # The first frame catches up on the ticks due since the game was created
+    pygame.time.wait(50)
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    try:
+        game.run_game(tick_rate=200, profiler=frame_profiler)
+    finally:
+        pong._game_window = None
+    assert game.move_paddle is slow_move_paddle
+    summary = {name: mean for name, mean, _, _, _ in frame_profiler.summary()}
+    assert summary[profiler.INPUT] >= 10e6
+    assert summary[profiler.PHYSICS] < summary[profiler.INPUT] / 2
+
+
+def test_unprofiled_loop_makes_no_profiler_calls():
+    import sys
+
+    import pong
+
+    game = pong.Pong()
+    pong.get_window()
+    pygame.time.wait(50)
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    called = set()
+
+    def trace(frame, event, arg):
+        if event == "call":
+            called.add(frame.f_code.co_name)
+
+    sys.setprofile(trace)
+    try:
+        game.run_game(tick_rate=200)
+    finally:
+        sys.setprofile(None)
+        pong._game_window = None
+    assert game.ticks > 0
+    assert "advance" in called
+    assert not called & {"lap", "end_frame", "install", "wrap", "timed_function"}
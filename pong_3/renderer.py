@@ -0,0 +1,65 @@
+"""This module contains a dirty-rectangle renderer for the Pong game window.
+
+Instead of clearing and flipping the whole window every frame, it erases and redraws only the items whose
+appearance changed since the last frame and hands the touched rects to pygame.display.update.
+   """
+
+import pygame
+
+from simulation import BLACK
+
+
+class DirtyRectRenderer:
+    """Redraws only changed items and updates only the screen areas they covered."""
+
+    def __init__(self, background: tuple = BLACK) -> None:
+        """Dirty rect renderer init.
+
+        Args:
+            background (tuple, optional): colour used to erase items. Defaults to BLACK.
+        """
+        self.background = background
+        self.items = {}
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Forces the next frame to repaint and update the whole window, e.g. after a full-screen message."""
+        self.full_redraw = True
+
+    def draw(self, window, items):
+        """Draws a frame.
+
+        Args:
+            window (pygame.Surface): The Pong game window.
+            items (list): (key, state, draw) tuples. state is any comparable value describing how the item looks;
+                draw(window) paints the item and returns its bounding pygame.Rect.
+
+        Returns:
+            list: the rects passed to pygame.display.update.
+        """
+        if self.full_redraw:
+            window.fill(self.background)
+            self.items = {key: (state, draw(window)) for key, state, draw in items}
+            self.full_redraw = False
+            pygame.display.update()
+            return [window.get_rect()]
+
+        erased = []
+        for key, state, _ in items:
+            previous = self.items.get(key)
+            if previous is not None and previous[0] != state:
+                window.fill(self.background, previous[1])
+                erased.append(previous[1])
+
+        updates = list(erased)
+        for key, state, draw in items:
+            previous = self.items.get(key)
+            # Unchanged items are repainted only when something erased or drawn before them overlaps them
+            if previous is None or previous[0] != state or previous[1].collidelist(updates) != -1:
+                rect = draw(window)
+                self.items[key] = (state, rect)
+                updates.append(rect)
+
+        if updates:
+            pygame.display.update(updates)
+        return updates
@@ -0,0 +1,265 @@
+"""This module contains deterministic match recording and replay.
+
+The simulation has no randomness of its own, so a match is fully described by its settings, its GameConfig and
+the input bits held on every tick. A recording stores those bits packed two ticks to a byte in an array,
+compressed, behind a small binary header; a match costs a few kilobytes. Replaying feeds the bits back through
+PongSimulation.update, and so move_paddle, headless and uncapped, then checks the final state against the
+fingerprint taken when recording.
+
+File layout, little-endian: HEADER, then each player name as a NAME_LENGTH and UTF-8, then the GameConfig as a
+CONFIG_LENGTH and that many bytes of JSON, then the zlib-compressed packed inputs. The low nibble of each byte is
+the earlier tick. Versions 1 and 2 have 16-bit pause tick counts and a length byte per name, and version 1 has no
+config, replaying with DEFAULT_CONFIG.
+   """
+
+from array import array
+from dataclasses import asdict, dataclass
+import json
+import struct
+import zlib
+
+from simulation import DEFAULT_CONFIG, GameConfig, PongSimulation
+from logger_setup import logger
+
+MAGIC = b"PONGRP"
+FORMAT_VERSION = 3
+
+# Format versions from_bytes reads
+READABLE_VERSIONS = (1, 2, 3)
+
+# Magic and format version, which every version starts with
+PREFIX = struct.Struct("<6sB")
+
+# Magic, format version, seed, ticks, goal pause ticks, match over ticks, continuous collisions, final fingerprint
+HEADER = struct.Struct("<6sBqIII?I")
+LEGACY_HEADER = struct.Struct("<6sBqIHH?I")
+
+# Length of each player name, and the longest name in UTF-8 bytes it can hold
+NAME_LENGTH = struct.Struct("<H")
+MAX_NAME_BYTES = 0xFFFF
+
+# Largest goal pause and match over tick counts HEADER can hold
+MAX_PAUSE_TICKS = 0xFFFFFFFF
+
+# Length of the JSON config following the player names
+CONFIG_LENGTH = struct.Struct("<H")
+
+# Final state fields folded into the fingerprint
+_STATE = struct.Struct("<ddddddqqHH16s")
+
+# Input bits per tick: LEFT_UP, LEFT_DOWN, RIGHT_UP and RIGHT_DOWN
+INPUT_MASK = 0xF
+
+
+def _encode_name(name: str) -> bytes:
+    """Returns a player name as UTF-8, raising ValueError if it is longer than MAX_NAME_BYTES."""
+    encoded = name.encode()
+    if len(encoded) > MAX_NAME_BYTES:
+        raise ValueError(f"Player name of {len(encoded)} UTF-8 bytes is too long, the most is {MAX_NAME_BYTES}")
+    return encoded
+
+
+def fingerprint(game: PongSimulation) -> int:
+    """Returns a CRC of the state a replay must reproduce: ball, paddles, scores, match state and tick count.
+
+    Args:
+        game (PongSimulation): the match.
+
+    Returns:
+        int: 32-bit fingerprint.
+    """
+    ball = game.ball
+    state = _STATE.pack(
+        ball.x_position,
+        ball.y_position,
+        ball.x_velocity,
+        ball.y_velocity,
+        game.paddle_left.y_position,
+        game.paddle_right.y_position,
+        game.ticks,
+        game.state_ticks,
+        game.player_one.score,
+        game.player_two.score,
+        game.state.value.encode(),
+    )
+    return zlib.crc32(state)
+
+
+@dataclass
+class Recording:
+    """A recorded match: its settings, the packed input of every tick and the final state fingerprint"""
+
+    player_one_name: str
+    player_two_name: str
+    seed: int = 0
+    goal_pause_ticks: int = 0
+    match_over_ticks: int = 0
+    continuous_collisions: bool = False
+    ticks: int = 0
+    inputs: array = None
+    final_fingerprint: int = 0
+    config: GameConfig = DEFAULT_CONFIG
+
+    def iter_inputs(self):
+        """Yields the input bits of every tick in order."""
+        for index in range(self.ticks):
+            byte = self.inputs[index >> 1]
+            yield byte >> 4 if index & 1 else byte & INPUT_MASK
+
+    def to_bytes(self) -> bytes:
+        """Encodes the recording in the file format described in the module docstring.
+
+        Raises:
+            ValueError: a pause tick count or player name is too large for the format.
+        """
+        for ticks in (self.goal_pause_ticks, self.match_over_ticks):
+            if not 0 <= ticks <= MAX_PAUSE_TICKS:
+                raise ValueError(f"Pause of {ticks} ticks does not fit a recording, the most is {MAX_PAUSE_TICKS}")
+        header = HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            self.seed,
+            self.ticks,
+            self.goal_pause_ticks,
+            self.match_over_ticks,
+            self.continuous_collisions,
+            self.final_fingerprint,
+        )
+        names = b""
+        for name in (self.player_one_name, self.player_two_name):
+            encoded = _encode_name(name)
+            names += NAME_LENGTH.pack(len(encoded)) + encoded
+        config = json.dumps(asdict(self.config), separators=(",", ":"), sort_keys=True).encode()
+        return header + names + CONFIG_LENGTH.pack(len(config)) + config + zlib.compress(self.inputs.tobytes(), 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """Decodes a recording written by to_bytes.
+
+        Args:
+            data (bytes): the encoded recording.
+
+        Returns:
+            Recording: the decoded recording.
+        """
+        magic, version = PREFIX.unpack_from(data)
+        if magic != MAGIC or version not in READABLE_VERSIONS:
+            raise ValueError(f"Not a version {' or '.join(map(str, READABLE_VERSIONS))} Pong recording")
+        header, name_length = (HEADER, NAME_LENGTH) if version >= 3 else (LEGACY_HEADER, struct.Struct("<B"))
+        _, _, seed, ticks, goal_pause_ticks, match_over_ticks, continuous, final = header.unpack_from(data)
+        offset = header.size
+        names = []
+        for _ in range(2):
+            (length,) = name_length.unpack_from(data, offset)
+            offset += name_length.size
+            names.append(data[offset : offset + length].decode())
+            offset += length
+        config = DEFAULT_CONFIG
+        if version >= 2:
+            (length,) = CONFIG_LENGTH.unpack_from(data, offset)
+            offset += CONFIG_LENGTH.size
+            config = GameConfig(**json.loads(data[offset : offset + length]))
+            offset += length
+        inputs = array("B", zlib.decompress(data[offset:]))
+        if len(inputs) != (ticks + 1) // 2:
+            raise ValueError(f"Recording holds {len(inputs)} input bytes for {ticks} ticks")
+        return cls(*names, seed, goal_pause_ticks, match_over_ticks, continuous, ticks, inputs, final, config)
+
+    def save(self, path: str):
+        """Writes the recording to a file.
+
+        Args:
+            path (str): file to write.
+        """
+        with open(path, "wb") as recording_file:
+            recording_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str):
+        """Reads a recording written by save.
+
+        Args:
+            path (str): file to read.
+
+        Returns:
+            Recording: the recording.
+        """
+        with open(path, "rb") as recording_file:
+            return cls.from_bytes(recording_file.read())
+
+
+class InputRecorder:
+    """Records the input bits passed to PongSimulation.update for every tick of a match."""
+
+    def __init__(self, game: PongSimulation, seed: int = 0) -> None:
+        """Input recorder init. Recording starts from the game's current state, which should be a fresh match.
+
+        Args:
+            game (PongSimulation): the match to record.
+            seed (int, optional): seed the match's controllers were reset with, stored for reproduction.
+                Defaults to 0.
+
+        Raises:
+            ValueError: a player name is too long to record.
+        """
+        for player in (game.player_one, game.player_two):
+            _encode_name(player.name)
+        self.game = game
+        self.seed = seed
+        self.inputs = array("B")
+        self.ticks = 0
+
+    def record(self, inputs: int):
+        """Appends one tick's input bits.
+
+        Args:
+            inputs (int): input bits passed to update this tick.
+        """
+        if self.ticks & 1:
+            self.inputs[-1] |= (inputs & INPUT_MASK) << 4
+        else:
+            self.inputs.append(inputs & INPUT_MASK)
+        self.ticks += 1
+
+    def finish(self) -> Recording:
+        """Returns the recording so far, fingerprinting the game's current state as its final state."""
+        game = self.game
+        return Recording(
+            game.player_one.name,
+            game.player_two.name,
+            self.seed,
+            game.goal_pause_ticks,
+            game.match_over_ticks,
+            game.continuous_collisions,
+            self.ticks,
+            array("B", self.inputs),
+            fingerprint(game),
+            game.config,
+        )
+
+
+def replay(recording: Recording, verify: bool = True) -> PongSimulation:
+    """Replays a recording headless and as fast as possible.
+
+    Args:
+        recording (Recording): the match to replay.
+        verify (bool, optional): raise ValueError if the final state differs from the recorded one. Defaults to True.
+
+    Returns:
+        PongSimulation: the match in its final state.
+    """
+    logger.info("Replaying %s ticks of %s vs %s.", recording.ticks, recording.player_one_name, recording.player_two_name)
+    game = PongSimulation(
+        recording.player_one_name,
+        recording.player_two_name,
+        goal_pause_ticks=recording.goal_pause_ticks,
+        match_over_ticks=recording.match_over_ticks,
+        continuous_collisions=recording.continuous_collisions,
+        config=recording.config,
+    )
+    update = game.update
+    for inputs in recording.iter_inputs():
+        update(inputs)
+    if verify and fingerprint(game) != recording.final_fingerprint:
+        raise ValueError("Replay diverged from the recorded match")
+    return game
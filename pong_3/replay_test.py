@@ -0,0 +1,112 @@
+import dataclasses
+import zlib
+from array import array
+
+import replay
+import pytest
+from controllers import FollowBall, RandomMoves, to_inputs
+from simulation import LEFT_DOWN, LEFT_UP, GameConfig, PongSimulation
+
+
+@pytest.fixture
+def setup():
+    left, right = FollowBall(), RandomMoves()
+    right.reset(7)
+    game = PongSimulation("Follow", "Random", goal_pause_ticks=60, match_over_ticks=300)
+    recorder = replay.InputRecorder(game, seed=7)
+    while game.player_one.score < 3:
+        inputs = to_inputs(left(game, game.paddle_left), right(game, game.paddle_right))
+        recorder.record(inputs)
+        game.update(inputs)
+    yield (game, recorder.finish())
+
+
+def test_round_trip_and_replay(setup, tmp_path):
+    game, recording = setup
+    path = tmp_path / "match.pongrp"
+    recording.save(str(path))
+    loaded = replay.Recording.load(str(path))
+    assert loaded == recording
+    assert loaded.seed == 7
+    # The compressed inputs take less than the packed half byte per tick
+    empty = dataclasses.replace(recording, ticks=0, inputs=array("B"))
+    assert path.stat().st_size - len(empty.to_bytes()) < recording.ticks // 2
+
+    replayed = replay.replay(loaded)
+    assert replayed.ticks == game.ticks
+    assert (replayed.player_one.score, replayed.player_two.score) == (game.player_one.score, game.player_two.score)
+    assert replayed.ball.x_position == game.ball.x_position
+
+
+def test_replays_under_the_recorded_config(tmp_path):
+    config = GameConfig(window_width=500, window_height=300, paddle_height=60, ball_x_velocity=7, max_score=2)
+    left, right = FollowBall(), RandomMoves()
+    right.reset(3)
+    game = PongSimulation(config=config)
+    recorder = replay.InputRecorder(game, seed=3)
+    for _ in range(2000):
+        inputs = to_inputs(left(game, game.paddle_left), right(game, game.paddle_right))
+        recorder.record(inputs)
+        game.update(inputs)
+    path = tmp_path / "match.pongrp"
+    recorder.finish().save(str(path))
+    loaded = replay.Recording.load(str(path))
+    assert loaded.config == config
+
+    replayed = replay.replay(loaded)
+    assert replayed.config == config
+    assert replayed.ball.x_position == game.ball.x_position
+
+
+def test_long_pauses_and_names_round_trip():
+    game = PongSimulation("N" * 300, "Random", goal_pause_ticks=70_000, match_over_ticks=replay.MAX_PAUSE_TICKS)
+    recorder = replay.InputRecorder(game)
+    recorder.record(LEFT_UP)
+    recording = recorder.finish()
+    assert replay.Recording.from_bytes(recording.to_bytes()) == recording
+
+    recording.match_over_ticks = replay.MAX_PAUSE_TICKS + 1
+    with pytest.raises(ValueError):
+        recording.to_bytes()
+
+
+def test_overlong_name_is_rejected_when_recording_starts():
+    replay.InputRecorder(PongSimulation("N" * replay.MAX_NAME_BYTES))
+    with pytest.raises(ValueError):
+        replay.InputRecorder(PongSimulation("\u00e9" * (replay.MAX_NAME_BYTES // 2 + 1)))
+
+
+def test_reads_version_2_recordings():
+    recording = replay.InputRecorder(PongSimulation("Left", "Right", goal_pause_ticks=60)).finish()
+    header = replay.LEGACY_HEADER.pack(replay.MAGIC, 2, 0, 0, 60, 0, False, recording.final_fingerprint)
+    config = b'{"max_score":3}'
+    data = header + b"\x04Left\x05Right" + replay.CONFIG_LENGTH.pack(len(config)) + config + zlib.compress(b"")
+    loaded = replay.Recording.from_bytes(data)
+    assert (loaded.player_one_name, loaded.player_two_name, loaded.goal_pause_ticks) == ("Left", "Right", 60)
+    assert loaded.config == GameConfig(max_score=3)
+
+
+def test_inputs_pack_two_ticks_per_byte():
+    recorder = replay.InputRecorder(PongSimulation())
+    for inputs in (1, 2, 4, 8, 15):
+        recorder.record(inputs)
+    recording = recorder.finish()
+    assert list(recording.inputs) == [0x21, 0x84, 0x0F]
+    assert list(recording.iter_inputs()) == [1, 2, 4, 8, 15]
+
+
+def test_diverging_replay_is_detected():
+    game = PongSimulation()
+    recorder = replay.InputRecorder(game)
+    for _ in range(20):
+        recorder.record(LEFT_UP)
+        game.update(LEFT_UP)
+    recording = recorder.finish()
+    recording.inputs[5] = LEFT_DOWN
+    with pytest.raises(ValueError):
+        replay.replay(recording)
+
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError):
+        replay.Recording.from_bytes(b"\0" * 64)
@@ -0,0 +1,121 @@
+"""This module contains rollback netcode for two-player remote matches.
+
+Each peer runs the whole match locally and applies its own paddle move at once. The remote paddle's move for a
+tick is predicted as the last move received from the remote peer. The state before every tick is kept in a ring
+buffer of PongSimulation.save_state tuples; when a remote move arrives that differs from what was predicted for
+its tick, the match is restored to that tick and re-simulated up to the present through PongSimulation.update
+with logging silenced. Nothing is drawn while re-simulating, so replaying many ticks fits well inside a frame.
+   """
+
+from controllers import IDLE, to_inputs
+from simulation import PongSimulation
+
+# Ticks of history kept, the furthest back a late remote move can be applied
+ROLLBACK_TICKS = 32
+
+
+class RollbackSession:
+    """Runs a match between a local and a remote player, correcting predicted remote moves as they arrive."""
+
+    def __init__(self, game: PongSimulation, local_left: bool = True, window: int = ROLLBACK_TICKS) -> None:
+        """Rollback session init.
+
+        Args:
+            game (PongSimulation): the match, in its starting state.
+            local_left (bool, optional): the local player has the left paddle. Defaults to True.
+            window (int, optional): ticks of history kept. Defaults to ROLLBACK_TICKS.
+        """
+        self.game = game
+        self.local_left = local_left
+        self.window = window
+        self.tick = 0
+        self.states = [None] * window
+        self.local_moves = [IDLE] * window
+        self.remote_moves = [IDLE] * window
+        self.confirmed = [False] * window
+        # Remote moves received for ticks not run yet
+        self.pending = {}
+        self.last_remote_move = IDLE
+        self.confirmed_tick = -1
+        self.rollbacks = 0
+        self.resimulated_ticks = 0
+
+    def _inputs(self, local_move: int, remote_move: int) -> int:
+        if self.local_left:
+            return to_inputs(local_move, remote_move)
+        return to_inputs(remote_move, local_move)
+
+    def advance(self, local_move: int):
+        """Runs the next tick with the local move and the remote move received or predicted for it.
+
+        Args:
+            local_move (int): UP, IDLE or DOWN for the local paddle.
+
+        Returns:
+            Player: the player who scored this tick, or None.
+        """
+        slot = self.tick % self.window
+        remote_move = self.pending.pop(self.tick, None)
+        self.confirmed[slot] = remote_move is not None
+        if remote_move is None:
+            remote_move = self.last_remote_move
+        else:
+            self.last_remote_move = remote_move
+            self.confirmed_tick = self.tick
+        self.states[slot] = self.game.save_state()
+        self.local_moves[slot] = local_move
+        self.remote_moves[slot] = remote_move
+        self.tick += 1
+        return self.game.update(self._inputs(local_move, remote_move))
+
+    def receive_remote(self, tick: int, move: int):
+        """Applies the remote player's move for a tick, rolling back if it was mispredicted.
+
+        Args:
+            tick (int): the tick the remote player made the move on.
+            move (int): UP, IDLE or DOWN.
+
+        Raises:
+            ValueError: the tick is older than the history kept.
+        """
+        if tick >= self.tick:
+            self.pending[tick] = move
+            return
+        if tick < self.tick - self.window:
+            raise ValueError(f"Remote move for tick {tick} is more than {self.window} ticks late")
+
+        slot = tick % self.window
+        self.confirmed[slot] = True
+        if tick > self.confirmed_tick:
+            self.confirmed_tick = tick
+            self.last_remote_move = move
+        if self.remote_moves[slot] != move:
+            self.remote_moves[slot] = move
+            self.rollback(tick)
+
+    def rollback(self, tick: int):
+        """Restores the state before a tick and re-simulates every tick since with the current move history.
+
+        Unconfirmed remote moves after the corrected tick are re-predicted from the latest confirmed move before
+        them.
+
+        Args:
+            tick (int): the first tick to re-run.
+        """
+        game = self.game
+        game.load_state(self.states[tick % self.window])
+        game.quiet = True
+        try:
+            move = self.remote_moves[tick % self.window]
+            for replayed in range(tick, self.tick):
+                slot = replayed % self.window
+                if self.confirmed[slot]:
+                    move = self.remote_moves[slot]
+                else:
+                    self.remote_moves[slot] = move
+                self.states[slot] = game.save_state()
+                game.update(self._inputs(self.local_moves[slot], move))
+        finally:
+            game.quiet = False
+        self.rollbacks += 1
+        self.resimulated_ticks += self.tick - tick
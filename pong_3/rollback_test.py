@@ -0,0 +1,67 @@
+import time
+
+import rollback
+import pytest
+from controllers import RandomMoves, to_inputs
+from simulation import PongSimulation
+
+
+@pytest.fixture
+def setup():
+    left, right = RandomMoves(), RandomMoves()
+    left.reset(1)
+    right.reset(2)
+    reference = PongSimulation()
+    moves = []
+    for _ in range(2000):
+        move_pair = (left(reference, reference.paddle_left), right(reference, reference.paddle_right))
+        moves.append(move_pair)
+        reference.update(to_inputs(*move_pair))
+    yield (moves, reference)
+
+
+def test_peers_converge_with_latency(setup):
+    moves, reference = setup
+    latency = 6
+    peer_left = rollback.RollbackSession(PongSimulation(), local_left=True)
+    peer_right = rollback.RollbackSession(PongSimulation(), local_left=False)
+    for tick, (left_move, right_move) in enumerate(moves):
+        if tick >= latency:
+            peer_left.receive_remote(tick - latency, moves[tick - latency][1])
+            peer_right.receive_remote(tick - latency, moves[tick - latency][0])
+        peer_left.advance(left_move)
+        peer_right.advance(right_move)
+    for tick in range(len(moves) - latency, len(moves)):
+        peer_left.receive_remote(tick, moves[tick][1])
+        peer_right.receive_remote(tick, moves[tick][0])
+
+    assert peer_left.rollbacks > 0 and peer_right.rollbacks > 0
+    assert peer_left.game.save_state() == peer_right.game.save_state() == reference.save_state()
+
+
+def test_early_remote_moves_are_used_without_rollback(setup):
+    moves, reference = setup
+    session = rollback.RollbackSession(PongSimulation())
+    for tick, (left_move, right_move) in enumerate(moves):
+        session.receive_remote(tick, right_move)
+        session.advance(left_move)
+    assert session.rollbacks == 0
+    assert session.game.save_state() == reference.save_state()
+
+
+def test_too_late_move_is_rejected():
+    session = rollback.RollbackSession(PongSimulation(), window=8)
+    for _ in range(20):
+        session.advance(0)
+    with pytest.raises(ValueError):
+        session.receive_remote(5, 1)
+
+
+def test_eight_tick_rollback_fits_in_a_frame():
+    session = rollback.RollbackSession(PongSimulation())
+    for _ in range(20):
+        session.advance(0)
+    start = time.perf_counter()
+    session.receive_remote(12, 1)
+    assert time.perf_counter() - start < 0.016
+    assert session.resimulated_ticks == 8
@@ -0,0 +1,394 @@
+"""This module contains an asyncio server hosting many Pong matches in one process.
+
+Clients connect over TCP and exchange length-prefixed messages. Each pair of joining clients gets a match, one per
+paddle. Instead of a blocking clock.tick loop per game, one scheduler task steps every hosted match on a shared
+fixed tick and sends each match's state to both of its players as a codec delta against the last snapshot that
+player acknowledged. A client whose socket is not keeping up skips state messages until it drains; nothing is
+lost, as every delta is relative to a snapshot the client already holds.
+   """
+
+import asyncio
+import struct
+
+from codec import SnapshotDecoder, SnapshotEncoder, dequantize, quantize
+from controllers import DOWN, IDLE, UP, to_inputs
+from simulation import DEFAULT_CONFIG, GameConfig, PongSimulation
+from logger_setup import logger
+
+# Physics ticks per second of every hosted match, and the seconds held after a goal or a won match
+TICK_RATE = 60
+GOAL_PAUSE_SECONDS = 1
+MATCH_OVER_SECONDS = 5
+
+# Bytes a client may have waiting in its socket buffer before state messages to it are skipped
+MAX_BUFFERED = 64 * 1024
+
+# Frame header: payload length and message type, followed by the payload
+HEADER = struct.Struct("<HB")
+
+# Message types. JOIN carries the player name as UTF-8 and STATE an encoded codec snapshot; the rest carry the
+# struct payloads below.
+JOIN = 1
+WELCOME = 2
+INPUT = 3
+STATE = 4
+ACK = 5
+SPECTATE = 6
+
+# WELCOME: match id and side, 0 for the left paddle and 1 for the right
+WELCOME_PAYLOAD = struct.Struct("<IB")
+
+# INPUT: the client's latest tick seen and its move, UP, IDLE or DOWN
+INPUT_PAYLOAD = struct.Struct("<Ib")
+
+# ACK: sequence number of the latest snapshot the client decoded
+ACK_PAYLOAD = struct.Struct("<I")
+
+# SPECTATE: id of the match to watch, sent instead of JOIN
+SPECTATE_PAYLOAD = struct.Struct("<I")
+
+
+def encode_message(message_type: int, payload: bytes = b"") -> bytes:
+    """Frames a message for the wire.
+
+    Args:
+        message_type (int): JOIN, WELCOME, INPUT or STATE.
+        payload (bytes, optional): message body. Defaults to b"".
+
+    Returns:
+        bytes: header and payload.
+    """
+    return HEADER.pack(len(payload), message_type) + payload
+
+
+async def read_message(reader: asyncio.StreamReader):
+    """Reads one framed message.
+
+    Args:
+        reader (asyncio.StreamReader): the connection to read.
+
+    Returns:
+        tuple: message type and payload bytes.
+
+    Raises:
+        asyncio.IncompleteReadError: the connection closed mid-message or before one started.
+    """
+    length, message_type = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return message_type, await reader.readexactly(length)
+
+
+class HostedMatch:
+    """A match on the server with the latest move and connection of each side."""
+
+    def __init__(
+        self, match_id: int, player_one_name: str, tick_rate: int, config: GameConfig = DEFAULT_CONFIG
+    ) -> None:
+        """Hosted match init.
+
+        Args:
+            match_id (int): id sent to both clients.
+            player_one_name (str): name of the left player, who joined first.
+            tick_rate (int): ticks per second, used to size the goal and match over pauses.
+            config (GameConfig, optional): gameplay settings. Defaults to DEFAULT_CONFIG.
+        """
+        self.match_id = match_id
+        self.game = PongSimulation(
+            player_one_name,
+            "Waiting",
+            goal_pause_ticks=round(GOAL_PAUSE_SECONDS * tick_rate),
+            match_over_ticks=round(MATCH_OVER_SECONDS * tick_rate),
+            config=config,
+        )
+        self.moves = [IDLE, IDLE]
+        self.writers = [None, None]
+        self.encoders = [SnapshotEncoder(), SnapshotEncoder()]
+        # SpectatorFeed, created when the first spectator arrives
+        self.feed = None
+
+
+class PongServer:
+    """Hosts matches for TCP clients and steps all of them from one scheduler task."""
+
+    def __init__(
+        self, tick_rate: int = TICK_RATE, broadcast_every: int = 1, config: GameConfig = DEFAULT_CONFIG
+    ) -> None:
+        """Pong server init.
+
+        Args:
+            tick_rate (int, optional): physics ticks per second of every match. Defaults to TICK_RATE.
+            broadcast_every (int, optional): send state every this many ticks. Defaults to 1.
+            config (GameConfig, optional): gameplay settings of every match. Defaults to DEFAULT_CONFIG.
+        """
+        self.tick_rate = tick_rate
+        self.config = config
+        self.broadcast_every = broadcast_every
+        self.matches = {}
+        self.waiting = None
+        self.next_match_id = 0
+        self.ticks = 0
+        self.skipped_states = 0
+        self.scheduler = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        """Starts accepting clients and the tick scheduler.
+
+        Args:
+            host (str, optional): address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): port to listen on. Defaults to 0, any free port.
+
+        Returns:
+            asyncio.Server: the listening server, whose sockets give the bound port.
+        """
+        server = await asyncio.start_server(self.handle_client, host, port)
+        self.scheduler = asyncio.create_task(self.run_scheduler())
+        logger.info("Serving Pong on %s.", ", ".join(str(sock.getsockname()) for sock in server.sockets))
+        return server
+
+    def stop(self):
+        """Stops the tick scheduler."""
+        if self.scheduler is not None:
+            self.scheduler.cancel()
+            self.scheduler = None
+
+    def join(self, name: str, writer):
+        """Seats a client in the waiting match, or opens a new match for it.
+
+        Args:
+            name (str): the player's name.
+            writer (asyncio.StreamWriter): the client's connection.
+
+        Returns:
+            tuple: the HostedMatch and the side the client plays, 0 for left and 1 for right.
+        """
+        if self.waiting is None:
+            match = HostedMatch(self.next_match_id, name, self.tick_rate, self.config)
+            self.next_match_id += 1
+            match.writers[0] = writer
+            self.waiting = match
+            return match, 0
+
+        match = self.waiting
+        match.game.player_two.name = name
+        match.writers[1] = writer
+        self.matches[match.match_id] = match
+        self.waiting = None
+        logger.info("Match %s started: %s vs %s.", match.match_id, match.game.player_one.name, name)
+        return match, 1
+
+    def leave(self, match: HostedMatch, side: int):
+        """Removes a disconnected client, ending its match.
+
+        Args:
+            match (HostedMatch): the client's match.
+            side (int): the side the client played.
+        """
+        match.writers[side] = None
+        if self.waiting is match:
+            self.waiting = None
+        if self.matches.pop(match.match_id, None) is not None:
+            logger.info("Match %s ended by a disconnect.", match.match_id)
+            other = match.writers[1 - side]
+            if other is not None:
+                other.close()
+            if match.feed is not None:
+                for subscriber in match.feed.subscribers:
+                    subscriber.writer.close()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serves one client: JOIN, then INPUT and ACK messages until it disconnects, or SPECTATE.
+
+        Args:
+            reader (asyncio.StreamReader): the client's incoming stream.
+            writer (asyncio.StreamWriter): the client's outgoing stream.
+        """
+        match = None
+        try:
+            message_type, payload = await read_message(reader)
+            if message_type == SPECTATE:
+                await self.serve_spectator(SPECTATE_PAYLOAD.unpack(payload)[0], reader, writer)
+                return
+            if message_type != JOIN:
+                return
+            match, side = self.join(payload.decode(), writer)
+            writer.write(encode_message(WELCOME, WELCOME_PAYLOAD.pack(match.match_id, side)))
+            while True:
+                message_type, payload = await read_message(reader)
+                if message_type == INPUT:
+                    _, move = INPUT_PAYLOAD.unpack(payload)
+                    if move in (UP, IDLE, DOWN):
+                        match.moves[side] = move
+                elif message_type == ACK:
+                    (sequence,) = ACK_PAYLOAD.unpack(payload)
+                    match.encoders[side].ack(sequence)
+        except (asyncio.IncompleteReadError, ConnectionError, UnicodeDecodeError, struct.error):
+            pass
+        finally:
+            if match is not None:
+                self.leave(match, side)
+            writer.close()
+
+    async def serve_spectator(self, match_id: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Streams a match to a spectator until either disconnects.
+
+        Args:
+            match_id (int): the match to watch.
+            reader (asyncio.StreamReader): the spectator's incoming stream, read only to notice disconnection.
+            writer (asyncio.StreamWriter): the spectator's outgoing stream.
+        """
+        from spectator import SpectatorFeed, StreamSubscriber
+
+        match = self.matches.get(match_id)
+        if match is None:
+            return
+        if match.feed is None:
+            match.feed = SpectatorFeed()
+        subscriber = match.feed.subscribe(StreamSubscriber(writer))
+        try:
+            while await reader.read(1024):
+                pass
+        finally:
+            match.feed.unsubscribe(subscriber)
+
+    def tick(self):
+        """Steps every running match once and sends out their state when a broadcast is due."""
+        self.ticks += 1
+        broadcast = self.ticks % self.broadcast_every == 0
+        for match in self.matches.values():
+            game = match.game
+            game.update(to_inputs(match.moves[0], match.moves[1]))
+            if broadcast:
+                # Players who acknowledged the same snapshot share one encoding
+                snapshot = quantize(game, self.ticks)
+                encodings = {}
+                for writer, encoder in zip(match.writers, match.encoders):
+                    if writer is None:
+                        continue
+                    if writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+                        self.skipped_states += 1
+                    else:
+                        writer.write(encode_message(STATE, encoder.encode(snapshot, encodings)))
+                if match.feed is not None:
+                    match.feed.publish(game, self.ticks)
+
+    async def run_scheduler(self):
+        """Runs tick at tick_rate on a fixed schedule, catching up on late ticks without drifting."""
+        loop = asyncio.get_running_loop()
+        tick_time = 1 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            self.tick()
+            next_tick += tick_time
+            delay = next_tick - loop.time()
+            if delay < -tick_time * self.tick_rate:
+                # Over a second behind: drop the backlog instead of running a burst of ticks
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(max(delay, 0))
+
+
+class PongClient:
+    """Minimal client for the server protocol, used by bots and tests."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Pong client init; use connect to create one.
+
+        Args:
+            reader (asyncio.StreamReader): the connection's incoming stream.
+            writer (asyncio.StreamWriter): the connection's outgoing stream.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.match_id = None
+        self.side = None
+        self.tick = 0
+        self.decoder = SnapshotDecoder()
+        self.spectating = False
+
+    @classmethod
+    async def connect(cls, host: str, port: int, name: str):
+        """Connects and joins a match.
+
+        Args:
+            host (str): server address.
+            port (int): server port.
+            name (str): player name.
+
+        Returns:
+            PongClient: the joined client.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        client = cls(reader, writer)
+        writer.write(encode_message(JOIN, name.encode()))
+        message_type, payload = await read_message(reader)
+        if message_type != WELCOME:
+            raise ConnectionError(f"Expected WELCOME, got message type {message_type}")
+        client.match_id, client.side = WELCOME_PAYLOAD.unpack(payload)
+        return client
+
+    @classmethod
+    async def watch(cls, host: str, port: int, match_id: int):
+        """Connects as a spectator of a running match.
+
+        Args:
+            host (str): server address.
+            port (int): server port.
+            match_id (int): the match to watch.
+
+        Returns:
+            PongClient: the spectating client; use receive_state to follow the match.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        client = cls(reader, writer)
+        client.match_id = match_id
+        client.spectating = True
+        writer.write(encode_message(SPECTATE, SPECTATE_PAYLOAD.pack(match_id)))
+        return client
+
+    def send_move(self, move: int):
+        """Sends the paddle move to hold from now on.
+
+        Args:
+            move (int): UP, IDLE or DOWN.
+        """
+        self.writer.write(encode_message(INPUT, INPUT_PAYLOAD.pack(self.tick, move)))
+
+    async def receive_state(self) -> tuple:
+        """Waits for the next state message and, when playing, acknowledges it.
+
+        Returns:
+            tuple: server tick, ball x, ball y, ball x velocity, ball y velocity, left paddle y, right paddle y,
+                player one score and player two score.
+        """
+        while True:
+            message_type, payload = await read_message(self.reader)
+            if message_type == STATE:
+                snapshot = self.decoder.decode(payload)
+                self.tick = snapshot[0]
+                if not self.spectating:
+                    self.writer.write(encode_message(ACK, ACK_PAYLOAD.pack(self.tick)))
+                return dequantize(snapshot)
+
+    async def close(self):
+        """Disconnects."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve(
+    host: str = "127.0.0.1", port: int = 0, tick_rate: int = TICK_RATE, config: GameConfig = DEFAULT_CONFIG
+):
+    """Runs a server until cancelled.
+
+    Args:
+        host (str, optional): address to listen on. Defaults to "127.0.0.1".
+        port (int, optional): port to listen on. Defaults to 0, any free port.
+        tick_rate (int, optional): physics ticks per second. Defaults to TICK_RATE.
+        config (GameConfig, optional): gameplay settings of every match. Defaults to DEFAULT_CONFIG.
+    """
+    pong_server = PongServer(tick_rate, config=config)
+    server = await pong_server.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        pong_server.stop()
@@ -0,0 +1,58 @@
+import asyncio
+
+import server
+from controllers import DOWN, UP
+
+
+def test_loopback_match():
+    async def play():
+        pong_server = server.PongServer(tick_rate=240)
+        listener = await pong_server.start()
+        port = listener.sockets[0].getsockname()[1]
+        left = await server.PongClient.connect("127.0.0.1", port, "Left")
+        right = await server.PongClient.connect("127.0.0.1", port, "Right")
+        assert (left.match_id, left.side) == (right.match_id, 0)
+        assert right.side == 1
+
+        first = await left.receive_state()
+        left.send_move(UP)
+        right.send_move(DOWN)
+        for _ in range(30):
+            state = await left.receive_state()
+        assert state[0] > first[0]
+        assert state[5] < first[5] and state[6] > first[6]
+        assert (await right.receive_state())[0] > 0
+        assert pong_server.matches[left.match_id].encoders[0].base is not None
+        assert pong_server.matches[left.match_id].game.player_two.name == "Right"
+
+        await left.close()
+        await asyncio.sleep(0.05)
+        assert not pong_server.matches
+        pong_server.stop()
+        listener.close()
+        await listener.wait_closed()
+
+    asyncio.run(asyncio.wait_for(play(), 10))
+
+
+def test_tick_encodes_state_once_per_match():
+    pong_server = server.PongServer()
+    sent = []
+
+    class Transport:
+        def get_write_buffer_size(self):
+            return 0
+
+    class Writer:
+        transport = Transport()
+
+        def write(self, data):
+            sent.append(data)
+
+    for name in ("a", "b", "c", "d"):
+        pong_server.join(name, Writer())
+    pong_server.tick()
+    assert len(pong_server.matches) == 2
+    assert len(sent) == 4
+    assert sent[0] == sent[1] and sent[2] == sent[3]
+    assert server.HEADER.unpack_from(sent[0]) == (len(sent[0]) - server.HEADER.size, server.STATE)
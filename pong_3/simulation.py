@@ -0,0 +1,566 @@
+"""This module contains the display-free simulation core of the Pong video game.
+
+Nothing in here imports pygame, so matches can be stepped headless and uncapped. The pygame front-end lives
+in pong.py and drives this core one step per physics tick.
+   """
+
+import json
+from dataclasses import dataclass, fields
+from enum import Enum
+from logger_setup import logger
+
+# Defining window size
+WINDOW_WIDTH = 600
+WINDOW_HEIGHT = 400
+logger.info("Window set to width: %s, and height: %s", WINDOW_WIDTH, WINDOW_HEIGHT)
+
+# Defining colour tuples in RGB
+# TODO - refactor colours to ENUM
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+
+# Paddle size
+PADDLE_HEIGHT = 100
+PADDLE_WIDTH = 20
+
+# Pixels a paddle moves per tick while its key is held
+PADDLE_SPEED = 5
+
+# Ball radius, and its serve and maximum return speeds in pixels per tick
+BALL_RADIUS = 5
+BALL_X_VELOCITY = 5
+BALL_MAX_VELOCITY = 5
+
+# Score to reach
+MAX_SCORE = 5
+
+# Most wall and paddle bounces resolved in one swept ball move
+MAX_BOUNCES_PER_TICK = 8
+
+# Input bits, one per paddle direction. A tick's input is these OR-ed together.
+NO_INPUT = 0
+LEFT_UP = 1
+LEFT_DOWN = 2
+RIGHT_UP = 4
+RIGHT_DOWN = 8
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """Gameplay settings of one match. The defaults are the module constants."""
+
+    window_width: int = WINDOW_WIDTH
+    window_height: int = WINDOW_HEIGHT
+    paddle_width: int = PADDLE_WIDTH
+    paddle_height: int = PADDLE_HEIGHT
+    paddle_velocity: int = PADDLE_SPEED
+    ball_radius: int = BALL_RADIUS
+    ball_x_velocity: float = BALL_X_VELOCITY
+    ball_max_velocity: float = BALL_MAX_VELOCITY
+    max_score: int = MAX_SCORE
+
+    @classmethod
+    def load(cls, path: str):
+        """Reads a config file: a JSON object of the settings to change from their defaults.
+
+        Args:
+            path (str): the config file.
+
+        Returns:
+            GameConfig: the settings.
+
+        Raises:
+            ValueError: the file names a setting that does not exist.
+        """
+        with open(path) as config_file:
+            settings = json.load(config_file)
+        unknown = set(settings) - {field.name for field in fields(cls)}
+        if unknown:
+            raise ValueError(f"{path} has unknown settings: {', '.join(sorted(unknown))}")
+        return cls(**settings)
+
+
+DEFAULT_CONFIG = GameConfig()
+
+
+class GameState(Enum):
+    """Phases of a match, advanced by PongSimulation.update one tick at a time."""
+
+    PLAYING = "playing"
+    GOAL_PAUSE = "goal_pause"
+    MATCH_OVER = "match_over"
+    RESETTING = "resetting"
+
+
+# TODO - add __str__ support
+class Paddle:
+    """Paddle class used to create paddles for the pong game."""
+
+    __slots__ = ("x_position", "y_position", "y_position_original", "width", "height", "colour", "paddle_velocity")
+
+    def __init__(self, x_position, y_position, width, height, colour=WHITE, paddle_velocity=4) -> None:
+        """Paddle class init.
+
+        Args:
+            x_position (int): current x position
+            y_position (int): current y position
+            width (int): width in pixels
+            height (int): height in pixels
+            colour (tuple, optional): paddle fill colour
+            paddle_velocity (int, optional): paddle velocity. Defaults to 4.
+        """
+        self.x_position = x_position
+        self.y_position = self.y_position_original = y_position
+        self.width = width
+        self.height = height
+        self.colour = colour
+        self.paddle_velocity = paddle_velocity
+
+    def move(self, up=True):
+        """Changes the paddle's xy positions.
+
+        Args:
+            up (bool): Signals whether to add or remove the y velocity. Defaults to True.
+        """
+        if up:
+            self.y_position += self.paddle_velocity
+        else:
+            self.y_position -= self.paddle_velocity
+
+
+# TODO - add __str__ support
+class Ball:
+    """Ball class used to create a ball for the ball game."""
+
+    __slots__ = (
+        "x_position",
+        "y_position",
+        "x_position_original",
+        "y_position_original",
+        "radius",
+        "x_velocity",
+        "y_velocity",
+        "max_velocity",
+        "colour",
+    )
+
+    def __init__(
+        self,
+        x_position: int,
+        y_position: int,
+        radius: int,
+        x_velocity: int = 5,
+        y_velocity: int = 0,
+        colour: tuple = WHITE,
+        max_velocity: int = 5,
+    ) -> None:
+        """Ball class init.
+
+        Args:
+            x_position (int): current x position.
+            y_position (int): current y position.
+            radius (int): ball radius in pixels.
+            x_velocity (int, optional): x velocity. Defaults to 5.
+            y_velocity (int, optional): y velocity. Defaults to 0.
+            colour (tuple, optional): ball colour fill. Defaults to WHITE.
+            max_velocity (int, optional): max potential velocity. Defaults to 5.
+        """
+        self.x_position = self.x_position_original = x_position
+        self.y_position = self.y_position_original = y_position
+        self.radius = radius
+        self.x_velocity = x_velocity
+        self.y_velocity = y_velocity
+        self.max_velocity = max_velocity
+        self.colour = colour
+
+
+# TODO - add __str__ support
+@dataclass(slots=True)
+class Player:
+    """Example Player class"""
+
+    name: str
+    score: int = 0
+
+
+class PongSimulation:
+    """Pong game rules and state, advanced one tick at a time without a display."""
+
+    def __init__(
+        self,
+        player_one_name: str = "Player 1",
+        player_two_name: str = "Player 2",
+        goal_pause_ticks: int = 0,
+        match_over_ticks: int = 0,
+        continuous_collisions: bool = False,
+        config: GameConfig = DEFAULT_CONFIG,
+    ) -> None:
+        """Pong simulation init.
+
+        Args:
+            player_one_name (str, optional): Player one's name. Defaults to "Player 1".
+            player_two_name (str, optional): Player two's name. Defaults to "Player 2".
+            goal_pause_ticks (int, optional): ticks to hold play after a goal. Defaults to 0, no pause.
+            match_over_ticks (int, optional): ticks to hold the result after a match is won. Defaults to 0, no pause.
+            continuous_collisions (bool, optional): move the ball with sweep_ball instead of move_ball and
+                handle_paddle_collision. Defaults to False.
+            config (GameConfig, optional): window, paddle, ball and scoring settings. Defaults to DEFAULT_CONFIG.
+        """
+        logger.info("Initializing Pong simulation.")
+        self.config = config
+        self.paddle_left = Paddle(
+            x_position=10,
+            y_position=config.window_height // 2 - config.paddle_height // 2,
+            width=config.paddle_width,
+            height=config.paddle_height,
+            colour=WHITE,
+            paddle_velocity=config.paddle_velocity,
+        )
+        self.paddle_right = Paddle(
+            x_position=config.window_width - config.paddle_width - 10,
+            y_position=config.window_height // 2 - config.paddle_height // 2,
+            width=config.paddle_width,
+            height=config.paddle_height,
+            colour=WHITE,
+            paddle_velocity=config.paddle_velocity,
+        )
+        self.ball = Ball(
+            x_position=config.window_width // 2,
+            y_position=config.window_height // 2,
+            radius=config.ball_radius,
+            x_velocity=config.ball_x_velocity,
+            y_velocity=0,
+            colour=WHITE,
+            max_velocity=config.ball_max_velocity,
+        )
+
+        self.player_one = Player(player_one_name, 0)
+        self.player_two = Player(player_two_name, 0)
+        self.ticks = 0
+
+        self.goal_pause_ticks = goal_pause_ticks
+        self.match_over_ticks = match_over_ticks
+        self.state = GameState.PLAYING
+        self.state_ticks = 0
+        # Result of the latest finished match, kept after RESETTING clears the scores
+        self.matches_played = 0
+        self.last_winner = None
+        self.last_scores = None
+        self.continuous_collisions = continuous_collisions
+        # Set while re-simulating ticks that already ran, so goals and resets are not logged twice
+        self.quiet = False
+
+    def move_paddle(self, inputs: int):
+        """Handles paddle movement
+
+        Args:
+            inputs (int): Input bits (LEFT_UP, LEFT_DOWN, RIGHT_UP, RIGHT_DOWN) held this tick.
+        """
+        height = self.config.window_height
+        if inputs & LEFT_UP and self.paddle_left.y_position >= 0:
+            self.paddle_left.y_position -= self.paddle_left.paddle_velocity
+        if inputs & LEFT_DOWN and self.paddle_left.y_position <= height - self.paddle_left.height:
+            self.paddle_left.y_position += self.paddle_left.paddle_velocity
+
+        if inputs & RIGHT_UP and self.paddle_right.y_position >= 0:
+            self.paddle_right.y_position -= self.paddle_right.paddle_velocity
+        if inputs & RIGHT_DOWN and self.paddle_right.y_position <= height - self.paddle_right.height:
+            self.paddle_right.y_position += self.paddle_right.paddle_velocity
+
+    def move_ball(self):
+        """Handles changes in ball velocity"""
+        self.ball.x_position += self.ball.x_velocity
+        self.ball.y_position += self.ball.y_velocity
+
+    def get_paddles(self):
+        """Returns the left and right paddles.
+
+        Returns:
+            list: [left paddle, right paddle]
+        """
+        return [self.paddle_left, self.paddle_right]
+
+    def get_ball(self):
+        """Returns the ball.
+
+        Returns:
+            Ball: the ball in play
+        """
+        return self.ball
+
+    def calculate_return_y_velocity(self, paddle: Paddle, ball: Ball) -> int:
+        """Helper function to calculate y velocity after paddle collision
+
+        Args:
+            paddle (Paddle): paddle the ball hit
+            ball (Ball): the ball
+
+        Returns:
+            int: calculated y velocity
+        """
+        displacement_from_paddle = ball.y_position - (paddle.y_position + (paddle.height // 2))
+        reduction = (paddle.height // 2) / ball.max_velocity
+        y_velocity = displacement_from_paddle / reduction
+        return y_velocity
+
+    # TODO - change to handle ball collision or separate paddle and ceiling collisions.
+    # TODO - refactor so that ball and paddle collisions happen at paddle borders instead of before/after paddle edges
+    def handle_paddle_collision(self):
+        """Handles ball collisions."""
+        height = self.config.window_height
+        if self.ball.y_position <= 0 + self.ball.radius or self.ball.y_position >= height - self.ball.radius:
+            self.ball.y_velocity *= -1
+
+        if (
+            self.ball.y_position >= self.paddle_left.y_position
+            and self.ball.y_position <= self.paddle_left.y_position + self.paddle_left.height
+        ):
+            if self.ball.x_position - self.ball.radius <= self.paddle_left.x_position + self.paddle_left.width:
+                self.ball.x_velocity *= -1
+                self.ball.y_velocity = self.calculate_return_y_velocity(self.paddle_left, self.ball)
+
+        if (
+            self.ball.y_position >= self.paddle_right.y_position
+            and self.ball.y_position <= self.paddle_right.y_position + self.paddle_right.height
+        ):
+            if self.ball.x_position + self.ball.radius >= self.paddle_right.x_position:
+                self.ball.x_velocity *= -1
+                self.ball.y_velocity = self.calculate_return_y_velocity(self.paddle_right, self.ball)
+
+    def sweep_ball(self, dt: float = 1.0):
+        """Moves the ball for dt ticks, bouncing at the exact time it reaches a wall or paddle face.
+
+        Unlike move_ball followed by handle_paddle_collision, a fast ball cannot pass through a paddle, the ball
+        only bounces off surfaces it is moving towards, and several bounces are resolved within one call. Paddles
+        are treated as stationary for the duration of the sweep.
+
+        Args:
+            dt (float, optional): time to advance in ticks. Defaults to 1.0.
+        """
+        ball, left, right = self.ball, self.paddle_left, self.paddle_right
+        radius = ball.radius
+        height = self.config.window_height
+        remaining = dt
+        for _ in range(MAX_BOUNCES_PER_TICK):
+            time_of_impact = remaining
+            hit_wall = False
+            hit_paddle = None
+
+            if ball.y_velocity < 0:
+                time_to_wall = max((radius - ball.y_position) / ball.y_velocity, 0.0)
+            elif ball.y_velocity > 0:
+                time_to_wall = max((height - radius - ball.y_position) / ball.y_velocity, 0.0)
+            else:
+                time_to_wall = None
+            if time_to_wall is not None and time_to_wall < time_of_impact:
+                time_of_impact, hit_wall = time_to_wall, True
+
+            # A paddle face is the plane the ball centre reaches one radius in front of the paddle
+            paddle = time_to_face = None
+            if ball.x_velocity < 0 and ball.x_position >= left.x_position + left.width + radius:
+                paddle = left
+                time_to_face = (left.x_position + left.width + radius - ball.x_position) / ball.x_velocity
+            elif ball.x_velocity > 0 and ball.x_position <= right.x_position - radius:
+                paddle = right
+                time_to_face = (right.x_position - radius - ball.x_position) / ball.x_velocity
+            if time_to_face is not None and time_to_face <= time_of_impact:
+                y_at_face = ball.y_position + ball.y_velocity * time_to_face
+                if paddle.y_position <= y_at_face <= paddle.y_position + paddle.height:
+                    time_of_impact, hit_wall, hit_paddle = time_to_face, False, paddle
+
+            ball.x_position += ball.x_velocity * time_of_impact
+            ball.y_position += ball.y_velocity * time_of_impact
+            remaining -= time_of_impact
+            if hit_wall:
+                ball.y_velocity *= -1
+            elif hit_paddle is not None:
+                ball.x_velocity *= -1
+                ball.y_velocity = self.calculate_return_y_velocity(hit_paddle, ball)
+            else:
+                return
+
+        # Out of bounces for this call; finish the move without further collisions
+        ball.x_position += ball.x_velocity * remaining
+        ball.y_position += ball.y_velocity * remaining
+
+    def reset(self):
+        """Resets the paddle and ball positions as well as ball y_velocity. Ball x_velocity is not impacted."""
+        if not self.quiet:
+            logger.info("Resetting ball and paddles to original positions.")
+        self.ball.x_position = self.ball.x_position_original
+        self.ball.y_position = self.ball.y_position_original
+        self.ball.y_velocity = 0
+
+        self.paddle_left.y_position = self.paddle_left.y_position_original
+
+        self.paddle_right.y_position = self.paddle_right.y_position_original
+
+    def goal(self):
+        """Handles a goal outcome
+
+        Returns:
+            Player: the player who scored this tick, or None.
+        """
+        if self.ball.x_position < 0:
+            self.player_two.score += 1
+            if not self.quiet:
+                logger.info(
+                    "Player: %s, has scored. Total score is now: %s", self.player_two.name, self.player_two.score
+                )
+            self.reset()
+            return self.player_two
+
+        elif self.ball.x_position > self.config.window_width:
+            self.player_one.score += 1
+            if not self.quiet:
+                logger.info(
+                    "Player: %s, has scored. Total score is now: %s", self.player_one.name, self.player_one.score
+                )
+            self.reset()
+            return self.player_one
+
+        return None
+
+    def get_winner(self):
+        """Returns the player who has reached the config's max_score.
+
+        Returns:
+            Player: the winning player, or None while the match is still running.
+        """
+        max_score = self.config.max_score
+        if self.player_one.score >= max_score:
+            return self.player_one
+        if self.player_two.score >= max_score:
+            return self.player_two
+        return None
+
+    def reset_scores(self):
+        """Resets both player scores ready for the next match."""
+        if not self.quiet:
+            logger.info("Resetting player scores.")
+        self.player_one.score = 0
+        self.player_two.score = 0
+
+    def step(self, inputs: int = NO_INPUT):
+        """Advances the simulation by one tick.
+
+        Args:
+            inputs (int, optional): Input bits held this tick. Defaults to NO_INPUT.
+
+        Returns:
+            Player: the player who scored this tick, or None.
+        """
+        self.ticks += 1
+        self.move_paddle(inputs)
+        if self.continuous_collisions:
+            self.sweep_ball()
+        else:
+            self.move_ball()
+            self.handle_paddle_collision()
+        return self.goal()
+
+    def update(self, inputs: int = NO_INPUT):
+        """Advances the match state machine by one tick.
+
+        While PLAYING this runs step(). A goal moves to GOAL_PAUSE, or to MATCH_OVER when it wins the match, and
+        each pause lasts its configured number of ticks before play resumes; RESETTING clears the scores for the next
+        match. Pauses of zero ticks are skipped within the same update, so headless runs never idle. A won match is
+        counted in matches_played and its winner and final scores kept in last_winner and last_scores, which
+        outlast the reset.
+
+        Args:
+            inputs (int, optional): Input bits held this tick. Defaults to NO_INPUT.
+
+        Returns:
+            Player: the player who scored this tick, or None.
+        """
+        if self.state == GameState.PLAYING:
+            scorer = self.step(inputs)
+            if scorer is not None:
+                winner = self.get_winner()
+                if winner is not None:
+                    if not self.quiet:
+                        logger.info("Player: %s, has own the game.", winner.name)
+                    self.matches_played += 1
+                    self.last_winner = winner
+                    self.last_scores = (self.player_one.score, self.player_two.score)
+                    self.set_state(GameState.MATCH_OVER)
+                else:
+                    self.set_state(GameState.GOAL_PAUSE)
+            return scorer
+
+        self.state_ticks += 1
+        if self.state == GameState.GOAL_PAUSE and self.state_ticks >= self.goal_pause_ticks:
+            self.set_state(GameState.PLAYING)
+        elif self.state == GameState.MATCH_OVER and self.state_ticks >= self.match_over_ticks:
+            self.set_state(GameState.RESETTING)
+        elif self.state == GameState.RESETTING:
+            self.set_state(GameState.PLAYING)
+        return None
+
+    def save_state(self) -> tuple:
+        """Captures everything update changes, for restoring with load_state.
+
+        Returns:
+            tuple: ball position and velocity, paddle ys, scores, ticks, state, state_ticks and the latest match
+                result.
+        """
+        ball = self.ball
+        return (
+            ball.x_position,
+            ball.y_position,
+            ball.x_velocity,
+            ball.y_velocity,
+            self.paddle_left.y_position,
+            self.paddle_right.y_position,
+            self.player_one.score,
+            self.player_two.score,
+            self.ticks,
+            self.state,
+            self.state_ticks,
+            self.matches_played,
+            self.last_winner,
+            self.last_scores,
+        )
+
+    def load_state(self, saved: tuple):
+        """Returns the match to a save_state result.
+
+        Args:
+            saved (tuple): the captured state.
+        """
+        ball = self.ball
+        (
+            ball.x_position,
+            ball.y_position,
+            ball.x_velocity,
+            ball.y_velocity,
+            self.paddle_left.y_position,
+            self.paddle_right.y_position,
+            self.player_one.score,
+            self.player_two.score,
+            self.ticks,
+            self.state,
+            self.state_ticks,
+            self.matches_played,
+            self.last_winner,
+            self.last_scores,
+        ) = saved
+
+    def set_state(self, state: GameState):
+        """Enters a state, falling straight through pauses configured to last zero ticks.
+
+        Args:
+            state (GameState): the state to enter.
+        """
+        if state == GameState.GOAL_PAUSE and self.goal_pause_ticks <= 0:
+            state = GameState.PLAYING
+        if state == GameState.MATCH_OVER and self.match_over_ticks <= 0:
+            state = GameState.RESETTING
+        if state == GameState.RESETTING:
+            self.reset_scores()
+            self.reset()
+            if self.match_over_ticks <= 0:
+                state = GameState.PLAYING
+        self.state = state
+        self.state_ticks = 0
@@ -0,0 +1,146 @@
+import os
+import subprocess
+import sys
+
+import simulation
+import pytest
+
+
+@pytest.fixture
+def setup():
+    game = simulation.PongSimulation()
+    left_paddle, right_paddle = game.get_paddles()
+    ball = game.get_ball()
+    yield (game, left_paddle, right_paddle, ball)
+
+
+def test_import_does_not_load_pygame(tmp_path):
+    code = "import sys, simulation; assert 'pygame' not in sys.modules"
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(simulation.__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
+
+
+def test_step_moves_ball_and_paddles(setup):
+    game, left_paddle, right_paddle, ball = setup
+    game.step(simulation.LEFT_UP | simulation.RIGHT_DOWN)
+    assert ball.x_position == ball.x_position_original + ball.x_velocity
+    assert left_paddle.y_position == left_paddle.y_position_original - simulation.PADDLE_SPEED
+    assert right_paddle.y_position == right_paddle.y_position_original + simulation.PADDLE_SPEED
+    assert game.ticks == 1
+
+
+def test_step_reports_goal(setup):
+    game, left_paddle, right_paddle, ball = setup
+    left_paddle.y_position = 0
+    right_paddle.y_position = 0
+    ball.y_position = simulation.WINDOW_HEIGHT - 50
+    scorer = None
+    while scorer is None:
+        scorer = game.step()
+    assert scorer is game.player_one
+    assert game.player_one.score == 1
+    assert ball.x_position == ball.x_position_original
+
+
+def score_goal(game):
+    game.ball.x_position = simulation.WINDOW_WIDTH
+    game.ball.y_position = simulation.WINDOW_HEIGHT - 10
+    return game.update()
+
+
+def test_state_machine_pauses_after_goal_and_match():
+    game = simulation.PongSimulation(goal_pause_ticks=3, match_over_ticks=5)
+    assert score_goal(game) is game.player_one
+    assert game.state == simulation.GameState.GOAL_PAUSE
+    ball_x = game.ball.x_position
+    for _ in range(3):
+        game.update()
+    assert game.ball.x_position == ball_x
+    assert game.state == simulation.GameState.PLAYING
+
+    game.player_one.score = simulation.MAX_SCORE - 1
+    score_goal(game)
+    assert game.state == simulation.GameState.MATCH_OVER
+    assert game.get_winner() is game.player_one
+    for _ in range(5):
+        game.update()
+    assert game.state == simulation.GameState.RESETTING
+    assert game.player_one.score == 0
+    game.update()
+    assert game.state == simulation.GameState.PLAYING
+
+
+def test_headless_state_machine_skips_pauses(setup):
+    game, left_paddle, right_paddle, ball = setup
+    game.player_one.score = simulation.MAX_SCORE - 1
+    score_goal(game)
+    assert game.state == simulation.GameState.PLAYING
+    assert (game.player_one.score, game.player_two.score) == (0, 0)
+    assert game.matches_played == 1
+    assert game.last_winner is game.player_one
+    assert game.last_scores == (simulation.MAX_SCORE, 0)
+
+
+def test_swept_collision_stops_tunneling():
+    game = simulation.PongSimulation(continuous_collisions=True)
+    ball, left_paddle = game.ball, game.paddle_left
+    ball.x_velocity = -110
+    face = left_paddle.x_position + left_paddle.width + ball.radius
+    for _ in range(3):
+        assert game.step() is None
+    # 300 -> 190 -> 80 -> hits the face at 35 and travels the remaining 45 back out
+    assert ball.x_velocity == 110
+    assert ball.x_position == pytest.approx(face + (face - (300 - 330)))
+
+
+def test_swept_collision_bounces_several_times_per_tick():
+    game = simulation.PongSimulation(continuous_collisions=True)
+    ball = game.ball
+    ball.x_velocity = 0
+    ball.y_velocity = 2 * (simulation.WINDOW_HEIGHT - 2 * ball.radius) + 10
+    game.sweep_ball()
+    assert ball.y_velocity > 0
+    assert ball.y_position == pytest.approx(ball.y_position_original + 10)
+
+
+def test_swept_collision_never_sticks_inside_paddle():
+    game = simulation.PongSimulation(continuous_collisions=True)
+    ball, left_paddle = game.ball, game.paddle_left
+    ball.x_position = left_paddle.x_position + left_paddle.width
+    ball.x_velocity = 1
+    for _ in range(5):
+        game.step()
+    assert ball.x_velocity == 1
+
+
+def test_config_sets_geometry_speeds_and_max_score(tmp_path):
+    config = simulation.GameConfig(
+        window_width=300,
+        window_height=200,
+        paddle_height=40,
+        paddle_velocity=3,
+        ball_x_velocity=7,
+        ball_max_velocity=9,
+        max_score=2,
+    )
+    game = simulation.PongSimulation(config=config)
+    assert game.paddle_right.x_position == 300 - simulation.PADDLE_WIDTH - 10
+    assert game.paddle_left.y_position_original == 100 - 20
+    assert (game.ball.x_position, game.ball.y_position) == (150, 100)
+    assert (game.ball.x_velocity, game.ball.max_velocity) == (7, 9)
+
+    game.step(simulation.LEFT_UP)
+    assert game.paddle_left.y_position == game.paddle_left.y_position_original - 3
+    game.player_one.score = 1
+    game.ball.x_position = 299
+    assert game.step() is game.player_one
+    assert game.get_winner() is game.player_one
+    # The default match would still be running on both counts
+    assert simulation.PongSimulation().ball.x_position == simulation.WINDOW_WIDTH // 2
+
+    path = tmp_path / "config.json"
+    path.write_text('{"paddle_height": 40, "max_score": 2}')
+    assert simulation.GameConfig.load(path) == simulation.GameConfig(paddle_height=40, max_score=2)
+    path.write_text('{"paddle_hieght": 40}')
+    with pytest.raises(ValueError, match="paddle_hieght"):
+        simulation.GameConfig.load(path)
@@ -0,0 +1,162 @@
+"""This module contains spectator fan-out for a running match.
+
+A SpectatorFeed encodes each published tick once, as a framed codec keyframe every KEYFRAME_INTERVAL ticks and
+as a delta against the previous tick otherwise, into an immutable bytes object. The same object is handed to
+every subscriber, so a tick costs one encoding however many spectators watch. The frames since the latest
+keyframe are kept, and a subscriber that joins mid-match, or falls more than its limit behind and is dropped,
+is sent that keyframe and the deltas since, instead of everything it missed.
+   """
+
+from collections import deque
+
+from codec import encode_delta, encode_keyframe, quantize
+from server import STATE, encode_message
+
+# Ticks between keyframes, bounding what a joining or resynchronising spectator is sent
+KEYFRAME_INTERVAL = 60
+
+# Frames an in-process subscriber may have queued before it is dropped back to the latest keyframe
+MAX_QUEUED = 120
+
+
+class Subscriber:
+    """In-process spectator endpoint holding a bounded queue of shared frames."""
+
+    def __init__(self, limit: int = MAX_QUEUED) -> None:
+        """Subscriber init.
+
+        Args:
+            limit (int, optional): queued frames at which the subscriber is dropped. Defaults to MAX_QUEUED.
+        """
+        self.limit = limit
+        self.frames = deque()
+        self.lagging = True
+        self.resyncs = 0
+
+    def backlog(self) -> int:
+        """Returns how far behind the subscriber is, in the units of limit."""
+        return len(self.frames)
+
+    def send(self, frame: bytes):
+        """Queues one frame.
+
+        Args:
+            frame (bytes): a framed STATE message, shared with other subscribers.
+        """
+        self.frames.append(frame)
+
+    def send_many(self, frames: list):
+        """Queues several frames.
+
+        Args:
+            frames (list): framed STATE messages in order.
+        """
+        self.frames.extend(frames)
+
+    def drop(self):
+        """Discards the queued frames of a subscriber that fell too far behind."""
+        self.frames.clear()
+
+    def receive(self) -> bytes:
+        """Takes the oldest queued frame, or None if there is none."""
+        return self.frames.popleft() if self.frames else None
+
+
+class StreamSubscriber(Subscriber):
+    """Spectator connected over an asyncio stream, whose queue is the transport's write buffer."""
+
+    def __init__(self, writer, limit: int = 64 * 1024) -> None:
+        """Stream subscriber init.
+
+        Args:
+            writer (asyncio.StreamWriter): the spectator's connection.
+            limit (int, optional): buffered bytes at which the spectator is dropped. Defaults to 64 KiB.
+        """
+        super().__init__(limit)
+        self.writer = writer
+
+    def backlog(self) -> int:
+        return self.writer.transport.get_write_buffer_size()
+
+    def send(self, frame: bytes):
+        self.writer.write(frame)
+
+    def send_many(self, frames: list):
+        self.writer.writelines(frames)
+
+    def drop(self):
+        """Stops sending until the buffered bytes drain; what is already buffered cannot be recalled."""
+
+
+class SpectatorFeed:
+    """Encodes a match's ticks once and fans the frames out to every subscriber."""
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL) -> None:
+        """Spectator feed init.
+
+        Args:
+            keyframe_interval (int, optional): ticks between keyframes. Defaults to KEYFRAME_INTERVAL.
+        """
+        self.keyframe_interval = keyframe_interval
+        self.subscribers = []
+        self.chain = []
+        self.previous = None
+        self.published = 0
+
+    def subscribe(self, subscriber: Subscriber) -> Subscriber:
+        """Adds a subscriber; it is sent the latest keyframe and the deltas since on the next publish.
+
+        Args:
+            subscriber (Subscriber): the spectator endpoint.
+
+        Returns:
+            Subscriber: the same subscriber.
+        """
+        subscriber.lagging = True
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """Removes a subscriber.
+
+        Args:
+            subscriber (Subscriber): the spectator endpoint.
+        """
+        self.subscribers.remove(subscriber)
+
+    def publish(self, game, sequence: int) -> bytes:
+        """Encodes the match's current state once and sends it to every subscriber.
+
+        A subscriber whose backlog has reached its limit is dropped; once its backlog is empty again it is sent the
+        latest keyframe and the deltas since, then follows the live frames.
+
+        Args:
+            game (PongSimulation): the match.
+            sequence (int): snapshot number, increasing every publish, e.g. the server tick.
+
+        Returns:
+            bytes: the published frame.
+        """
+        snapshot = quantize(game, sequence)
+        if self.published % self.keyframe_interval == 0:
+            frame = encode_message(STATE, encode_keyframe(snapshot))
+            self.chain = [frame]
+        else:
+            frame = encode_message(STATE, encode_delta(snapshot, self.previous))
+            self.chain.append(frame)
+        self.previous = snapshot
+        self.published += 1
+
+        chain = self.chain
+        for subscriber in self.subscribers:
+            if subscriber.lagging:
+                if subscriber.backlog() == 0:
+                    subscriber.send_many(chain)
+                    subscriber.lagging = False
+            elif subscriber.backlog() >= subscriber.limit:
+                subscriber.drop()
+                subscriber.lagging = True
+                subscriber.resyncs += 1
+            else:
+                subscriber.send(frame)
+        return frame
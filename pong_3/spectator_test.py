@@ -0,0 +1,90 @@
+import asyncio
+
+import codec
+import server
+import spectator
+import pytest
+from controllers import FollowBall, RandomMoves, to_inputs
+from simulation import PongSimulation
+
+
+@pytest.fixture
+def setup():
+    left, right = FollowBall(), RandomMoves()
+    right.reset(5)
+    game = PongSimulation()
+
+    def play_tick():
+        game.update(to_inputs(left(game, game.paddle_left), right(game, game.paddle_right)))
+
+    yield (game, play_tick, spectator.SpectatorFeed(keyframe_interval=10))
+
+
+def decode_all(subscriber, decoder):
+    snapshot = None
+    while True:
+        frame = subscriber.receive()
+        if frame is None:
+            return snapshot
+        length, message_type = server.HEADER.unpack_from(frame)
+        assert message_type == server.STATE
+        snapshot = decoder.decode(frame[server.HEADER.size :])
+
+
+def test_frames_are_encoded_once_and_shared(setup):
+    game, play_tick, feed = setup
+    subscribers = [feed.subscribe(spectator.Subscriber()) for _ in range(3)]
+    decoders = [codec.SnapshotDecoder() for _ in subscribers]
+    for sequence in range(25):
+        play_tick()
+        frame = feed.publish(game, sequence)
+        for subscriber, decoder in zip(subscribers, decoders):
+            received = subscriber.receive()
+            assert received is frame
+            assert decoder.decode(received[server.HEADER.size :]) == codec.quantize(game, sequence)
+
+
+def test_late_joiner_starts_from_keyframe(setup):
+    game, play_tick, feed = setup
+    for sequence in range(23):
+        play_tick()
+        feed.publish(game, sequence)
+    subscriber = feed.subscribe(spectator.Subscriber())
+    play_tick()
+    feed.publish(game, 23)
+    assert subscriber.backlog() == 4
+    assert decode_all(subscriber, codec.SnapshotDecoder()) == codec.quantize(game, 23)
+
+
+def test_slow_consumer_drops_to_keyframe(setup):
+    game, play_tick, feed = setup
+    slow = feed.subscribe(spectator.Subscriber(limit=15))
+    decoder = codec.SnapshotDecoder()
+    for sequence in range(60):
+        play_tick()
+        feed.publish(game, sequence)
+        assert slow.backlog() <= slow.limit + feed.keyframe_interval
+    assert slow.resyncs > 0
+    assert decode_all(slow, decoder) == codec.quantize(game, 59)
+
+
+def test_spectator_over_loopback():
+    async def watch():
+        pong_server = server.PongServer(tick_rate=240)
+        listener = await pong_server.start()
+        port = listener.sockets[0].getsockname()[1]
+        left = await server.PongClient.connect("127.0.0.1", port, "Left")
+        right = await server.PongClient.connect("127.0.0.1", port, "Right")
+        viewer = await server.PongClient.watch("127.0.0.1", port, left.match_id)
+        states = [await viewer.receive_state() for _ in range(20)]
+        assert [state[0] for state in states] == sorted(state[0] for state in states)
+        assert pong_server.matches[left.match_id].feed.subscribers
+
+        await left.close()
+        await right.close()
+        await viewer.close()
+        pong_server.stop()
+        listener.close()
+        await listener.wait_closed()
+
+    asyncio.run(asyncio.wait_for(watch(), 10))
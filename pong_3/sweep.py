@@ -0,0 +1,220 @@
+"""This module contains a parameter sweep runner playing bot matches over a grid of GameConfigs.
+
+Every (config, seed) point is one headless match between two scripted controllers. Results are cached on disk
+as one small JSON file per point, named by a SHA-256 hash of everything the match depends on: the config, the
+seed, both controllers and the tick limit. Rerunning a sweep, or a wider one sharing some of its points, only
+plays the points missing from the cache; those are split into chunks and played across a process pool.
+   """
+
+import dataclasses
+import hashlib
+import itertools
+import json
+import os
+
+from match import MAX_MATCH_TICKS, MatchResult, play_match
+from simulation import DEFAULT_CONFIG, GameConfig
+
+# Bumped whenever the match rules change, so results cached by older code are not reused
+CACHE_VERSION = 1
+
+
+def parse_axis(text: str) -> tuple:
+    """Parses a sweep axis given as NAME=VALUE,VALUE,... e.g. paddle_height=60,80,100.
+
+    Args:
+        text (str): the axis.
+
+    Returns:
+        tuple: the GameConfig field name and a list of int or float values.
+
+    Raises:
+        ValueError: the field does not exist or a value is not a number.
+    """
+    name, _, values = text.partition("=")
+    names = [field.name for field in dataclasses.fields(GameConfig)]
+    if name not in names:
+        raise ValueError(f"Unknown setting {name!r}, expected one of: {', '.join(names)}")
+    return name, [float(value) if "." in value else int(value) for value in values.split(",")]
+
+
+def config_grid(axes: list, base: GameConfig = DEFAULT_CONFIG) -> list:
+    """Builds every combination of the axis values on top of a base config.
+
+    Args:
+        axes (list): (field name, values) tuples, e.g. from parse_axis.
+        base (GameConfig, optional): settings not swept. Defaults to DEFAULT_CONFIG.
+
+    Returns:
+        list: a GameConfig per combination, the last axis varying fastest.
+    """
+    names = [name for name, _ in axes]
+    return [
+        dataclasses.replace(base, **dict(zip(names, values)))
+        for values in itertools.product(*(values for _, values in axes))
+    ]
+
+
+def describe_controller(controller) -> dict:
+    """Describes a controller by its class and its plain settings, such as a dead zone, for cache keys."""
+    settings = {
+        name: value for name, value in vars(controller).items() if isinstance(value, (bool, int, float, str))
+    }
+    return {"type": type(controller).__qualname__, "name": controller.name, "settings": settings}
+
+
+def point_key(config: GameConfig, seed: int, left, right, max_ticks: int = MAX_MATCH_TICKS) -> str:
+    """Returns the cache key of one sweep point.
+
+    Args:
+        config (GameConfig): the match settings.
+        seed (int): the match seed.
+        left (Controller): controller for the left paddle.
+        right (Controller): controller for the right paddle.
+        max_ticks (int, optional): tick limit. Defaults to MAX_MATCH_TICKS.
+
+    Returns:
+        str: hex SHA-256 of the point.
+    """
+    point = {
+        "version": CACHE_VERSION,
+        "config": dataclasses.asdict(config),
+        "seed": seed,
+        "left": describe_controller(left),
+        "right": describe_controller(right),
+        "max_ticks": max_ticks,
+    }
+    return hashlib.sha256(json.dumps(point, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """Directory of match results, one JSON file per sweep point key."""
+
+    def __init__(self, path: str) -> None:
+        """Result cache init.
+
+        Args:
+            path (str): cache directory, created if needed.
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _file(self, key: str) -> str:
+        # Spread files over subdirectories so none grows too large for large sweeps
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> MatchResult:
+        """Returns the cached result of a point, or None.
+
+        Args:
+            key (str): point_key of the point.
+
+        Returns:
+            MatchResult: the result, or None if it is not cached or the file cannot be read.
+        """
+        try:
+            with open(self._file(key)) as result_file:
+                fields = json.load(result_file)
+            result = MatchResult(**dict(fields, rally_lengths=tuple(fields["rally_lengths"])))
+        except (OSError, ValueError, TypeError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: MatchResult):
+        """Stores the result of a point, replacing the file atomically so readers never see half of it.
+
+        Args:
+            key (str): point_key of the point.
+            result (MatchResult): the result.
+        """
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as result_file:
+            json.dump(dataclasses.asdict(result), result_file)
+        os.replace(temporary, path)
+
+
+def play_seeds(pairing: int, config: GameConfig, left, right, seeds: list, max_ticks: int = MAX_MATCH_TICKS):
+    """Plays one config at several seeds. This is the unit of work sent to pool workers.
+
+    Args:
+        pairing (int): index of the config in the sweep, copied into the results.
+        config (GameConfig): the match settings.
+        left (Controller): controller for the left paddle.
+        right (Controller): controller for the right paddle.
+        seeds (list): match seeds.
+        max_ticks (int, optional): tick limit per match. Defaults to MAX_MATCH_TICKS.
+
+    Returns:
+        list: a MatchResult per seed, in the same order.
+    """
+    return [play_match(left, right, seed, pairing, max_ticks, config) for seed in seeds]
+
+
+def iter_sweep(
+    configs: list,
+    left,
+    right,
+    seeds,
+    cache: ResultCache = None,
+    workers: int = None,
+    chunk_size: int = 20,
+    max_ticks: int = MAX_MATCH_TICKS,
+):
+    """Plays every config at every seed, yielding cached results first and then new ones as chunks finish.
+
+    Each result's pairing is the index of its config in configs, so results can be aggregated like a
+    tournament's. Only a couple of chunks per worker are in flight at once.
+
+    Args:
+        configs (list): GameConfigs to evaluate, e.g. from config_grid.
+        left (Controller): controller for the left paddle. Must be picklable.
+        right (Controller): controller for the right paddle. Must be picklable.
+        seeds (list): match seeds played for every config.
+        cache (ResultCache, optional): results to reuse and to add new results to. Defaults to None, playing
+            every point.
+        workers (int, optional): pool size. Defaults to the CPU count.
+        chunk_size (int, optional): matches per pool task. Defaults to 20.
+        max_ticks (int, optional): tick limit per match. Defaults to MAX_MATCH_TICKS.
+
+    Yields:
+        MatchResult: the result of every point.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+    missing = []
+    for pairing, config in enumerate(configs):
+        unplayed = []
+        for seed in seeds:
+            result = None if cache is None else cache.get(point_key(config, seed, left, right, max_ticks))
+            if result is None:
+                unplayed.append(seed)
+            else:
+                yield dataclasses.replace(result, pairing=pairing)
+        for start in range(0, len(unplayed), chunk_size):
+            missing.append((pairing, config, unplayed[start : start + chunk_size]))
+    if not missing:
+        return
+
+    def finished(future):
+        for result in future.result():
+            if cache is not None:
+                cache.put(point_key(configs[result.pairing], result.seed, left, right, max_ticks), result)
+            yield result
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for pairing, config, chunk in missing:
+            pending.add(executor.submit(play_seeds, pairing, config, left, right, chunk, max_ticks))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from finished(future)
+        for future in as_completed(pending):
+            yield from finished(future)
@@ -0,0 +1,50 @@
+import dataclasses
+
+import controllers
+import pytest
+import simulation
+import sweep
+
+
+@pytest.fixture
+def setup(tmp_path):
+    configs = sweep.config_grid([sweep.parse_axis("paddle_height=60,100"), sweep.parse_axis("max_score=1,2")])
+    yield (configs, sweep.ResultCache(str(tmp_path / "cache")))
+
+
+def in_order(results):
+    return sorted(results, key=lambda result: (result.pairing, result.seed))
+
+
+def test_grid_and_axis_parsing(setup):
+    configs, _ = setup
+    assert [(config.paddle_height, config.max_score) for config in configs] == [(60, 1), (60, 2), (100, 1), (100, 2)]
+    assert configs[0] == dataclasses.replace(simulation.DEFAULT_CONFIG, paddle_height=60, max_score=1)
+    assert sweep.parse_axis("ball_max_velocity=5,7.5") == ("ball_max_velocity", [5, 7.5])
+    with pytest.raises(ValueError, match="paddle_size"):
+        sweep.parse_axis("paddle_size=1,2")
+
+
+def test_point_keys_cover_config_seed_and_controllers(setup):
+    configs, _ = setup
+    left, right = controllers.Predictive(), controllers.RandomMoves()
+    key = sweep.point_key(configs[0], 0, left, right)
+    assert key == sweep.point_key(dataclasses.replace(configs[0]), 0, controllers.Predictive(), right)
+    assert key != sweep.point_key(configs[1], 0, left, right)
+    assert key != sweep.point_key(configs[0], 1, left, right)
+    assert key != sweep.point_key(configs[0], 0, controllers.Predictive(dead_zone=5), right)
+    assert key != sweep.point_key(configs[0], 0, left, right, max_ticks=10)
+
+
+def test_rerun_only_plays_new_points(setup):
+    configs, cache = setup
+    left, right = controllers.Predictive(), controllers.RandomMoves()
+    first = in_order(sweep.iter_sweep(configs[:2], left, right, range(3), cache, workers=2, chunk_size=2))
+    assert (cache.hits, cache.misses) == (0, 6)
+    assert all(max(result.score_one, result.score_two) == configs[result.pairing].max_score for result in first)
+
+    second = in_order(sweep.iter_sweep(configs, left, right, range(3), cache, workers=2))
+    assert (cache.hits, cache.misses) == (6, 12)
+    assert second[:6] == first
+    assert in_order(sweep.iter_sweep(configs, left, right, range(3), cache)) == second
+    assert cache.hits == 18
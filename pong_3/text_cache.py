@@ -0,0 +1,55 @@
+"""This module contains a bounded cache of rendered text surfaces.
+
+Rasterizing text with pygame.font is far slower than blitting a finished surface, and the game only ever writes
+a handful of distinct strings, so each (text, colour, font) surface is rendered once and reused.
+   """
+
+from collections import OrderedDict
+
+# Surfaces kept before the least recently used one is evicted
+DEFAULT_MAX_SIZE = 64
+
+
+class TextCache:
+    """Least recently used cache of rendered text surfaces with hit and miss counters."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Text cache init.
+
+        Args:
+            max_size (int, optional): number of surfaces kept. Defaults to DEFAULT_MAX_SIZE.
+        """
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text: str, colour: tuple):
+        """Returns the anti-aliased surface for text, rendering it only on a cache miss.
+
+        Args:
+            font (pygame.font.Font): font to render with.
+            text (str): the text to write.
+            colour (tuple): RGB text colour.
+
+        Returns:
+            pygame.Surface: the rendered text. Callers must not draw onto it, as it is shared.
+        """
+        key = (text, colour, font)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.surfaces[key] = font.render(text, 1, colour)
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drops every cached surface and zeroes the counters."""
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,34 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+import text_cache
+
+
+@pytest.fixture
+def setup():
+    pygame.font.init()
+    font = pygame.font.SysFont("Britannic", 20)
+    yield (text_cache.TextCache(max_size=2), font)
+
+
+def test_hits_and_misses(setup):
+    cache, font = setup
+    first = cache.render(font, "1", (255, 255, 255))
+    assert cache.render(font, "1", (255, 255, 255)) is first
+    cache.render(font, "1", (0, 0, 0))
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_is_evicted(setup):
+    cache, font = setup
+    cache.render(font, "a", (255, 255, 255))
+    cache.render(font, "b", (255, 255, 255))
+    cache.render(font, "a", (255, 255, 255))
+    cache.render(font, "c", (255, 255, 255))
+    assert len(cache.surfaces) == 2
+    cache.render(font, "a", (255, 255, 255))
+    cache.render(font, "b", (255, 255, 255))
+    assert cache.misses == 4
@@ -0,0 +1,222 @@
+"""This module contains a structure-of-arrays container for the state of many matches.
+
+Every per-match field is one row of a single float64 NumPy buffer, so the state of all matches is contiguous,
+each field can be processed as a vector, and a snapshot or restore of the whole world is one buffer copy.
+Geometry shared by every match is kept once. Ball, paddle and player views give single matches the attribute
+interface of Ball, Paddle and Player, so controllers and other per-match code work on the arrays unchanged.
+   """
+
+import numpy as np
+
+from simulation import PongSimulation
+
+# Rows of the state buffer, one value per match in each
+FIELDS = (
+    "ball_x",
+    "ball_y",
+    "ball_x_velocity",
+    "ball_y_velocity",
+    "left_y",
+    "right_y",
+    "score_one",
+    "score_two",
+    "ticks",
+)
+
+
+class MatchWorld:
+    """Owns the state of many matches in one (len(FIELDS), matches) buffer, with a named row view per field."""
+
+    def __init__(self, matches: int, template: PongSimulation = None) -> None:
+        """Match world init.
+
+        Args:
+            matches (int): number of matches held.
+            template (PongSimulation, optional): match whose geometry, names and state every match copies.
+                Defaults to a fresh PongSimulation.
+        """
+        if template is None:
+            template = PongSimulation()
+        self.matches = matches
+        self.template = template
+        self.state = np.empty((len(FIELDS), matches), dtype=np.float64)
+        for row, name in enumerate(FIELDS):
+            setattr(self, name, self.state[row])
+        for index in range(matches):
+            self.load(index, template)
+        self._views = {}
+
+    def load(self, index: int, game: PongSimulation):
+        """Copies a match's state into one slot of the world.
+
+        Args:
+            index (int): slot to write.
+            game (PongSimulation): the match to copy.
+        """
+        ball = game.ball
+        self.state[:, index] = (
+            ball.x_position,
+            ball.y_position,
+            ball.x_velocity,
+            ball.y_velocity,
+            game.paddle_left.y_position,
+            game.paddle_right.y_position,
+            game.player_one.score,
+            game.player_two.score,
+            game.ticks,
+        )
+
+    def snapshot(self):
+        """Copies the state of every match.
+
+        Returns:
+            numpy.ndarray: the copy, to pass to restore.
+        """
+        return self.state.copy()
+
+    def restore(self, snapshot):
+        """Overwrites the state of every match with a snapshot, in place so existing row views stay valid.
+
+        Args:
+            snapshot (numpy.ndarray): a snapshot() result.
+        """
+        np.copyto(self.state, snapshot)
+
+    def match(self, index: int):
+        """Returns a PongSimulation-like view of one match, reusing the view on later calls.
+
+        Args:
+            index (int): the match.
+
+        Returns:
+            MatchView: view exposing ball, paddle_left, paddle_right, player_one, player_two and ticks.
+        """
+        view = self._views.get(index)
+        if view is None:
+            view = self._views[index] = MatchView(self, index)
+        return view
+
+
+def _field(row: str, doc: str, cast=float):
+    """Builds a property reading and writing one match's value in a world row."""
+
+    def get_value(view):
+        return cast(getattr(view.world, row)[view.index])
+
+    def set_value(view, value):
+        getattr(view.world, row)[view.index] = value
+
+    return property(get_value, set_value, doc=doc)
+
+
+class BallView:
+    """Ball interface onto one match of a MatchWorld. Fixed attributes come from the world's template ball."""
+
+    __slots__ = ("world", "index", "radius", "max_velocity", "colour", "x_position_original", "y_position_original")
+
+    def __init__(self, world: MatchWorld, index: int) -> None:
+        """Ball view init.
+
+        Args:
+            world (MatchWorld): the world holding the state.
+            index (int): the match.
+        """
+        ball = world.template.ball
+        self.world = world
+        self.index = index
+        self.radius = ball.radius
+        self.max_velocity = ball.max_velocity
+        self.colour = ball.colour
+        self.x_position_original = ball.x_position_original
+        self.y_position_original = ball.y_position_original
+
+    x_position = _field("ball_x", "current x position")
+    y_position = _field("ball_y", "current y position")
+    x_velocity = _field("ball_x_velocity", "x velocity")
+    y_velocity = _field("ball_y_velocity", "y velocity")
+
+
+class PaddleView:
+    """Paddle interface onto one paddle of one match of a MatchWorld."""
+
+    __slots__ = ("world", "index", "values", "x_position", "y_position_original", "width", "height", "colour")
+
+    def __init__(self, world: MatchWorld, index: int, left: bool) -> None:
+        """Paddle view init.
+
+        Args:
+            world (MatchWorld): the world holding the state.
+            index (int): the match.
+            left (bool): view the left paddle, otherwise the right.
+        """
+        paddle = world.template.paddle_left if left else world.template.paddle_right
+        self.world = world
+        self.index = index
+        self.values = world.left_y if left else world.right_y
+        self.x_position = paddle.x_position
+        self.y_position_original = paddle.y_position_original
+        self.width = paddle.width
+        self.height = paddle.height
+        self.colour = paddle.colour
+
+    @property
+    def y_position(self) -> int:
+        """current y position"""
+        return int(self.values[self.index])
+
+    @y_position.setter
+    def y_position(self, value: int):
+        self.values[self.index] = value
+
+
+class PlayerView:
+    """Player interface onto one player's score in one match of a MatchWorld."""
+
+    __slots__ = ("world", "index", "name", "values")
+
+    def __init__(self, world: MatchWorld, index: int, name: str, row: str) -> None:
+        """Player view init.
+
+        Args:
+            world (MatchWorld): the world holding the state.
+            index (int): the match.
+            name (str): the player's name.
+            row (str): "score_one" or "score_two".
+        """
+        self.world = world
+        self.index = index
+        self.name = name
+        self.values = getattr(world, row)
+
+    @property
+    def score(self) -> int:
+        """points scored"""
+        return int(self.values[self.index])
+
+    @score.setter
+    def score(self, value: int):
+        self.values[self.index] = value
+
+
+class MatchView:
+    """PongSimulation-like view of one match of a MatchWorld, for controllers and other per-match code."""
+
+    __slots__ = ("world", "index", "config", "ball", "paddle_left", "paddle_right", "player_one", "player_two")
+
+    def __init__(self, world: MatchWorld, index: int) -> None:
+        """Match view init.
+
+        Args:
+            world (MatchWorld): the world holding the state.
+            index (int): the match.
+        """
+        self.world = world
+        self.index = index
+        self.config = world.template.config
+        self.ball = BallView(world, index)
+        self.paddle_left = PaddleView(world, index, left=True)
+        self.paddle_right = PaddleView(world, index, left=False)
+        self.player_one = PlayerView(world, index, world.template.player_one.name, "score_one")
+        self.player_two = PlayerView(world, index, world.template.player_two.name, "score_two")
+
+    ticks = _field("ticks", "ticks played", int)
@@ -0,0 +1,70 @@
+import batch
+import simulation
+import world
+import pytest
+from controllers import FollowBall, Predictive, observe
+
+
+@pytest.fixture
+def setup():
+    game = simulation.PongSimulation()
+    for tick in range(40):
+        game.step(tick % 16)
+    state = world.MatchWorld(4)
+    state.load(2, game)
+    yield (state, game)
+
+
+def test_state_classes_are_slotted():
+    game = simulation.PongSimulation()
+    for instance in (game.ball, game.paddle_left, game.player_one):
+        assert not hasattr(instance, "__dict__")
+
+
+def test_views_read_and_write_rows(setup):
+    state, game = setup
+    view = state.match(2)
+    assert state.match(2) is view
+    assert observe(view, view.paddle_left) == observe(game, game.paddle_left)
+    assert observe(view, view.paddle_right) == observe(game, game.paddle_right)
+    assert view.ticks == game.ticks == 40
+    view.ball.x_position = 123
+    view.paddle_right.y_position -= 5
+    view.player_two.score += 1
+    assert state.ball_x[2] == 123
+    assert state.right_y[2] == game.paddle_right.y_position - 5
+    assert state.score_two[2] == 1
+    assert state.ball_x[1] == game.ball.x_position_original
+
+
+def test_controllers_accept_views(setup):
+    state, game = setup
+    view = state.match(2)
+    for controller in (FollowBall(), Predictive()):
+        assert controller(view, view.paddle_left) == controller(game, game.paddle_left)
+
+
+def test_snapshot_and_restore(setup):
+    state, game = setup
+    snapshot = state.snapshot()
+    ball_x = state.ball_x
+    state.ball_x += 50
+    state.score_one[:] = 3
+    state.restore(snapshot)
+    assert state.ball_x is ball_x
+    assert (state.state == snapshot).all()
+    assert state.match(0).player_one.score == 0
+
+
+def test_batch_restore_replays_identically():
+    engine = batch.BatchSimulation(16)
+    inputs = [tick % 16 for tick in range(16)]
+    for _ in range(100):
+        engine.step(inputs)
+    snapshot = engine.snapshot()
+    first = [engine.step(inputs).copy() for _ in range(300)]
+    end = engine.snapshot()
+    engine.restore(snapshot)
+    assert engine.ticks == 100
+    assert [engine.step(inputs).copy().tolist() for _ in range(300)] == [goals.tolist() for goals in first]
+    assert (engine.snapshot() == end).all()